@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare row iteration over Arrow record batches.
+
+Times iterating a ``ReadRowsIterable`` for an Arrow stream against the previous
+implementation, which zipped the pyarrow columns directly and converted each
+cell with ``as_py()``.
+
+Usage::
+
+    python benchmark/arrow_rows.py --rows 100000 --columns 10
+"""
+
+import argparse
+import timeit
+
+import pyarrow
+
+from google.cloud.bigquery_storage_v1 import reader
+from google.cloud.bigquery_storage_v1 import types
+
+
+def _make_read_session(schema):
+    return types.ReadSession(
+        arrow_schema={"serialized_schema": schema.serialize().to_pybytes()}
+    )
+
+
+def _make_messages(num_rows, num_columns, rows_per_batch):
+    types_cycle = (pyarrow.int64(), pyarrow.float64(), pyarrow.string())
+    fields = [
+        pyarrow.field("col_{}".format(index), types_cycle[index % len(types_cycle)])
+        for index in range(num_columns)
+    ]
+    schema = pyarrow.schema(fields)
+
+    messages = []
+    for start in range(0, num_rows, rows_per_batch):
+        row_count = min(rows_per_batch, num_rows - start)
+        arrays = []
+        for field in fields:
+            values = range(start, start + row_count)
+            if field.type == pyarrow.string():
+                values = [str(value) for value in values]
+            arrays.append(pyarrow.array(values, type=field.type))
+        record_batch = pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+        message = types.ReadRowsResponse(row_count=row_count)
+        message.arrow_record_batch.serialized_record_batch = (
+            record_batch.serialize().to_pybytes()
+        )
+        messages.append(message)
+    return schema, messages
+
+
+def _rows_w_scalars(schema, messages):
+    """The previous row path: one pyarrow scalar per cell."""
+    names = schema.names
+    for message in messages:
+        record_batch = pyarrow.ipc.read_record_batch(
+            pyarrow.py_buffer(message.arrow_record_batch.serialized_record_batch),
+            schema,
+        )
+        for row in zip(*record_batch.columns):
+            yield dict(zip(names, (value.as_py() for value in row)))
+
+
+def _rows_w_columns(read_session, messages):
+    return iter(
+        reader.ReadRowsIterable(
+            reader.ReadRowsStream(messages, None, "", 0, {}), read_session
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--rows-per-batch", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    schema, messages = _make_messages(args.rows, args.columns, args.rows_per_batch)
+    read_session = _make_read_session(schema)
+    cells = args.rows * args.columns
+
+    candidates = (
+        ("pyarrow scalars", lambda: _rows_w_scalars(schema, messages)),
+        ("bulk to_pylist", lambda: _rows_w_columns(read_session, messages)),
+    )
+    for label, rows in candidates:
+        seconds = min(
+            timeit.repeat(lambda: sum(1 for _ in rows()), number=1, repeat=args.repeat)
+        )
+        print(
+            "{:<16} {:8.3f} s  {:8.3f} us/cell".format(
+                label, seconds, seconds * 1e6 / cells
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
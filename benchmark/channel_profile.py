@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare gRPC channel options for reading many large ReadRows responses.
+
+Starts a local fake BigQuery Read server, and times reading a few streams at
+once with default channel options and with ``BULK_READ_CHANNEL_OPTIONS``.
+The default options can't receive responses larger than 4 MiB at all.
+Each row of the fake server's Arrow pages takes about 30 bytes.
+
+Usage::
+
+    python benchmark/channel_profile.py --rows-per-page 100000 --pages 50
+"""
+
+import argparse
+import concurrent.futures
+import time
+
+from google.cloud.bigquery_storage_v1 import grpc_transport
+from google.cloud.bigquery_storage_v1 import testing
+from google.cloud.bigquery_storage_v1 import types
+
+
+def _read_streams(server, options, num_streams):
+    """Read all streams of a new session at once, returning the bytes received."""
+    client = server.make_client(channel_options=options)
+    session = client.create_read_session(
+        parent="projects/fake",
+        read_session={
+            "table": "projects/fake/datasets/d/tables/t",
+            "data_format": types.DataFormat.ARROW,
+        },
+        max_stream_count=num_streams,
+    )
+
+    def read_stream(stream):
+        return sum(message._pb.ByteSize() for message in client.read_rows(stream.name))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_streams) as pool:
+        return sum(pool.map(read_stream, session.streams))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows-per-page", type=int, default=100000)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--streams", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    server = testing.FakeBigQueryReadServer(
+        stream_count=args.streams,
+        rows_per_stream=args.rows_per_page * args.pages,
+        rows_per_page=args.rows_per_page,
+    )
+    candidates = (
+        ("default", ()),
+        ("bulk read", grpc_transport.BULK_READ_CHANNEL_OPTIONS),
+    )
+    with server:
+        # Read once first, so that the server has encoded all pages.
+        _read_streams(server, grpc_transport.BULK_READ_CHANNEL_OPTIONS, args.streams)
+
+        for label, options in candidates:
+            best = None
+            try:
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    total_bytes = _read_streams(server, options, args.streams)
+                    seconds = time.perf_counter() - start
+                    best = seconds if best is None else min(best, seconds)
+            except Exception as exc:
+                print("{:<10} failed: {}".format(label, type(exc).__name__))
+                continue
+
+            print(
+                "{:<10} {:8.3f} s  {:8.1f} MB/s".format(
+                    label, best, total_bytes / 1e6 / best
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time decoding Avro and Arrow pages into rows, Arrow tables and DataFrames.
+
+Generates pages with a column of each BigQuery type, repeated to the
+requested width, and times iterating over rows, ``to_arrow()`` and
+``to_dataframe()`` with and without ``dtypes``. Reports rows per second,
+megabytes of serialized pages per second, the peak memory allocated by
+Python objects during one more run, and the pyarrow memory held by its
+result.
+
+Save the results of one commit, then compare another commit against them.
+The comparison exits with status 1 if any case got slower by more than the
+threshold::
+
+    python benchmark/decode.py --output before.json
+    git checkout my-branch
+    python benchmark/decode.py --compare before.json --threshold 0.1
+
+Avro pages are decoded by a decoder compiled for their schema. To compare it
+with decoding each block with fastavro::
+
+    python benchmark/decode.py --formats avro --avro-decoder fastavro --output fastavro.json
+    python benchmark/decode.py --formats avro --compare fastavro.json
+
+Usage::
+
+    python benchmark/decode.py --rows 50000 --widths 10,50 --string-sizes 16,256
+"""
+
+import argparse
+import datetime
+import decimal
+import io
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+import fastavro
+import pandas
+import pyarrow
+
+from google.cloud.bigquery_storage_v1 import reader
+from google.cloud.bigquery_storage_v1 import types
+
+
+BQ_TO_AVRO_TYPES = {
+    "int64": "long",
+    "float64": "double",
+    "bool": "boolean",
+    "numeric": {"type": "bytes", "logicalType": "decimal", "precision": 38, "scale": 9},
+    "string": "string",
+    "bytes": "bytes",
+    "date": {"type": "int", "logicalType": "date"},
+    "datetime": {"type": "string", "sqlType": "DATETIME"},
+    "time": {"type": "long", "logicalType": "time-micros"},
+    "timestamp": {"type": "long", "logicalType": "timestamp-micros"},
+}
+BQ_TO_ARROW_TYPES = {
+    "int64": pyarrow.int64(),
+    "float64": pyarrow.float64(),
+    "bool": pyarrow.bool_(),
+    "numeric": pyarrow.decimal128(38, 9),
+    "string": pyarrow.utf8(),
+    "bytes": pyarrow.binary(),
+    "date": pyarrow.date32(),
+    "datetime": pyarrow.timestamp("us"),
+    "time": pyarrow.time64("us"),
+    "timestamp": pyarrow.timestamp("us", tz="UTC"),
+}
+BQ_TYPES = sorted(BQ_TO_AVRO_TYPES)
+
+# Dtypes to pass to to_dataframe(), for the columns which have one.
+DTYPES = {"int64": "int32", "float64": "float32", "bool": "bool"}
+
+EPOCH = datetime.datetime(2000, 1, 1)
+UTC = datetime.timezone.utc
+
+
+def _value(bq_type, number, string_size, for_avro):
+    """The value of a column of ``bq_type`` in row ``number``."""
+    if bq_type == "int64":
+        return number
+    if bq_type == "float64":
+        return number * 0.5
+    if bq_type == "bool":
+        return number % 2 == 0
+    if bq_type == "numeric":
+        return decimal.Decimal(number).scaleb(-2)
+    if bq_type == "string":
+        return str(number).rjust(string_size, "x")
+    if bq_type == "bytes":
+        return str(number).rjust(string_size, "x").encode("ascii")
+    if bq_type == "date":
+        return (EPOCH + datetime.timedelta(days=number % 10000)).date()
+    if bq_type == "datetime":
+        value = EPOCH + datetime.timedelta(seconds=number)
+        return value.isoformat() if for_avro else value
+    if bq_type == "time":
+        return datetime.time(number % 24, number % 60, number % 60)
+    if bq_type == "timestamp":
+        return (EPOCH + datetime.timedelta(seconds=number)).replace(tzinfo=UTC)
+    raise ValueError("Unknown type: {}".format(bq_type))
+
+
+def _columns(width):
+    """Column names and types, cycling through all BigQuery types."""
+    return [
+        ("col_{}_{}".format(index, bq_type), bq_type)
+        for index, bq_type in zip(range(width), itertools.cycle(BQ_TYPES))
+    ]
+
+
+def _avro_pages(columns, num_rows, rows_per_page, string_size):
+    schema_json = {
+        "type": "record",
+        "name": "__root__",
+        "fields": [
+            {"name": name, "type": ["null", BQ_TO_AVRO_TYPES[bq_type]]}
+            for name, bq_type in columns
+        ],
+    }
+    schema = fastavro.parse_schema(schema_json)
+    read_session = types.ReadSession(avro_schema={"schema": json.dumps(schema_json)})
+
+    messages = []
+    for start in range(0, num_rows, rows_per_page):
+        row_count = min(rows_per_page, num_rows - start)
+        blockio = io.BytesIO()
+        for number in range(start, start + row_count):
+            row = {
+                name: _value(bq_type, number, string_size, for_avro=True)
+                for name, bq_type in columns
+            }
+            fastavro.schemaless_writer(blockio, schema, row)
+        message = types.ReadRowsResponse(row_count=row_count)
+        message.avro_rows.serialized_binary_rows = blockio.getvalue()
+        messages.append(message)
+    return read_session, messages
+
+
+def _arrow_pages(columns, num_rows, rows_per_page, string_size):
+    schema = pyarrow.schema(
+        [pyarrow.field(name, BQ_TO_ARROW_TYPES[bq_type]) for name, bq_type in columns]
+    )
+    read_session = types.ReadSession(
+        arrow_schema={"serialized_schema": schema.serialize().to_pybytes()}
+    )
+
+    messages = []
+    for start in range(0, num_rows, rows_per_page):
+        row_count = min(rows_per_page, num_rows - start)
+        arrays = [
+            pyarrow.array(
+                [
+                    _value(bq_type, number, string_size, for_avro=False)
+                    for number in range(start, start + row_count)
+                ],
+                type=BQ_TO_ARROW_TYPES[bq_type],
+            )
+            for _, bq_type in columns
+        ]
+        record_batch = pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+        message = types.ReadRowsResponse(row_count=row_count)
+        message.arrow_record_batch.serialized_record_batch = (
+            record_batch.serialize().to_pybytes()
+        )
+        messages.append(message)
+    return read_session, messages
+
+
+def _iterable(read_session, messages, row_type=dict):
+    stream = reader.ReadRowsStream(messages, None, "", 0, {})
+    return reader.ReadRowsIterable(stream, read_session, row_type=row_type)
+
+
+def _methods(columns):
+    """The decode paths to time, by name."""
+    dtypes = {name: DTYPES[bq_type] for name, bq_type in columns if bq_type in DTYPES}
+    return (
+        ("rows", lambda session, pages: sum(1 for _ in _iterable(session, pages))),
+        (
+            "rows_w_row_type",
+            lambda session, pages: sum(
+                1 for _ in _iterable(session, pages, row_type=reader.Row)
+            ),
+        ),
+        ("to_arrow", lambda session, pages: _iterable(session, pages).to_arrow()),
+        (
+            "to_dataframe",
+            lambda session, pages: _iterable(session, pages).to_dataframe(),
+        ),
+        (
+            "to_dataframe_w_dtypes",
+            lambda session, pages: _iterable(session, pages).to_dataframe(
+                dtypes=dtypes
+            ),
+        ),
+    )
+
+
+def _measure_memory(method, read_session, messages):
+    """Peak Python allocations of ``method``, and pyarrow bytes its result holds."""
+    arrow_before = pyarrow.total_allocated_bytes()
+    tracemalloc.start()
+    try:
+        result = method(read_session, messages)
+        _, python_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Arrow buffers are allocated outside of the Python allocator. Count the
+    # ones the result still holds on to.
+    arrow_bytes = pyarrow.total_allocated_bytes() - arrow_before
+    del result
+    return python_peak, max(0, arrow_bytes)
+
+
+def run(args):
+    results = []
+    shapes = itertools.product(args.formats, args.rows, args.widths, args.string_sizes)
+    for data_format, num_rows, width, string_size in shapes:
+        columns = _columns(width)
+        make_pages = _avro_pages if data_format == "avro" else _arrow_pages
+        read_session, messages = make_pages(
+            columns, num_rows, args.rows_per_page, string_size
+        )
+        page_bytes = sum(
+            len(message.avro_rows.serialized_binary_rows)
+            + len(message.arrow_record_batch.serialized_record_batch)
+            for message in messages
+        )
+
+        for method_name, method in _methods(columns):
+            if args.methods and method_name not in args.methods:
+                continue
+
+            seconds = min(
+                timeit.repeat(
+                    lambda: method(read_session, messages),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            python_peak, arrow_bytes = _measure_memory(method, read_session, messages)
+            result = {
+                "case": "{}/{}/rows={}/width={}/string_size={}".format(
+                    method_name, data_format, num_rows, width, string_size
+                ),
+                "method": method_name,
+                "format": data_format,
+                "rows": num_rows,
+                "width": width,
+                "string_size": string_size,
+                "seconds": seconds,
+                "rows_per_second": num_rows / seconds,
+                "megabytes_per_second": page_bytes / 1e6 / seconds,
+                "python_peak_bytes": python_peak,
+                "arrow_retained_bytes": arrow_bytes,
+            }
+            results.append(result)
+            _print_result(result)
+    return results
+
+
+def _print_result(result):
+    print(
+        "{:<60} {:8.3f} s {:12,.0f} rows/s {:8.1f} MB/s {:8.1f} MB py {:8.1f} MB arrow held".format(
+            result["case"],
+            result["seconds"],
+            result["rows_per_second"],
+            result["megabytes_per_second"],
+            result["python_peak_bytes"] / 1e6,
+            result["arrow_retained_bytes"] / 1e6,
+        )
+    )
+
+
+def _environment():
+    try:
+        commit = (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode("ascii")
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fastavro": fastavro.__version__,
+        "pandas": pandas.__version__,
+        "pyarrow": pyarrow.__version__,
+    }
+
+
+def compare(results, baseline_path, threshold):
+    """Print the change in speed of each case, returning the regressions."""
+    with open(baseline_path) as baseline_file:
+        baseline = {
+            result["case"]: result for result in json.load(baseline_file)["results"]
+        }
+
+    regressions = []
+    print()
+    for result in results:
+        before = baseline.get(result["case"])
+        if before is None:
+            continue
+        change = result["rows_per_second"] / before["rows_per_second"] - 1.0
+        marker = ""
+        if change < -threshold:
+            marker = "  REGRESSION"
+            regressions.append(result["case"])
+        print("{:<60} {:+7.1%}{}".format(result["case"], change, marker))
+    return regressions
+
+
+def _split(convert):
+    return lambda value: [convert(item) for item in value.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--formats", type=_split(str), default=["avro", "arrow"])
+    parser.add_argument("--rows", type=_split(int), default=[50000])
+    parser.add_argument("--widths", type=_split(int), default=[10, 50])
+    parser.add_argument("--string-sizes", type=_split(int), default=[16, 256])
+    parser.add_argument("--rows-per-page", type=int, default=10000)
+    parser.add_argument(
+        "--methods",
+        type=_split(str),
+        default=[],
+        help="Comma-separated decode paths to time. Defaults to all of them.",
+    )
+    parser.add_argument(
+        "--avro-decoder",
+        choices=("compiled", "fastavro"),
+        default="compiled",
+        help="Decode Avro pages with a decoder compiled for the schema, or with fastavro.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with results in this JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Fraction by which rows/s can drop before a case is a regression.",
+    )
+    args = parser.parse_args()
+
+    if args.avro_decoder == "fastavro":
+        # Pretend that no schema is supported, so that parsers fall back to
+        # fastavro.
+        reader._compile_avro_decoder = lambda *args, **kwargs: None
+
+    results = run(args)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(
+                {
+                    "environment": dict(_environment(), avro_decoder=args.avro_decoder),
+                    "results": results,
+                },
+                output_file,
+                indent=2,
+            )
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
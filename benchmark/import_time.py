@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time importing the library in a fresh interpreter, and check a budget.
+
+Each run starts a new Python process, so that nothing is already imported.
+Reports the fastest and the median import time, the modules which took
+longest to import, and whether any optional dependency was imported. Exits
+with status 1 if the median is over the budget, or if pandas, pyarrow,
+fastavro or pkg_resources were imported::
+
+    python benchmark/import_time.py --runs 10 --budget 0.75
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+# Modules which importing the library must not import. The optional
+# dependencies are loaded when first used, and the version is not looked up
+# from the installed distribution.
+UNEXPECTED_MODULES = ("fastavro", "pandas", "pkg_resources", "pyarrow")
+
+_TIMER = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "unexpected": [name for name in {unexpected!r} if name in sys.modules],
+}}))
+"""
+
+
+def time_import(module):
+    """Import ``module`` in a new interpreter.
+
+    Returns:
+        Tuple[float, List[str]]:
+            Seconds taken, and the unexpected modules which were imported.
+    """
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            _TIMER.format(module=module, unexpected=UNEXPECTED_MODULES),
+        ]
+    )
+    result = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+    return result["seconds"], result["unexpected"]
+
+
+def slowest_modules(module, top):
+    """The modules with the largest cumulative import time, in microseconds."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    times = []
+    for line in process.stderr.decode("utf-8").splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times.append((int(cumulative), name.rstrip()))
+    return sorted(times, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--module", default="google.cloud.bigquery_storage")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="Maximum median import time in seconds. Not checked if not set.",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of slowest modules to show. Requires Python 3.7 or later.",
+    )
+    args = parser.parse_args()
+
+    results = [time_import(args.module) for _ in range(args.runs)]
+    seconds = [result[0] for result in results]
+    unexpected = sorted(set(name for result in results for name in result[1]))
+    median = statistics.median(seconds)
+
+    if args.top and sys.version_info >= (3, 7):
+        print("Slowest modules, cumulative:")
+        for microseconds, name in slowest_modules(args.module, args.top):
+            print("{:10.1f} ms {}".format(microseconds / 1000.0, name))
+        print()
+
+    print(
+        "import {}: {:.3f} s fastest, {:.3f} s median of {} runs".format(
+            args.module, min(seconds), median, args.runs
+        )
+    )
+
+    failed = False
+    if unexpected:
+        print("Imported unexpectedly: {}".format(", ".join(unexpected)))
+        failed = True
+    if args.budget is not None:
+        if median > args.budget:
+            print("Over budget of {:.3f} s".format(args.budget))
+            failed = True
+        else:
+            print("Within budget of {:.3f} s".format(args.budget))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@
 # limitations under the License.
 #
 
+from google.cloud.bigquery_storage_v1 import BigQueryReadAsyncClient
 from google.cloud.bigquery_storage_v1 import BigQueryReadClient
 from google.cloud.bigquery_storage_v1 import gapic_types as types
 from google.cloud.bigquery_storage_v1 import __version__
@@ -40,6 +41,7 @@ __all__ = (
     "ArrowSchema",
     "AvroRows",
     "AvroSchema",
+    "BigQueryReadAsyncClient",
     "BigQueryReadClient",
     "CreateReadSessionRequest",
     "DataFormat",
@@ -16,12 +16,7 @@
 
 from __future__ import absolute_import
 
-import pkg_resources
-
-__version__ = pkg_resources.get_distribution(
-    "google-cloud-bigquery-storage"
-).version  # noqa
-
+from google.cloud.bigquery_storage_v1.version import __version__
 from google.cloud.bigquery_storage_v1 import client
 from google.cloud.bigquery_storage_v1 import types
 
@@ -30,10 +25,15 @@ class BigQueryReadClient(client.BigQueryReadClient):
     __doc__ = client.BigQueryReadClient.__doc__
 
 
+class BigQueryReadAsyncClient(client.BigQueryReadAsyncClient):
+    __doc__ = client.BigQueryReadAsyncClient.__doc__
+
+
 __all__ = (
     # google.cloud.bigquery_storage_v1
     "__version__",
     "types",
     # google.cloud.bigquery_storage_v1.client
     "BigQueryReadClient",
+    "BigQueryReadAsyncClient",
 )
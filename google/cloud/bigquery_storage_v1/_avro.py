@@ -0,0 +1,355 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Decode blocks of Avro rows with code generated for their schema.
+
+fastavro looks up how to decode each value in the schema as it goes, and
+returns a dictionary for each row. All rows of a read session have the same
+schema, so this module writes the source of a function which decodes a
+whole block of rows for one schema, with those lookups done up front, and
+compiles it once per schema.
+
+Only the Avro types which BigQuery uses are supported. Compiling a decoder
+for any other schema raises :class:`UnsupportedSchemaError`, and callers
+fall back to fastavro.
+"""
+
+from __future__ import absolute_import
+
+import datetime
+import decimal
+import itertools
+import struct
+
+import six
+
+
+# Decode each column of the block into a list of values.
+COLUMNS = "columns"
+
+# Decode each row of the block into a dictionary, as fastavro does.
+DICTS = "dicts"
+
+# Decode each row of the block into a tuple of values, in schema order.
+TUPLES = "tuples"
+
+_LAYOUTS = (COLUMNS, DICTS, TUPLES)
+
+# Days from 0001-01-01, the first ordinal of datetime.date, to 1970-01-01.
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+_NAMESPACE = {
+    "EOFError": EOFError,
+    "IndexError": IndexError,
+    "date_fromordinal": datetime.date.fromordinal,
+    "epoch": datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc),
+    "int_from_bytes": int.from_bytes,
+    "struct_error": struct.error,
+    "time": datetime.time,
+    "timedelta": datetime.timedelta,
+    "unpack_double": struct.Struct("<d").unpack_from,
+    "unpack_float": struct.Struct("<f").unpack_from,
+}
+
+# Logical types which fastavro converts, but which BigQuery doesn't use. Other
+# logical types are decoded as their underlying type, as fastavro does.
+_UNSUPPORTED_LOGICAL_TYPES = frozenset(
+    (
+        "local-timestamp-micros",
+        "local-timestamp-millis",
+        "time-millis",
+        "timestamp-millis",
+        "uuid",
+    )
+)
+
+
+class UnsupportedSchemaError(ValueError):
+    """The schema uses Avro types which decoders can't be compiled for."""
+
+
+def compile_decoder(schema, layout=COLUMNS, raw_logical_types=False):
+    """Compile a function which decodes a block of rows.
+
+    Args:
+        schema (Mapping[str, Any]):
+            The Avro schema of the rows, parsed from JSON. Must be a record.
+        layout (Optional[str]):
+            How to return the rows: :data:`COLUMNS`, :data:`DICTS` or
+            :data:`TUPLES`.
+        raw_logical_types (Optional[bool]):
+            If ``True``, return the values of top-level DATE, TIME and
+            TIMESTAMP columns as the integers they're encoded as, and NUMERIC
+            and BIGNUMERIC columns as unscaled integers, instead of Python
+            objects. Arrow arrays can be built from these directly.
+
+    Returns:
+        Callable[[bytes, int], Any]:
+            Decodes a number of rows from the Avro encoded bytes.
+
+    Raises:
+        UnsupportedSchemaError:
+            If the schema uses types which aren't supported.
+    """
+    if layout not in _LAYOUTS:
+        raise ValueError("Unknown layout: {}".format(layout))
+    if not isinstance(schema, dict) or schema.get("type") != "record":
+        raise UnsupportedSchemaError("Rows must be Avro records.")
+
+    writer = _SourceWriter()
+    writer.line(0, "def decode(buf, row_count):")
+    writer.line(1, "pos = 0")
+
+    fields = schema["fields"]
+    if layout == COLUMNS:
+        # Append each value to the list of its column.
+        stores = []
+        for index, field in enumerate(fields):
+            writer.line(1, "column_{} = []".format(index))
+            writer.line(1, "append_{0} = column_{0}.append".format(index))
+            stores.append("append_{}({{}})".format(index))
+        result = "[{}]".format(
+            ", ".join("column_{}".format(index) for index in range(len(fields)))
+        )
+    else:
+        # Keep each value in a local variable until the row is complete.
+        stores = ["value_{} = {{}}".format(index) for index in range(len(fields))]
+        writer.line(1, "rows = []")
+        writer.line(1, "append_row = rows.append")
+        result = "rows"
+
+    writer.line(1, "try:")
+    writer.line(2, "for _ in range(row_count):")
+    if not fields:
+        writer.line(3, "pass")
+    for field, store in zip(fields, stores):
+        _write_value(writer, 3, field["type"], store, raw_logical_types)
+    if layout == DICTS:
+        writer.line(
+            3,
+            "append_row({{{}}})".format(
+                ", ".join(
+                    "{!r}: value_{}".format(field["name"], index)
+                    for index, field in enumerate(fields)
+                )
+            ),
+        )
+    elif layout == TUPLES:
+        writer.line(
+            3,
+            "append_row(({}))".format(
+                "".join("value_{}, ".format(index) for index in range(len(fields)))
+            ),
+        )
+    writer.line(1, "except (IndexError, struct_error):")
+    writer.line(2, 'raise EOFError("The block has fewer rows than row_count.")')
+    writer.line(1, "return {}".format(result))
+
+    namespace = dict(_NAMESPACE, **writer.constants)
+    exec(compile(writer.source(), "<avro decoder>", "exec"), namespace)
+    return namespace["decode"]
+
+
+class _SourceWriter(object):
+    """Collect the lines of a generated function."""
+
+    def __init__(self):
+        self._lines = []
+        self._counter = itertools.count()
+        self.constants = {}
+
+    def line(self, indent, text):
+        self._lines.append("    " * indent + text)
+
+    def name(self, prefix):
+        """Return a variable name which hasn't been used yet."""
+        return "{}_{}".format(prefix, next(self._counter))
+
+    def constant(self, prefix, value):
+        """Make ``value`` available to the function under a new name."""
+        name = self.name(prefix)
+        self.constants[name] = value
+        return name
+
+    def source(self):
+        return "\n".join(self._lines) + "\n"
+
+
+def _write_long(writer, indent, target):
+    """Decode a zig-zag encoded variable-length integer into ``target``."""
+    writer.line(indent, "byte = buf[pos]")
+    writer.line(indent, "pos += 1")
+    writer.line(indent, "if byte & 0x80:")
+    writer.line(indent + 1, "accumulated = byte & 0x7F")
+    writer.line(indent + 1, "shift = 7")
+    writer.line(indent + 1, "byte = buf[pos]")
+    writer.line(indent + 1, "pos += 1")
+    writer.line(indent + 1, "while byte & 0x80:")
+    writer.line(indent + 2, "accumulated |= (byte & 0x7F) << shift")
+    writer.line(indent + 2, "shift += 7")
+    writer.line(indent + 2, "byte = buf[pos]")
+    writer.line(indent + 2, "pos += 1")
+    writer.line(indent + 1, "byte = accumulated | (byte << shift)")
+    writer.line(indent, "{} = (byte >> 1) ^ -(byte & 1)".format(target))
+
+
+def _write_value(writer, indent, schema, store, raw):
+    """Decode a value of type ``schema`` and store it.
+
+    Args:
+        writer (_SourceWriter): Where to write the code.
+        indent (int): Indentation level of the code.
+        schema (Union[str, list, Mapping[str, Any]]): The Avro type.
+        store (str):
+            A statement with a ``{}`` placeholder for the expression of the
+            decoded value.
+        raw (bool): Whether to return logical types as integers.
+    """
+    if isinstance(schema, list):
+        _write_union(writer, indent, schema, store, raw)
+        return
+    if isinstance(schema, six.string_types):
+        schema = {"type": schema}
+
+    type_name = schema["type"]
+    if not isinstance(type_name, six.string_types):
+        _write_value(writer, indent, type_name, store, raw)
+        return
+
+    logical_type = schema.get("logicalType")
+    if logical_type in _UNSUPPORTED_LOGICAL_TYPES:
+        raise UnsupportedSchemaError(
+            "Unsupported logical type: {}".format(logical_type)
+        )
+
+    if type_name == "null":
+        writer.line(indent, store.format("None"))
+    elif type_name == "boolean":
+        writer.line(indent, store.format("buf[pos] != 0"))
+        writer.line(indent, "pos += 1")
+    elif type_name in ("int", "long"):
+        _write_long(writer, indent, "value")
+        _write_integer_value(writer, indent, logical_type, store, raw)
+    elif type_name == "float":
+        writer.line(indent, store.format("unpack_float(buf, pos)[0]"))
+        writer.line(indent, "pos += 4")
+    elif type_name == "double":
+        writer.line(indent, store.format("unpack_double(buf, pos)[0]"))
+        writer.line(indent, "pos += 8")
+    elif type_name in ("bytes", "string"):
+        _write_long(writer, indent, "size")
+        if type_name == "string":
+            writer.line(indent, store.format("buf[pos:pos + size].decode()"))
+        elif logical_type == "decimal":
+            _write_decimal(writer, indent, schema, store, raw)
+        else:
+            writer.line(indent, store.format("buf[pos:pos + size]"))
+        writer.line(indent, "pos += size")
+    elif type_name == "fixed" and logical_type != "decimal":
+        size = int(schema["size"])
+        writer.line(indent, store.format("buf[pos:pos + {}]".format(size)))
+        writer.line(indent, "pos += {}".format(size))
+    elif type_name == "array":
+        _write_array(writer, indent, schema, store)
+    elif type_name == "record":
+        _write_record(writer, indent, schema, store)
+    else:
+        raise UnsupportedSchemaError("Unsupported Avro type: {}".format(type_name))
+
+
+def _write_integer_value(writer, indent, logical_type, store, raw):
+    """Store the ``int`` or ``long`` in ``value``, converting logical types."""
+    if raw or logical_type is None:
+        writer.line(indent, store.format("value"))
+    elif logical_type == "timestamp-micros":
+        writer.line(indent, store.format("epoch + timedelta(0, 0, value)"))
+    elif logical_type == "date":
+        writer.line(
+            indent, store.format("date_fromordinal(value + {})".format(_EPOCH_ORDINAL))
+        )
+    elif logical_type == "time-micros":
+        writer.line(indent, "seconds, micros = divmod(value, 1000000)")
+        writer.line(indent, "minutes, seconds = divmod(seconds, 60)")
+        writer.line(
+            indent, store.format("time(minutes // 60, minutes % 60, seconds, micros)")
+        )
+    else:
+        writer.line(indent, store.format("value"))
+
+
+def _write_decimal(writer, indent, schema, store, raw):
+    """Store the decimal in the ``size`` bytes at ``pos``."""
+    unscaled = 'int_from_bytes(buf[pos:pos + size], "big", signed=True)'
+    if raw:
+        writer.line(indent, store.format(unscaled))
+        return
+
+    # Convert the same way as fastavro, so that values compare equal.
+    context = writer.constant("context", decimal.Context(prec=int(schema["precision"])))
+    writer.line(
+        indent,
+        store.format(
+            "{context}.create_decimal({unscaled}).scaleb(-{scale}, {context})".format(
+                context=context, unscaled=unscaled, scale=int(schema.get("scale", 0)),
+            )
+        ),
+    )
+
+
+def _write_union(writer, indent, schema, store, raw):
+    """Decode a nullable value: a union of ``"null"`` and another type."""
+    if len(schema) == 1:
+        writer.line(indent, "pos += 1")
+        _write_value(writer, indent, schema[0], store, raw)
+        return
+    if len(schema) != 2 or "null" not in schema:
+        raise UnsupportedSchemaError("Only unions with null are supported.")
+
+    null_index = schema.index("null")
+    # The branch is a zig-zag encoded long, which is a single byte for the
+    # first 64 branches.
+    writer.line(indent, "if buf[pos] == {}:".format(2 * null_index))
+    writer.line(indent + 1, "pos += 1")
+    writer.line(indent + 1, store.format("None"))
+    writer.line(indent, "else:")
+    writer.line(indent + 1, "pos += 1")
+    _write_value(writer, indent + 1, schema[1 - null_index], store, raw)
+
+
+def _write_array(writer, indent, schema, store):
+    """Decode the blocks of an array, each a count followed by the items."""
+    items = writer.name("items")
+    count = writer.name("count")
+    writer.line(indent, "{} = []".format(items))
+    writer.line(indent, "while True:")
+    _write_long(writer, indent + 1, count)
+    writer.line(indent + 1, "if not {}:".format(count))
+    writer.line(indent + 2, "break")
+    writer.line(indent + 1, "if {} < 0:".format(count))
+    # A negative count is followed by the size of the block in bytes.
+    writer.line(indent + 2, "{0} = -{0}".format(count))
+    _write_long(writer, indent + 2, "size")
+    writer.line(indent + 1, "for _ in range({}):".format(count))
+    _write_value(writer, indent + 2, schema["items"], items + ".append({})", raw=False)
+    writer.line(indent, store.format(items))
+
+
+def _write_record(writer, indent, schema, store):
+    """Decode the fields of a record into a dictionary."""
+    fields = []
+    for field in schema["fields"]:
+        variable = writer.name("field")
+        _write_value(writer, indent, field["type"], variable + " = {}", raw=False)
+        fields.append("{!r}: {}".format(field["name"], variable))
+    writer.line(indent, store.format("{" + ", ".join(fields) + "}"))
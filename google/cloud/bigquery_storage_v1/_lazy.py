@@ -0,0 +1,61 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Import optional dependencies the first time they are used.
+
+pandas, pyarrow and fastavro take most of the time needed to import this
+library, and many programs only need some of them, or none.
+"""
+
+from __future__ import absolute_import
+
+import importlib
+
+
+class LazyModule(object):
+    """A module which is imported when one of its attributes is first used.
+
+    The object is false if the module can't be imported, so that optional
+    dependencies can be checked with ``if not pandas:``.
+
+    Args:
+        name (str): The full name of the module to import.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._import_error = None
+
+    def _load(self):
+        if self._module is None and self._import_error is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError as exc:
+                self._import_error = exc
+        return self._module
+
+    def __bool__(self):
+        return self._load() is not None
+
+    __nonzero__ = __bool__
+
+    def __getattr__(self, attr):
+        module = self._load()
+        if module is None:
+            raise self._import_error
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return "<LazyModule {!r}>".format(self._name)
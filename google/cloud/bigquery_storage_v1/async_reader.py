@@ -0,0 +1,427 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers to read rows with :mod:`asyncio`.
+
+These mirror the classes in :mod:`google.cloud.bigquery_storage_v1.reader`,
+and share their parsing of row messages.
+"""
+
+import asyncio
+import collections
+import inspect
+
+import google.api_core.exceptions
+
+from google.cloud.bigquery_storage_v1 import _lazy
+from google.cloud.bigquery_storage_v1 import reader
+
+pandas = _lazy.LazyModule("pandas")
+pyarrow = _lazy.LazyModule("pyarrow")
+
+
+# Number of streams read at the same time when ``concurrency`` is not set.
+_DEFAULT_CONCURRENCY = 32
+
+_BATCH = "batch"
+_ERROR = "error"
+_EXIT = "exit"
+
+
+class AsyncReadRowsStream(object):
+    """A stream of results from a read rows request, for use with asyncio.
+
+    This stream is an asynchronous iterable of
+    :class:`~google.cloud.bigquery_storage_v1.types.ReadRowsResponse`.
+    Use ``async for`` to fetch all row messages. Like
+    :class:`~google.cloud.bigquery_storage_v1.reader.ReadRowsStream`, it
+    keeps track of the offset and reconnects after transient errors.
+
+    Use the
+    :func:`~google.cloud.bigquery_storage_v1.async_reader.AsyncReadRowsStream.rows()`
+    method to parse all messages into a stream of rows, or await the
+    :func:`~google.cloud.bigquery_storage_v1.async_reader.AsyncReadRowsStream.to_arrow()`
+    or
+    :func:`~google.cloud.bigquery_storage_v1.async_reader.AsyncReadRowsStream.to_dataframe()`
+    methods to read the whole stream at once.
+    """
+
+    def __init__(self, wrapped, client, name, offset, read_rows_kwargs):
+        """Construct an AsyncReadRowsStream.
+
+        Args:
+            wrapped (Union[ \
+                Awaitable[AsyncIterable[ \
+                    ~google.cloud.bigquery_storage.types.ReadRowsResponse \
+                ]], \
+                AsyncIterable[ \
+                    ~google.cloud.bigquery_storage.types.ReadRowsResponse \
+                ], \
+            ]):
+                The ReadRows stream to read, or the pending call which opens
+                it.
+            client ( \
+                ~google.cloud.bigquery_storage_v1.services. \
+                    big_query_read.BigQueryReadAsyncClient \
+            ):
+                A GAPIC client used to reconnect to a ReadRows stream. This
+                must be the GAPIC client to avoid a circular dependency on
+                this class.
+            name (str):
+                Required. Stream ID from which rows are being read.
+            offset (int):
+                Required. Position in the stream to start
+                reading from. The offset requested must be less than the last
+                row read from ReadRows. Requesting a larger offset is
+                undefined.
+            read_rows_kwargs (dict):
+                Keyword arguments to use when reconnecting to a ReadRows
+                stream.
+        """
+        self._wrapped = wrapped
+        self._client = client
+        self._name = name
+        self._offset = offset
+        self._read_rows_kwargs = read_rows_kwargs
+
+    def __aiter__(self):
+        """An asynchronous iterable of messages.
+
+        Returns:
+            AsyncIterable[ \
+                ~google.cloud.bigquery_storage_v1.types.ReadRowsResponse \
+            ]:
+                A sequence of row messages.
+        """
+        return self._iter_messages()
+
+    async def _iter_messages(self):
+        """Receive messages, reconnecting on resumable errors."""
+        while True:
+            try:
+                # The GAPIC client returns a coroutine which opens the call.
+                if inspect.isawaitable(self._wrapped):
+                    self._wrapped = await self._wrapped
+
+                async for message in self._wrapped:
+                    rowcount = message.row_count
+                    self._offset += rowcount
+                    yield message
+
+                return  # Made it through the whole stream.
+            except google.api_core.exceptions.InternalServerError as exc:
+                resumable_error = any(
+                    resumable_message in exc.message
+                    for resumable_message in reader._STREAM_RESUMPTION_INTERNAL_ERROR_MESSAGES
+                )
+                if not resumable_error:
+                    raise
+            except reader._STREAM_RESUMPTION_EXCEPTIONS:
+                # Transient error, so reconnect to the stream.
+                pass
+
+            self._reconnect()
+
+    def _reconnect(self):
+        """Reconnect to the ReadRows stream using the most recent offset."""
+        self._wrapped = self._client.read_rows(
+            read_stream=self._name, offset=self._offset, **self._read_rows_kwargs
+        )
+
+    def rows(self, read_session, row_type=dict):
+        """Iterate over all rows in the stream.
+
+        This method requires the fastavro library in order to parse row
+        messages in avro format.  For arrow format messages, the pyarrow
+        library is required.
+
+        Args:
+            read_session ( \
+                ~google.cloud.bigquery_storage_v1.types.ReadSession \
+            ):
+                The read session associated with this read rows stream. This
+                contains the schema, which is required to parse the data
+                messages.
+            row_type (Optional[type]):
+                The type of rows to produce. Either :class:`dict` (the
+                default), or :class:`~google.cloud.bigquery_storage_v1.reader.Row`.
+
+        Returns:
+            ~google.cloud.bigquery_storage_v1.async_reader.AsyncReadRowsIterable:
+                An asynchronous iterable of rows.
+        """
+        return AsyncReadRowsIterable(self, read_session, row_type=row_type)
+
+    async def to_arrow(self, read_session):
+        """Create a :class:`pyarrow.Table` of all rows in the stream.
+
+        This method requires the pyarrow library. Streams using the Avro
+        format also require the fastavro library.
+
+        Args:
+            read_session ( \
+                ~google.cloud.bigquery_storage_v1.types.ReadSession \
+            ):
+                The read session associated with this read rows stream. This
+                contains the schema, which is required to parse the data
+                messages.
+
+        Returns:
+            pyarrow.Table:
+                A table of all rows in the stream.
+        """
+        return await self.rows(read_session).to_arrow()
+
+    async def to_dataframe(self, read_session, dtypes=None, low_memory=False):
+        """Create a :class:`pandas.DataFrame` of all rows in the stream.
+
+        This method requires the pandas libary to create a data frame and the
+        fastavro library to parse row messages.
+
+        Args:
+            read_session ( \
+                ~google.cloud.bigquery_storage_v1.types.ReadSession \
+            ):
+                The read session associated with this read rows stream. This
+                contains the schema, which is required to parse the data
+                messages.
+            dtypes ( \
+                Map[str, Union[str, pandas.Series.dtype]] \
+            ):
+                Optional. A dictionary of column names pandas ``dtype``s. The
+                provided ``dtype`` is used when constructing the series for
+                the column specified. Otherwise, the default pandas behavior
+                is used.
+            low_memory (Optional[bool]):
+                If ``True``, release memory while reading and converting,
+                as in
+                :meth:`~google.cloud.bigquery_storage_v1.reader.ReadRowsStream.to_dataframe`.
+
+        Returns:
+            pandas.DataFrame:
+                A data frame of all rows in the stream.
+        """
+        if not pandas:
+            raise ImportError(reader._PANDAS_REQUIRED)
+
+        return await self.rows(read_session).to_dataframe(
+            dtypes=dtypes, low_memory=low_memory
+        )
+
+
+class AsyncReadRowsIterable(object):
+    """An asynchronous iterable of rows from a read session.
+
+    Args:
+        stream (google.cloud.bigquery_storage_v1.async_reader.AsyncReadRowsStream):
+            A read rows stream.
+        read_session (google.cloud.bigquery_storage_v1.types.ReadSession):
+            A read session. This is required because it contains the schema
+            used in the stream messages.
+        row_type (Optional[type]):
+            The type of rows to produce. Either :class:`dict` (the default)
+            or :class:`~google.cloud.bigquery_storage_v1.reader.Row`.
+    """
+
+    def __init__(self, stream, read_session, row_type=dict):
+        # Parsing and validation are shared with the synchronous iterable.
+        self._rows = reader.ReadRowsIterable((), read_session, row_type=row_type)
+        self._stream = stream
+        self._read_session = read_session
+        self._row_type = row_type
+
+    @property
+    async def pages(self):
+        """An asynchronous generator of all pages in the stream.
+
+        Returns:
+            AsyncIterable[google.cloud.bigquery_storage_v1.reader.ReadRowsPage]:
+                A generator of pages.
+        """
+        async for message in self._stream:
+            yield reader.ReadRowsPage(
+                self._rows._stream_parser, message, row_type=self._row_type
+            )
+
+    async def __aiter__(self):
+        """Iterator for each row in all pages."""
+        async for page in self.pages:
+            for row in page:
+                yield row
+
+    async def to_arrow(self):
+        """Create a :class:`pyarrow.Table` of all rows in the stream.
+
+        This method requires the pyarrow library. Streams using the Avro
+        format also require the fastavro library.
+
+        Returns:
+            pyarrow.Table:
+                A table of all rows in the stream.
+        """
+        record_batches = []
+        async for page in self.pages:
+            record_batches.append(page.to_arrow())
+
+        if record_batches:
+            return pyarrow.Table.from_batches(record_batches)
+
+        # No data, return an empty Table.
+        return self._rows.to_arrow()
+
+    async def to_dataframe(self, dtypes=None, low_memory=False):
+        """Create a :class:`pandas.DataFrame` of all rows in the stream.
+
+        This method requires the pandas libary to create a data frame and the
+        fastavro library to parse row messages.
+
+        Args:
+            dtypes ( \
+                Map[str, Union[str, pandas.Series.dtype]] \
+            ):
+                Optional. A dictionary of column names pandas ``dtype``s. The
+                provided ``dtype`` is used when constructing the series for
+                the column specified. Otherwise, the default pandas behavior
+                is used.
+            low_memory (Optional[bool]):
+                If ``True``, release memory while reading and converting,
+                as in
+                :meth:`~google.cloud.bigquery_storage_v1.reader.ReadRowsIterable.to_dataframe`.
+
+        Returns:
+            pandas.DataFrame:
+                A data frame of all rows in the stream.
+        """
+        if not pandas:
+            raise ImportError(reader._PANDAS_REQUIRED)
+
+        if dtypes is None:
+            dtypes = {}
+
+        schema_type = self._read_session._pb.WhichOneof("schema")
+
+        if schema_type == "arrow_schema" or pyarrow:
+            if not low_memory:
+                return reader._arrow_to_dataframe(await self.to_arrow(), dtypes)
+
+            record_batches = []
+            async for page in self.pages:
+                record_batches.append(
+                    reader._copy_record_batch(page.to_arrow(), dtypes)
+                )
+
+            if record_batches:
+                table = pyarrow.Table.from_batches(record_batches)
+            else:
+                table = self._rows.to_arrow()
+            return reader._arrow_to_dataframe(table, dtypes, low_memory)
+
+        frames = []
+        async for page in self.pages:
+            frames.append(page.to_dataframe(dtypes=dtypes))
+
+        if frames:
+            return pandas.concat(frames)
+
+        # No data, construct an empty dataframe with columns matching the schema.
+        return self._rows.to_dataframe(dtypes=dtypes)
+
+
+async def read_session_batches(
+    client, read_session, concurrency=None, read_rows_kwargs=None
+):
+    """Read record batches from all streams in a session concurrently.
+
+    Up to ``concurrency`` streams are read at the same time on the current
+    event loop. When a stream is finished, the next stream in the session
+    which hasn't been read yet takes its place. Record batches are returned
+    as soon as they are decoded, from whichever stream they came from.
+
+    This function requires the pyarrow library. Streams using the Avro
+    format also require the fastavro library.
+
+    Args:
+        client ( \
+            ~google.cloud.bigquery_storage_v1.services. \
+                big_query_read.BigQueryReadAsyncClient \
+        ):
+            A GAPIC client used to open a ReadRows stream for each stream
+            in the session.
+        read_session ( \
+            ~google.cloud.bigquery_storage_v1.types.ReadSession \
+        ):
+            The read session to read. This contains the streams to read and
+            the schema, which is required to parse the data messages.
+        concurrency (Optional[int]):
+            Maximum number of streams to read at the same time. Defaults to
+            the number of streams in the session, up to 32.
+        read_rows_kwargs (Optional[dict]):
+            Keyword arguments to use when opening each ReadRows stream.
+
+    Returns:
+        AsyncIterable[pyarrow.RecordBatch]:
+            A sequence of record batches, in the order they are received.
+    """
+    if not pyarrow:
+        raise ImportError(reader._PYARROW_REQUIRED)
+
+    names = collections.deque(stream.name for stream in read_session.streams)
+    if concurrency is None:
+        concurrency = min(len(names), _DEFAULT_CONCURRENCY)
+    workers = min(max(concurrency, 1), len(names))
+    if not workers:
+        return
+
+    if read_rows_kwargs is None:
+        read_rows_kwargs = {}
+
+    # Bound the number of decoded batches waiting for the caller, so that
+    # streams are not read far ahead of a slow consumer.
+    results = asyncio.Queue(maxsize=2 * workers)
+
+    async def work():
+        try:
+            while names:
+                name = names.popleft()
+                stream = AsyncReadRowsStream(
+                    client.read_rows(read_stream=name, offset=0, **read_rows_kwargs),
+                    client,
+                    name,
+                    0,
+                    read_rows_kwargs,
+                )
+                async for page in stream.rows(read_session).pages:
+                    await results.put((_BATCH, page.to_arrow()))
+        except asyncio.CancelledError:
+            # The caller stopped reading, so nobody is waiting for results.
+            raise
+        except Exception as exc:
+            await results.put((_ERROR, exc))
+        await results.put((_EXIT, None))
+
+    tasks = [asyncio.ensure_future(work()) for _ in range(workers)]
+    try:
+        while workers:
+            kind, value = await results.get()
+
+            if kind == _ERROR:
+                raise value
+            elif kind == _EXIT:
+                workers -= 1
+            else:
+                yield value
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
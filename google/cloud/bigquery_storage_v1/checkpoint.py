@@ -0,0 +1,195 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Durable checkpoints of read sessions, so that reads can be resumed."""
+
+from __future__ import absolute_import
+
+import threading
+import time
+
+from google.cloud.bigquery_storage_v1 import types
+
+
+# Seconds between writes of offsets to the checkpoint store.
+DEFAULT_CHECKPOINT_INTERVAL = 10.0
+
+
+class CheckpointStore(object):
+    """Storage for read sessions and the offsets read from their streams.
+
+    Subclass this to keep checkpoints somewhere other than a local SQLite
+    database.
+    """
+
+    def save_session(self, read_session):
+        """Save a read session, so that it can be resumed later.
+
+        Args:
+            read_session (~google.cloud.bigquery_storage_v1.types.ReadSession):
+                The read session to save.
+        """
+        raise NotImplementedError("Not implemented.")
+
+    def load_session(self, session_name):
+        """Load a saved read session.
+
+        Args:
+            session_name (str): The name of the read session.
+
+        Returns:
+            Optional[~google.cloud.bigquery_storage_v1.types.ReadSession]:
+                The read session, or ``None`` if it was never saved.
+        """
+        raise NotImplementedError("Not implemented.")
+
+    def save_offsets(self, session_name, offsets):
+        """Save the number of rows processed from streams in a session.
+
+        Args:
+            session_name (str): The name of the read session.
+            offsets (Mapping[str, int]):
+                Stream names to offsets. Streams which are not included keep
+                their previously saved offset.
+        """
+        raise NotImplementedError("Not implemented.")
+
+    def load_offsets(self, session_name):
+        """Load the number of rows processed from streams in a session.
+
+        Args:
+            session_name (str): The name of the read session.
+
+        Returns:
+            Dict[str, int]: Stream names to offsets.
+        """
+        raise NotImplementedError("Not implemented.")
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Keep checkpoints in a local SQLite database.
+
+    Args:
+        path (str):
+            Path to the database file. It is created if it doesn't exist.
+    """
+
+    def __init__(self, path):
+        # Imported here, as sqlite3 is only needed by this store and is
+        # missing from some Python builds.
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS read_sessions ("
+                "name TEXT PRIMARY KEY, read_session BLOB NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS stream_offsets ("
+                "session_name TEXT NOT NULL, stream_name TEXT NOT NULL, "
+                "row_offset INTEGER NOT NULL, "
+                "PRIMARY KEY (session_name, stream_name))"
+            )
+
+    def save_session(self, read_session):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO read_sessions VALUES (?, ?)",
+                (read_session.name, types.ReadSession.serialize(read_session)),
+            )
+
+    def load_session(self, session_name):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT read_session FROM read_sessions WHERE name = ?",
+                (session_name,),
+            ).fetchone()
+        if row is None:
+            return None
+        return types.ReadSession.deserialize(row[0])
+
+    def save_offsets(self, session_name, offsets):
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO stream_offsets VALUES (?, ?, ?)",
+                [(session_name, name, offset) for name, offset in offsets.items()],
+            )
+
+    def load_offsets(self, session_name):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT stream_name, row_offset FROM stream_offsets "
+                "WHERE session_name = ?",
+                (session_name,),
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class _Checkpointer(object):
+    """Record offsets as they are processed, and save them periodically.
+
+    Args:
+        store (CheckpointStore): Where to save offsets.
+        session_name (str): The name of the read session.
+        interval (float): Minimum number of seconds between saves.
+    """
+
+    def __init__(self, store, session_name, interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self._store = store
+        self._session_name = session_name
+        self._interval = interval
+        self._pending = {}
+        self._last_save = time.monotonic()
+
+    def commit(self, stream_name, offset):
+        """Record that rows up to ``offset`` in a stream were processed."""
+        self._pending[stream_name] = offset
+        if time.monotonic() - self._last_save >= self._interval:
+            self.flush()
+
+    def flush(self):
+        """Save all recorded offsets."""
+        if self._pending:
+            self._store.save_offsets(self._session_name, self._pending)
+            self._pending = {}
+        self._last_save = time.monotonic()
+
+
+def _check_not_expired(read_session):
+    """Raise an error if a read session can no longer be read.
+
+    Args:
+        read_session (~google.cloud.bigquery_storage_v1.types.ReadSession):
+            The read session to check.
+
+    Raises:
+        ValueError: If the session has expired.
+    """
+    if "expire_time" not in read_session:
+        return
+
+    expire_time = read_session.expire_time.timestamp()
+    if expire_time <= time.time():
+        raise ValueError(
+            "Read session {0} has expired and can't be resumed.".format(
+                read_session.name
+            )
+        )
@@ -21,9 +21,16 @@ This is the base from which all interactions with the API occur.
 
 from __future__ import absolute_import
 
+import functools
+
 import google.api_core.gapic_v1.method
 
+from google.cloud.bigquery_storage_v1 import async_reader
+from google.cloud.bigquery_storage_v1 import checkpoint
+from google.cloud.bigquery_storage_v1 import grpc_transport
 from google.cloud.bigquery_storage_v1 import reader
+from google.cloud.bigquery_storage_v1 import session_reader
+from google.cloud.bigquery_storage_v1 import types
 from google.cloud.bigquery_storage_v1.services import big_query_read
 
 
@@ -37,8 +44,131 @@ class BigQueryReadClient(big_query_read.BigQueryReadClient):
     """Client for interacting with BigQuery Storage API.
 
     The BigQuery storage API can be used to read data stored in BigQuery.
+
+    Args:
+        session_cache (Optional[ \
+            ~google.cloud.bigquery_storage_v1.session_cache.ReadSessionCache \
+        ]):
+            If set, :meth:`create_read_session` reuses sessions from this
+            cache which read the same snapshot of a table.
+        channel_pool_size (Optional[int]):
+            The number of gRPC channels to spread ``read_rows`` calls over.
+            See :class:`~google.cloud.bigquery_storage_v1.grpc_transport.BigQueryReadGrpcTransport`.
+        channel_options (Optional[Sequence[Tuple[str, Any]]]):
+            gRPC channel arguments, such as
+            :data:`~google.cloud.bigquery_storage_v1.grpc_transport.BULK_READ_CHANNEL_OPTIONS`.
+
+    Other arguments are passed to
+    :class:`~google.cloud.bigquery_storage_v1.services.big_query_read.BigQueryReadClient`.
+
+    Raises:
+        ValueError:
+            If ``channel_pool_size`` or ``channel_options`` are set along
+            with a ``transport`` other than ``"grpc"``.
     """
 
+    def __init__(
+        self,
+        *args,
+        session_cache=None,
+        channel_pool_size=1,
+        channel_options=(),
+        **kwargs,
+    ):
+        if channel_pool_size != 1 or channel_options:
+            if kwargs.get("transport") not in (None, "grpc"):
+                raise ValueError(
+                    "channel_pool_size and channel_options can't be used with "
+                    "a transport."
+                )
+            kwargs["transport"] = functools.partial(
+                grpc_transport.BigQueryReadGrpcTransport,
+                channel_pool_size=channel_pool_size,
+                channel_options=channel_options,
+            )
+        super(BigQueryReadClient, self).__init__(*args, **kwargs)
+        self._session_cache = session_cache
+
+    @classmethod
+    def get_transport_class(cls, label=None):
+        # __init__ passes a function which creates a transport with a pool of
+        # channels, instead of the name of a transport.
+        if callable(label):
+            return label
+        return type(cls).get_transport_class(cls, label)
+
+    def create_read_session(
+        self,
+        request=None,
+        *,
+        parent=None,
+        read_session=None,
+        max_stream_count=None,
+        retry=google.api_core.gapic_v1.method.DEFAULT,
+        timeout=None,
+        metadata=(),
+    ):
+        """
+        Creates a new read session, or reuses one from the session cache.
+
+        Takes the same arguments as
+        :meth:`~google.cloud.bigquery_storage_v1.services.big_query_read.BigQueryReadClient.create_read_session`.
+        If the client has a ``session_cache`` and the request reads a table
+        at a fixed ``table_modifiers.snapshot_time``, a still valid session
+        created earlier for the same request is returned instead of calling
+        the API.
+
+        Example:
+            >>> from google.cloud import bigquery_storage
+            >>> from google.cloud.bigquery_storage_v1 import session_cache
+            >>>
+            >>> client = bigquery_storage.BigQueryReadClient(
+            ...     session_cache=session_cache.ReadSessionCache()
+            ... )
+            >>>
+            >>> requested_session = bigquery_storage.types.ReadSession(
+            ...     table=table,
+            ...     data_format=bigquery_storage.types.DataFormat.ARROW,
+            ...     table_modifiers={"snapshot_time": snapshot_time},
+            ... )
+            >>> session = client.create_read_session(
+            ...     parent=parent, read_session=requested_session
+            ... )
+
+        Returns:
+            ~google.cloud.bigquery_storage_v1.types.ReadSession:
+                The read session.
+        """
+        gapic_client = super(BigQueryReadClient, self)
+        has_flattened_params = any([parent, read_session, max_stream_count])
+        if self._session_cache is None or (
+            request is not None and has_flattened_params
+        ):
+            return gapic_client.create_read_session(
+                request,
+                parent=parent,
+                read_session=read_session,
+                max_stream_count=max_stream_count,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+
+        request = types.CreateReadSessionRequest(request)
+        if parent is not None:
+            request.parent = parent
+        if read_session is not None:
+            request.read_session = read_session
+        if max_stream_count is not None:
+            request.max_stream_count = max_stream_count
+
+        return self._session_cache.get_or_create(
+            request,
+            lambda: gapic_client.create_read_session(
+                request, retry=retry, timeout=timeout, metadata=metadata
+            ),
+        )
+
     def read_rows(
         self,
         name,
@@ -46,6 +176,9 @@ class BigQueryReadClient(big_query_read.BigQueryReadClient):
         retry=google.api_core.gapic_v1.method.DEFAULT,
         timeout=google.api_core.gapic_v1.method.DEFAULT,
         metadata=(),
+        prefetch_messages=0,
+        prefetch_bytes=None,
+        page_callback=None,
     ):
         """
         Reads rows from the table in the format prescribed by the read
@@ -107,6 +240,19 @@ class BigQueryReadClient(big_query_read.BigQueryReadClient):
                 specified, the timeout applies to each individual attempt.
             metadata (Optional[Sequence[Tuple[str, str]]]): Additional metadata
                 that is provided to the method.
+            prefetch_messages (Optional[int]):
+                Maximum number of messages to receive on a background thread
+                ahead of the caller, so that receiving from the network
+                overlaps with parsing rows. If ``0`` (the default), messages
+                are only received when the caller asks for them.
+            prefetch_bytes (Optional[int]):
+                Maximum total size, in bytes, of messages received ahead of
+                the caller. Only used if ``prefetch_messages`` is set.
+            page_callback (Optional[Callable[ \
+                [~google.cloud.bigquery_storage_v1.reader.PageStats], None \
+            ]]):
+                Called with throughput, progress, and throttling statistics
+                for each page read from the stream.
 
         Returns:
             ~google.cloud.bigquery_storage_v1.reader.ReadRowsStream:
@@ -134,4 +280,332 @@ class BigQueryReadClient(big_query_read.BigQueryReadClient):
             name,
             offset,
             {"retry": retry, "timeout": timeout, "metadata": metadata},
+            prefetch_messages=prefetch_messages,
+            prefetch_bytes=prefetch_bytes,
+            page_callback=page_callback,
+        )
+
+    def read_session(
+        self,
+        read_session,
+        max_workers=None,
+        split_streams=False,
+        retry=google.api_core.gapic_v1.method.DEFAULT,
+        timeout=google.api_core.gapic_v1.method.DEFAULT,
+        metadata=(),
+        checkpoint_store=None,
+        checkpoint_interval=checkpoint.DEFAULT_CHECKPOINT_INTERVAL,
+        adaptive_concurrency=False,
+        hedge_streams=False,
+    ):
+        """
+        Reads rows from all streams in a read session concurrently.
+
+        Each stream is read on a worker thread, which also decodes the pages
+        it receives. The results can be combined into a single
+        :class:`pyarrow.Table` or :class:`pandas.DataFrame`, or processed as
+        record batches as soon as they are decoded.
+
+        Example:
+            >>> from google.cloud import bigquery_storage
+            >>>
+            >>> client = bigquery_storage.BigQueryReadClient()
+            >>>
+            >>> # TODO: Initialize ``table``:
+            >>> table = "projects/{}/datasets/{}/tables/{}".format(
+            ...     'project_id': 'your-data-project-id',
+            ...     'dataset_id': 'your_dataset_id',
+            ...     'table_id': 'your_table_id',
+            ... )
+            >>>
+            >>> # TODO: Initialize `parent`:
+            >>> parent = 'projects/your-billing-project-id'
+            >>>
+            >>> requested_session = bigquery_storage.types.ReadSession(
+            ...     table=table,
+            ...     data_format=bigquery_storage.types.DataFormat.ARROW,
+            ... )
+            >>> session = client.create_read_session(
+            ...     parent=parent, read_session=requested_session
+            ... )
+            >>>
+            >>> table = client.read_session(session).to_arrow()
+
+        Args:
+            read_session (~google.cloud.bigquery_storage_v1.types.ReadSession):
+                Required. The read session to read, as returned by
+                :meth:`create_read_session`.
+            max_workers (Optional[int]):
+                Maximum number of streams to read at the same time. Defaults
+                to the number of streams in the session, up to 32.
+            split_streams (Optional[bool]):
+                If ``True``, a worker which has no more streams to read
+                splits the stream with the most work left, using
+                :meth:`split_read_stream`, and reads the remainder. This
+                helps when the server assigns much more data to some streams
+                than others, such as when using a row restriction.
+            retry (Optional[google.api_core.retry.Retry]):  A retry object used
+                to retry requests. If ``None`` is specified, requests will not
+                be retried.
+            timeout (Optional[float]): The amount of time, in seconds, to wait
+                for the request to complete. Note that if ``retry`` is
+                specified, the timeout applies to each individual attempt.
+            metadata (Optional[Sequence[Tuple[str, str]]]): Additional metadata
+                that is provided to the method.
+            checkpoint_store (Optional[ \
+                ~google.cloud.bigquery_storage_v1.checkpoint.CheckpointStore \
+            ]):
+                If set, save the session and the offsets of record batches
+                processed from
+                :meth:`~google.cloud.bigquery_storage_v1.session_reader.ReadSessionReader.record_batches`,
+                so that the read can be continued with
+                :meth:`resume_read_session` after a crash. Can't be used with
+                ``split_streams``.
+            checkpoint_interval (Optional[float]):
+                Minimum number of seconds between saves of offsets to the
+                ``checkpoint_store``.
+            adaptive_concurrency (Optional[bool]):
+                If ``True``, start by reading a few streams at the same time
+                and adjust that number, up to ``max_workers``, based on the
+                throughput and the throttling reported by the server. Use
+                this with a generous ``max_workers`` when it's unclear how
+                many streams can be read at once without being throttled.
+            hedge_streams (Optional[bool]):
+                If ``True``, a worker which has no more streams to read
+                watches for a stream read at well under the median rows per
+                second of the session. It splits the rest of that stream
+                with :meth:`split_read_stream` and reads it again, keeping
+                the rows of whichever read finishes first. This helps when a
+                few streams are served by slow backends. Can't be used with
+                ``split_streams`` or a ``checkpoint_store``.
+
+        Returns:
+            ~google.cloud.bigquery_storage_v1.session_reader.ReadSessionReader:
+                A reader for all rows in the session.
+        """
+        return session_reader.ReadSessionReader(
+            self,
+            read_session,
+            max_workers=max_workers,
+            split_streams=split_streams,
+            read_rows_kwargs={"retry": retry, "timeout": timeout, "metadata": metadata},
+            checkpoint_store=checkpoint_store,
+            checkpoint_interval=checkpoint_interval,
+            adaptive_concurrency=adaptive_concurrency,
+            hedge_streams=hedge_streams,
+        )
+
+    def resume_read_session(
+        self,
+        session_name,
+        checkpoint_store,
+        max_workers=None,
+        retry=google.api_core.gapic_v1.method.DEFAULT,
+        timeout=google.api_core.gapic_v1.method.DEFAULT,
+        metadata=(),
+        checkpoint_interval=checkpoint.DEFAULT_CHECKPOINT_INTERVAL,
+    ):
+        """
+        Continues reading a read session from a checkpoint.
+
+        The session must have been read with :meth:`read_session` and a
+        ``checkpoint_store``. Each stream continues from the last offset
+        saved in the store, and offsets keep being saved as record batches
+        are processed.
+
+        Example:
+            >>> from google.cloud import bigquery_storage
+            >>> from google.cloud.bigquery_storage_v1 import checkpoint
+            >>>
+            >>> client = bigquery_storage.BigQueryReadClient()
+            >>> store = checkpoint.SQLiteCheckpointStore("checkpoints.db")
+            >>>
+            >>> reader = client.resume_read_session(session_name, store)
+            >>> for batch in reader.record_batches(ordered=False):
+            ...     # process batch
+            ...     pass
+
+        Args:
+            session_name (str):
+                Required. Name of the read session to continue reading.
+            checkpoint_store ( \
+                ~google.cloud.bigquery_storage_v1.checkpoint.CheckpointStore \
+            ):
+                Required. The store which the session was saved to.
+            max_workers (Optional[int]):
+                Maximum number of streams to read at the same time. Defaults
+                to the number of streams in the session, up to 32.
+            retry (Optional[google.api_core.retry.Retry]):  A retry object used
+                to retry requests. If ``None`` is specified, requests will not
+                be retried.
+            timeout (Optional[float]): The amount of time, in seconds, to wait
+                for the request to complete. Note that if ``retry`` is
+                specified, the timeout applies to each individual attempt.
+            metadata (Optional[Sequence[Tuple[str, str]]]): Additional metadata
+                that is provided to the method.
+            checkpoint_interval (Optional[float]):
+                Minimum number of seconds between saves of offsets to the
+                ``checkpoint_store``.
+
+        Returns:
+            ~google.cloud.bigquery_storage_v1.session_reader.ReadSessionReader:
+                A reader for the rows which were not processed yet.
+
+        Raises:
+            ValueError: If the session wasn't saved, or has expired.
+        """
+        read_session = checkpoint_store.load_session(session_name)
+        if read_session is None:
+            raise ValueError(
+                "No checkpoint found for read session {0}.".format(session_name)
+            )
+        checkpoint._check_not_expired(read_session)
+
+        return self.read_session(
+            read_session,
+            max_workers=max_workers,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+            checkpoint_store=checkpoint_store,
+            checkpoint_interval=checkpoint_interval,
+        )
+
+
+class BigQueryReadAsyncClient(big_query_read.BigQueryReadAsyncClient):
+    """Client for interacting with BigQuery Storage API from asyncio.
+
+    The BigQuery storage API can be used to read data stored in BigQuery.
+    """
+
+    def read_rows(
+        self,
+        name,
+        offset=0,
+        retry=google.api_core.gapic_v1.method.DEFAULT,
+        timeout=None,
+        metadata=(),
+    ):
+        """
+        Reads rows from the table in the format prescribed by the read
+        session, for use with asyncio.
+
+        The stream is opened when it is first iterated. Like
+        :meth:`BigQueryReadClient.read_rows`, the returned stream keeps track
+        of the offset and reconnects after transient errors.
+
+        Example:
+            >>> from google.cloud import bigquery_storage
+            >>>
+            >>> client = bigquery_storage.BigQueryReadAsyncClient()
+            >>>
+            >>> # TODO: Create a read session with ``create_read_session``.
+            >>> session = await client.create_read_session(
+            ...     parent=parent, read_session=requested_session
+            ... )
+            >>>
+            >>> stream = session.streams[0],  # TODO: Also read any other streams.
+            >>> read_rows_stream = client.read_rows(stream.name)
+            >>>
+            >>> async for element in read_rows_stream.rows(session):
+            ...     # process element
+            ...     pass
+
+        Args:
+            name (str):
+                Required. Name of the stream to start
+                reading from, of the form
+                `projects/{project_id}/locations/{location}/sessions/{session_id}/streams/{stream_id}`
+            offset (Optional[int]):
+                The starting offset from which to begin reading rows from
+                in the stream. The offset requested must be less than the last
+                row read from ReadRows. Requesting a larger offset is
+                undefined.
+            retry (Optional[google.api_core.retry.Retry]):  A retry object used
+                to retry requests. If ``None`` is specified, requests will not
+                be retried.
+            timeout (Optional[float]): The amount of time, in seconds, to wait
+                for the request to complete. Note that if ``retry`` is
+                specified, the timeout applies to each individual attempt.
+            metadata (Optional[Sequence[Tuple[str, str]]]): Additional metadata
+                that is provided to the method.
+
+        Returns:
+            ~google.cloud.bigquery_storage_v1.async_reader.AsyncReadRowsStream:
+                An asynchronous iterable of
+                :class:`~google.cloud.bigquery_storage_v1.types.ReadRowsResponse`.
+        """
+        gapic_client = super(BigQueryReadAsyncClient, self)
+        stream = gapic_client.read_rows(
+            read_stream=name,
+            offset=offset,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+        return async_reader.AsyncReadRowsStream(
+            stream,
+            gapic_client,
+            name,
+            offset,
+            {"retry": retry, "timeout": timeout, "metadata": metadata},
+        )
+
+    def read_session_batches(
+        self,
+        read_session,
+        concurrency=None,
+        retry=google.api_core.gapic_v1.method.DEFAULT,
+        timeout=None,
+        metadata=(),
+    ):
+        """
+        Reads record batches from all streams in a read session
+        concurrently, for use with asyncio.
+
+        Up to ``concurrency`` ReadRows calls are open at the same time, all
+        on the current event loop. Record batches are returned as soon as
+        they are decoded, from whichever stream they came from.
+
+        Example:
+            >>> from google.cloud import bigquery_storage
+            >>>
+            >>> client = bigquery_storage.BigQueryReadAsyncClient()
+            >>>
+            >>> # TODO: Create a read session with ``create_read_session``.
+            >>> session = await client.create_read_session(
+            ...     parent=parent, read_session=requested_session
+            ... )
+            >>>
+            >>> async for batch in client.read_session_batches(
+            ...     session, concurrency=8
+            ... ):
+            ...     # process batch
+            ...     pass
+
+        Args:
+            read_session (~google.cloud.bigquery_storage_v1.types.ReadSession):
+                Required. The read session to read, as returned by
+                :meth:`create_read_session`.
+            concurrency (Optional[int]):
+                Maximum number of streams to read at the same time. Defaults
+                to the number of streams in the session, up to 32.
+            retry (Optional[google.api_core.retry.Retry]):  A retry object used
+                to retry requests. If ``None`` is specified, requests will not
+                be retried.
+            timeout (Optional[float]): The amount of time, in seconds, to wait
+                for the request to complete. Note that if ``retry`` is
+                specified, the timeout applies to each individual attempt.
+            metadata (Optional[Sequence[Tuple[str, str]]]): Additional metadata
+                that is provided to the method.
+
+        Returns:
+            AsyncIterable[pyarrow.RecordBatch]:
+                A sequence of record batches, in the order they are received.
+        """
+        return async_reader.read_session_batches(
+            super(BigQueryReadAsyncClient, self),
+            read_session,
+            concurrency=concurrency,
+            read_rows_kwargs={"retry": retry, "timeout": timeout, "metadata": metadata},
         )
@@ -14,70 +14,74 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+"""All message and enum types used by the BigQuery Storage API.
+
+Types are looked up when first used, from a table of names, so that
+importing this module doesn't have to search the modules which define them.
+Local types report ``google.cloud.bigquery_storage_v1.types`` as their
+module as soon as this module is imported, whichever types are used.
+"""
+
 from __future__ import absolute_import
 
-import collections
-import inspect
+import importlib
 import sys
 
-import proto
-
-from google.cloud.bigquery_storage_v1.types import arrow
-from google.cloud.bigquery_storage_v1.types import avro
-from google.cloud.bigquery_storage_v1.types import storage
-from google.cloud.bigquery_storage_v1.types import stream
-
-from google.protobuf import message as protobuf_message
-from google.protobuf import timestamp_pb2
-
-
-# The current api core helper does not find new proto messages of type proto.Message,
-# thus we need our own helper. Adjusted from
-# https://github.com/googleapis/python-api-core/blob/8595f620e7d8295b6a379d6fd7979af3bef717e2/google/api_core/protobuf_helpers.py#L101-L118
-def _get_protobuf_messages(module):
-    """Discover all protobuf Message classes in a given import module.
-
-    Args:
-        module (module): A Python module; :func:`dir` will be run against this
-            module to find Message subclasses.
-
-    Returns:
-        dict[str, proto.Message]: A dictionary with the
-            Message class names as keys, and the Message subclasses themselves
-            as values.
-    """
-    answer = collections.OrderedDict()
-    for name in dir(module):
-        candidate = getattr(module, name)
-        if inspect.isclass(candidate) and issubclass(
-            candidate, (proto.Enum, proto.Message, protobuf_message.Message)
-        ):
-            answer[name] = candidate
-    return answer
-
-
-_shared_modules = [
-    timestamp_pb2,
-]
-
-_local_modules = [
-    arrow,
-    avro,
-    storage,
-    stream,
-]
-
-names = []
-
-for module in _shared_modules:  # pragma: NO COVER
-    for name, message in _get_protobuf_messages(module).items():
-        setattr(sys.modules[__name__], name, message)
-        names.append(name)
-for module in _local_modules:  # pragma: NO COVER
-    for name, message in _get_protobuf_messages(module).items():
-        message.__module__ = "google.cloud.bigquery_storage_v1.types"
-        setattr(sys.modules[__name__], name, message)
-        names.append(name)
-
-
-__all__ = tuple(sorted(names))
+
+_LOCAL_TYPES_MODULE = "google.cloud.bigquery_storage_v1.types"
+
+# Type names and the modules which define them. Regenerate this table with
+# ``python scripts/generate_gapic_types.py`` after regenerating the library.
+# BEGIN GENERATED TYPES
+_TYPES = {
+    "ArrowRecordBatch": "google.cloud.bigquery_storage_v1.types.arrow",
+    "ArrowSchema": "google.cloud.bigquery_storage_v1.types.arrow",
+    "AvroRows": "google.cloud.bigquery_storage_v1.types.avro",
+    "AvroSchema": "google.cloud.bigquery_storage_v1.types.avro",
+    "CreateReadSessionRequest": "google.cloud.bigquery_storage_v1.types.storage",
+    "DataFormat": "google.cloud.bigquery_storage_v1.types.stream",
+    "ReadRowsRequest": "google.cloud.bigquery_storage_v1.types.storage",
+    "ReadRowsResponse": "google.cloud.bigquery_storage_v1.types.storage",
+    "ReadSession": "google.cloud.bigquery_storage_v1.types.stream",
+    "ReadStream": "google.cloud.bigquery_storage_v1.types.stream",
+    "SplitReadStreamRequest": "google.cloud.bigquery_storage_v1.types.storage",
+    "SplitReadStreamResponse": "google.cloud.bigquery_storage_v1.types.storage",
+    "StreamStats": "google.cloud.bigquery_storage_v1.types.storage",
+    "ThrottleState": "google.cloud.bigquery_storage_v1.types.storage",
+    "Timestamp": "google.protobuf.timestamp_pb2",
+}
+# END GENERATED TYPES
+
+
+def __getattr__(name):
+    try:
+        module_name = _TYPES[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    message = getattr(importlib.import_module(module_name), name)
+    globals()[name] = message
+    return message
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_TYPES))
+
+
+names = sorted(_TYPES)
+
+__all__ = tuple(names)
+
+
+# The local types modules are imported with the package, so this doesn't
+# import anything new.
+for _name, _module_name in _TYPES.items():
+    if _module_name.startswith(_LOCAL_TYPES_MODULE + "."):
+        __getattr__(_name).__module__ = _LOCAL_TYPES_MODULE
+
+
+# Module __getattr__ requires Python 3.7 or later. Look up every type now on
+# older versions.
+if sys.version_info < (3, 7):  # pragma: NO COVER
+    for _name in __all__:
+        __getattr__(_name)
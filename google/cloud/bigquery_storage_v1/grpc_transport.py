@@ -0,0 +1,221 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A gRPC transport which spreads streams over several connections."""
+
+from __future__ import absolute_import
+
+import threading
+
+from google import auth
+import grpc
+
+from google.cloud.bigquery_storage_v1.services.big_query_read import client
+from google.cloud.bigquery_storage_v1.services.big_query_read import transports
+from google.cloud.bigquery_storage_v1.types import storage
+
+
+# Give each channel in a pool its own subchannels, so that each channel opens
+# its own connection instead of sharing one with identical channels.
+_POOL_CHANNEL_OPTIONS = (("grpc.use_local_subchannel_pool", 1),)
+
+# Channel options for long-lived streams which receive a lot of data, such as
+# reading all streams of a large read session. Pass these as the
+# ``channel_options`` of the transport or the client.
+BULK_READ_CHANNEL_OPTIONS = (
+    # ReadRows responses can be up to 100 MiB, more than the 4 MiB default.
+    ("grpc.max_receive_message_length", -1),
+    # Let the server send further ahead of the client on each stream, and
+    # grow the flow-control window to match the bandwidth-delay product.
+    ("grpc.http2.lookahead_bytes", 16 * 1024 * 1024),
+    ("grpc.http2.bdp_probe", 1),
+    ("grpc.http2.max_frame_size", 16 * 1024 * 1024 - 1),
+    # Notice dead connections during long streams, and keep connections
+    # which are waiting on a slow consumer from being dropped as idle.
+    ("grpc.keepalive_time_ms", 30 * 1000),
+    ("grpc.keepalive_timeout_ms", 10 * 1000),
+    ("grpc.http2.max_pings_without_data", 0),
+)
+
+
+class BigQueryReadGrpcTransport(transports.BigQueryReadGrpcTransport):
+    """gRPC transport for BigQueryRead, with a pool of channels.
+
+    Each channel multiplexes its calls over a single HTTP/2 connection. Set
+    ``channel_pool_size`` to spread ``read_rows`` calls over several
+    connections when reading many streams at once::
+
+        transport = grpc_transport.BigQueryReadGrpcTransport(
+            channel_pool_size=8,
+            channel_options=grpc_transport.BULK_READ_CHANNEL_OPTIONS,
+        )
+        client = BigQueryReadClient(transport=transport)
+
+    Args:
+        channel_pool_size (Optional[int]):
+            The number of channels to create. Each ``read_rows`` call is made
+            on the channel with the fewest streams still open. Other calls
+            use the first channel. Can't be more than 1 if ``channel`` is
+            provided.
+        channel_options (Optional[Sequence[Tuple[str, Any]]]):
+            gRPC channel arguments, such as ``BULK_READ_CHANNEL_OPTIONS``.
+            Ignored if ``channel`` is provided.
+
+    Other arguments are passed to
+    :class:`~google.cloud.bigquery_storage_v1.services.big_query_read.transports.BigQueryReadGrpcTransport`.
+
+    Raises:
+        ValueError:
+            If ``channel_pool_size`` is less than 1, or more than 1 with a
+            ``channel``, or if channels are pooled or given options along
+            with the deprecated ``api_mtls_endpoint`` or
+            ``client_cert_source`` arguments.
+    """
+
+    def __init__(self, *, channel_pool_size=1, channel_options=(), **kwargs):
+        if channel_pool_size < 1:
+            raise ValueError("channel_pool_size must be at least 1.")
+        if kwargs.get("channel") is not None and channel_pool_size > 1:
+            raise ValueError("channel_pool_size can't be used with a channel.")
+
+        # Set before the base constructor, which wraps ``read_rows``.
+        self._channel_pool = None
+        if kwargs.get("channel") is None and (channel_pool_size > 1 or channel_options):
+            if kwargs.get("api_mtls_endpoint") or kwargs.get("client_cert_source"):
+                raise ValueError(
+                    "channel_pool_size and channel_options can't be used with "
+                    "api_mtls_endpoint or client_cert_source."
+                )
+            channels = self._create_channels(
+                channel_pool_size, channel_options, **kwargs
+            )
+            if len(channels) > 1:
+                self._channel_pool = _ChannelPool(channels)
+
+            # The channels carry the credentials.
+            for name in ("credentials", "credentials_file", "ssl_channel_credentials"):
+                kwargs.pop(name, None)
+            kwargs["channel"] = channels[0]
+
+        super(BigQueryReadGrpcTransport, self).__init__(**kwargs)
+
+    def _create_channels(
+        self,
+        size,
+        options,
+        host=client.BigQueryReadClient.DEFAULT_ENDPOINT,
+        credentials=None,
+        credentials_file=None,
+        scopes=None,
+        ssl_channel_credentials=None,
+        quota_project_id=None,
+        **kwargs
+    ):
+        """Create ``size`` channels, each with its own connection."""
+        host = host if ":" in host else host + ":443"
+        if credentials is None and credentials_file is None:
+            credentials, _ = auth.default(
+                scopes=self.AUTH_SCOPES, quota_project_id=quota_project_id
+            )
+
+        options = tuple(options)
+        if size > 1:
+            options += _POOL_CHANNEL_OPTIONS
+        return [
+            type(self).create_channel(
+                host,
+                credentials=credentials,
+                credentials_file=credentials_file,
+                ssl_credentials=ssl_channel_credentials,
+                scopes=scopes or self.AUTH_SCOPES,
+                quota_project_id=quota_project_id,
+                options=options,
+            )
+            for _ in range(size)
+        ]
+
+    @property
+    def read_rows(self):
+        """Return a callable for the read rows method over gRPC.
+
+        With a ``channel_pool_size``, each call is made on the channel with
+        the fewest streams still open.
+        """
+        if self._channel_pool is None:
+            return super(BigQueryReadGrpcTransport, self).read_rows
+
+        if "read_rows" not in self._stubs:
+            self._stubs["read_rows"] = self._channel_pool.unary_stream(
+                "/google.cloud.bigquery.storage.v1.BigQueryRead/ReadRows",
+                request_serializer=storage.ReadRowsRequest.serialize,
+                response_deserializer=storage.ReadRowsResponse.deserialize,
+            )
+        return self._stubs["read_rows"]
+
+
+class _ChannelPool(object):
+    """Channels to spread streaming calls over.
+
+    Args:
+        channels (Sequence[grpc.Channel]): The channels in the pool.
+    """
+
+    def __init__(self, channels):
+        self.channels = list(channels)
+        self._open_streams = [0] * len(self.channels)
+        self._lock = threading.Lock()
+
+    def unary_stream(self, method, **kwargs):
+        """Create a callable for a streaming method on all channels."""
+        stubs = [channel.unary_stream(method, **kwargs) for channel in self.channels]
+        return _PooledUnaryStream(self, stubs)
+
+    def acquire(self):
+        """Pick the channel with the fewest open streams for a new stream."""
+        with self._lock:
+            index = min(
+                range(len(self._open_streams)), key=self._open_streams.__getitem__
+            )
+            self._open_streams[index] += 1
+            return index
+
+    def release(self, index):
+        """Record that a stream on a channel has ended."""
+        with self._lock:
+            self._open_streams[index] -= 1
+
+
+class _PooledUnaryStream(grpc.UnaryStreamMultiCallable):
+    """Make each call of a streaming method on the least busy channel.
+
+    This is a :class:`grpc.UnaryStreamMultiCallable`, so that
+    :mod:`google.api_core` wraps it as a streaming method, and errors raised
+    while iterating over a stream are mapped to API exceptions.
+    """
+
+    def __init__(self, pool, stubs):
+        self._pool = pool
+        self._stubs = stubs
+
+    def __call__(self, request, *args, **kwargs):
+        index = self._pool.acquire()
+        try:
+            call = self._stubs[index](request, *args, **kwargs)
+        except Exception:
+            self._pool.release(index)
+            raise
+
+        # The callback runs once the stream has ended, for any reason.
+        call.add_done_callback(lambda _: self._pool.release(index))
+        return call
@@ -15,28 +15,23 @@
 from __future__ import absolute_import
 
 import collections
+import decimal
 import json
+import operator
+import os
+import threading
+import time
 
-try:
-    import fastavro
-except ImportError:  # pragma: NO COVER
-    fastavro = None
 import google.api_core.exceptions
-
-try:
-    import pandas
-except ImportError:  # pragma: NO COVER
-    pandas = None
-try:
-    import pyarrow
-except ImportError:  # pragma: NO COVER
-    pyarrow = None
 import six
 
-try:
-    import pyarrow
-except ImportError:  # pragma: NO COVER
-    pyarrow = None
+from google.cloud.bigquery_storage_v1 import _avro
+from google.cloud.bigquery_storage_v1 import _lazy
+from google.cloud.bigquery_storage_v1 import types
+
+fastavro = _lazy.LazyModule("fastavro")
+pandas = _lazy.LazyModule("pandas")
+pyarrow = _lazy.LazyModule("pyarrow")
 
 
 _STREAM_RESUMPTION_EXCEPTIONS = (google.api_core.exceptions.ServiceUnavailable,)
@@ -59,6 +54,150 @@ _PYARROW_REQUIRED = (
     "pyarrow is required to parse ReadRowResponse messages with Arrow bytes."
 )
 
+# Marks the end of an Arrow IPC stream: a continuation token followed by a
+# message length of zero.
+_ARROW_IPC_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+# Maximum number of parsed schemas to keep. Each read session has one schema,
+# which is shared by all of its streams.
+_SCHEMA_CACHE_SIZE = 128
+
+SchemaCacheInfo = collections.namedtuple(
+    "SchemaCacheInfo", ("hits", "misses", "maxsize", "currsize")
+)
+
+_BYTES_PER_MEGABYTE = 1000.0 * 1000.0
+
+PageStats = collections.namedtuple(
+    "PageStats",
+    (
+        "stream_name",
+        "row_count",
+        "byte_count",
+        "wait_time",
+        "decode_time",
+        "progress",
+        "throttle_percent",
+        "total_rows",
+        "total_bytes",
+        "elapsed_time",
+        "rows_per_second",
+        "megabytes_per_second",
+    ),
+)
+PageStats.__doc__ = """Statistics about a page read from a stream.
+
+Reported to the ``page_callback`` of a
+:class:`~google.cloud.bigquery_storage_v1.reader.ReadRowsStream` after each
+page. Compare ``wait_time`` with ``decode_time`` to tell whether a read is
+limited by receiving data or by decoding it. A high ``throttle_percent``
+means that the server is limiting the read.
+
+Attributes:
+    stream_name (str): Name of the stream the page was read from.
+    row_count (int): Number of rows in the page.
+    byte_count (int): Size of the response message, in bytes.
+    wait_time (float): Seconds spent waiting to receive the message.
+    decode_time (float):
+        Seconds spent decoding the page. ``0.0`` when iterating over the
+        response messages themselves.
+    progress (float):
+        Fraction of the stream which has been read, at the end of the page.
+    throttle_percent (int):
+        How much the server is throttling the stream, from 0 to 100.
+    total_rows (int): Rows read from the stream so far.
+    total_bytes (int): Bytes received from the stream so far.
+    elapsed_time (float): Seconds since reading started.
+    rows_per_second (float): Average rate of rows read so far.
+    megabytes_per_second (float):
+        Average rate of megabytes (10^6 bytes) received so far.
+"""
+
+
+class _SchemaCache(object):
+    """A bounded, thread-safe cache of parsed schemas.
+
+    Parsing a schema is cheap compared to reading a stream, but sessions can
+    have hundreds of streams with thousands of small pages each. Parsers for
+    every stream share this cache, so that each schema is parsed once.
+
+    Args:
+        maxsize (int):
+            Maximum number of entries. The least recently used entry is
+            evicted when the cache is full.
+    """
+
+    def __init__(self, maxsize=_SCHEMA_CACHE_SIZE):
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, parse):
+        """Get a parsed schema, calling ``parse`` if it is not cached yet.
+
+        Args:
+            key (Hashable):
+                The kind of parsed value and the schema text or bytes.
+            parse (Callable[[], Any]):
+                Function to parse the schema on a cache miss.
+
+        Returns:
+            Any: The parsed schema.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._misses += 1
+
+        # Parse without holding the lock, so that a slow parse doesn't block
+        # streams reading other schemas. If two threads miss at the same
+        # time, both parse and the last one wins, which is harmless.
+        value = parse()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def cache_info(self):
+        """Report cache statistics.
+
+        Returns:
+            SchemaCacheInfo: The hits, misses, maximum and current size.
+        """
+        with self._lock:
+            return SchemaCacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries)
+            )
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+_SCHEMA_CACHE = _SchemaCache()
+
+
+def schema_cache_info():
+    """Report statistics for the cache of parsed schemas shared by all streams.
+
+    Returns:
+        ~google.cloud.bigquery_storage_v1.reader.SchemaCacheInfo:
+            A named tuple of ``hits``, ``misses``, ``maxsize`` and
+            ``currsize``, like :func:`functools.lru_cache`.
+    """
+    return _SCHEMA_CACHE.cache_info()
+
 
 class ReadRowsStream(object):
     """A stream of results from a read rows request.
@@ -74,9 +213,27 @@ class ReadRowsStream(object):
     If the pandas and fastavro libraries are installed, use the
     :func:`~google.cloud.bigquery_storage_v1.reader.ReadRowsStream.to_dataframe()`
     method to parse all messages into a :class:`pandas.DataFrame`.
+
+    If ``prefetch_messages`` is set, messages are received on a background
+    thread while the caller processes earlier messages, so that receiving
+    from the network overlaps with parsing the rows.
+
+    If ``page_callback`` is set, it is called with a
+    :class:`~google.cloud.bigquery_storage_v1.reader.PageStats` for each
+    page read from the stream.
     """
 
-    def __init__(self, wrapped, client, name, offset, read_rows_kwargs):
+    def __init__(
+        self,
+        wrapped,
+        client,
+        name,
+        offset,
+        read_rows_kwargs,
+        prefetch_messages=0,
+        prefetch_bytes=None,
+        page_callback=None,
+    ):
         """Construct a ReadRowsStream.
 
         Args:
@@ -101,6 +258,19 @@ class ReadRowsStream(object):
             read_rows_kwargs (dict):
                 Keyword arguments to use when reconnecting to a ReadRows
                 stream.
+            prefetch_messages (Optional[int]):
+                Maximum number of messages to receive ahead of the caller on
+                a background thread. If ``0`` (the default), messages are
+                only received when the caller asks for them.
+            prefetch_bytes (Optional[int]):
+                Maximum total size, in bytes, of messages received ahead of
+                the caller. A single message larger than this is still
+                received. Only used if ``prefetch_messages`` is set.
+            page_callback (Optional[Callable[ \
+                [~google.cloud.bigquery_storage_v1.reader.PageStats], None \
+            ]]):
+                Called with statistics about each page, once it has been
+                received and, in methods which decode pages, decoded.
 
         Returns:
             Iterable[ \
@@ -116,6 +286,10 @@ class ReadRowsStream(object):
         self._name = name
         self._offset = offset
         self._read_rows_kwargs = read_rows_kwargs
+        self._prefetch_messages = prefetch_messages
+        self._prefetch_bytes = prefetch_bytes
+        self._page_callback = page_callback
+        self._cancelled = False
 
     def __iter__(self):
         """An iterable of messages.
@@ -126,7 +300,25 @@ class ReadRowsStream(object):
             ]:
                 A sequence of row messages.
         """
-
+        if self._page_callback is None:
+            return self._iter()
+        return self._iter_observed()
+
+    def _iter(self):
+        """Iterate over messages without reporting page statistics."""
+        if self._prefetch_messages:
+            return self._iter_prefetched()
+        return self._iter_messages()
+
+    def _iter_observed(self):
+        """Iterate over messages, reporting statistics for each of them."""
+        stats = _PageStatsRecorder(self._name, self._page_callback)
+        for message, wait_time in _timed(self._iter()):
+            stats.record(message, wait_time, 0.0)
+            yield message
+
+    def _iter_messages(self):
+        """Receive messages, reconnecting on resumable errors."""
         # Infinite loop to reconnect on reconnectable errors while processing
         # the row stream.
         while True:
@@ -150,13 +342,61 @@ class ReadRowsStream(object):
 
             self._reconnect()
 
+    def _iter_prefetched(self):
+        """Receive messages on a background thread, ahead of the caller."""
+        buffer = _PrefetchBuffer(self._prefetch_messages, self._prefetch_bytes)
+        thread = threading.Thread(
+            target=self._prefetch,
+            args=(buffer,),
+            name="ReadRowsStream-prefetch-{}".format(self._name),
+        )
+        thread.daemon = True
+        thread.start()
+
+        try:
+            while True:
+                message = buffer.get()
+                if message is None:
+                    return  # Made it through the whole stream.
+                yield message
+        finally:
+            if buffer.close():
+                # The caller stopped early. Cancel the call so that the
+                # background thread isn't left waiting on the network.
+                self._cancel()
+
+    def _prefetch(self, buffer):
+        """Fill ``buffer`` with messages until the stream ends."""
+        try:
+            for message in self._iter_messages():
+                if not buffer.put(message, message._pb.ByteSize()):
+                    return  # The caller has stopped reading.
+        except Exception as exc:
+            buffer.finish(exc)
+        else:
+            buffer.finish()
+
+    def _cancel(self):
+        """Cancel the ReadRows call, if it supports cancellation.
+
+        A thread waiting on the next message gets a
+        :class:`google.api_core.exceptions.Cancelled` error. A call opened
+        to reconnect afterwards is cancelled too.
+        """
+        self._cancelled = True
+        cancel = getattr(self._wrapped, "cancel", None)
+        if cancel is not None:
+            cancel()
+
     def _reconnect(self):
         """Reconnect to the ReadRows stream using the most recent offset."""
         self._wrapped = self._client.read_rows(
             read_stream=self._name, offset=self._offset, **self._read_rows_kwargs
         )
+        if self._cancelled:
+            self._cancel()
 
-    def rows(self, read_session):
+    def rows(self, read_session, row_type=dict, decode_executor=None):
         """Iterate over all rows in the stream.
 
         This method requires the fastavro library in order to parse row
@@ -174,18 +414,39 @@ class ReadRowsStream(object):
                 The read session associated with this read rows stream. This
                 contains the schema, which is required to parse the data
                 messages.
+            row_type (Optional[type]):
+                The type of rows to produce. Either :class:`dict` (the
+                default), or :class:`~google.cloud.bigquery_storage_v1.reader.Row`
+                for compact rows which share a single field name to index
+                map.
+            decode_executor (Optional[concurrent.futures.Executor]):
+                An executor, such as a
+                :class:`concurrent.futures.ProcessPoolExecutor`, used to
+                decode Avro messages in methods which create Arrow or
+                pandas data. Rows are still decoded in this process.
+                Decoding Avro holds the GIL, so a process pool lets
+                decoding use more than one core. Ignored for streams using
+                the Arrow format.
 
         Returns:
-            Iterable[Mapping]:
-                A sequence of rows, represented as dictionaries.
+            Iterable[Union[Mapping, \
+                ~google.cloud.bigquery_storage_v1.reader.Row]]:
+                A sequence of rows, represented as dictionaries or ``Row``
+                objects.
         """
-        return ReadRowsIterable(self, read_session)
+        return ReadRowsIterable(
+            self,
+            read_session,
+            row_type=row_type,
+            decode_executor=decode_executor,
+            page_callback=self._page_callback,
+        )
 
-    def to_arrow(self, read_session):
+    def to_arrow(self, read_session, decode_executor=None):
         """Create a :class:`pyarrow.Table` of all rows in the stream.
 
-        This method requires the pyarrow library and a stream using the Arrow
-        format.
+        This method requires the pyarrow library. Streams using the Avro
+        format also require the fastavro library.
 
         Args:
             read_session ( \
@@ -194,14 +455,86 @@ class ReadRowsStream(object):
                 The read session associated with this read rows stream. This
                 contains the schema, which is required to parse the data
                 messages.
+            decode_executor (Optional[concurrent.futures.Executor]):
+                An executor, such as a
+                :class:`concurrent.futures.ProcessPoolExecutor`, used to
+                decode Avro messages into Arrow record batches. Decoding
+                Avro holds the GIL, so a process pool lets decoding use
+                more than one core. Ignored for streams using the Arrow
+                format.
 
         Returns:
             pyarrow.Table:
                 A table of all rows in the stream.
         """
-        return self.rows(read_session).to_arrow()
+        return self.rows(read_session, decode_executor=decode_executor).to_arrow()
+
+    def to_parquet(
+        self, read_session, where, row_group_size=None, compression="snappy"
+    ):
+        """Write all rows in the stream to a Parquet file.
 
-    def to_dataframe(self, read_session, dtypes=None):
+        Each page is written as soon as it is decoded, so the whole stream is
+        never held in memory. This method requires the pyarrow library.
+        Streams using the Avro format also require the fastavro library.
+
+        Args:
+            read_session ( \
+                ~google.cloud.bigquery_storage_v1.types.ReadSession \
+            ):
+                The read session associated with this read rows stream. This
+                contains the schema, which is required to parse the data
+                messages.
+            where (Union[str, pyarrow.NativeFile]):
+                The path or file to write to.
+            row_group_size (Optional[int]):
+                Number of rows in each Parquet row group. Pages are coalesced
+                until they contain this many rows. If not set, each page is
+                written as its own row group.
+            compression (Optional[str]):
+                Compression codec to use, such as ``"snappy"`` (the default),
+                ``"zstd"``, ``"gzip"``, or ``"none"``.
+
+        Returns:
+            int:
+                The number of rows written.
+        """
+        return self.rows(read_session).to_parquet(
+            where, row_group_size=row_group_size, compression=compression
+        )
+
+    def to_arrow_ipc(self, read_session, where, ipc_format="file"):
+        """Write all rows in the stream to an Arrow IPC file or stream.
+
+        For streams using the Arrow format, the serialized record batches
+        are written as they were received, without decoding them, so the
+        result can be memory-mapped with :func:`pyarrow.memory_map` and read
+        without copies. This method requires the pyarrow library. Streams
+        using the Avro format also require the fastavro library.
+
+        Args:
+            read_session ( \
+                ~google.cloud.bigquery_storage_v1.types.ReadSession \
+            ):
+                The read session associated with this read rows stream. This
+                contains the schema, which is required to parse the data
+                messages.
+            where (Union[str, pyarrow.NativeFile]):
+                The path or file to write to.
+            ipc_format (Optional[str]):
+                Either ``"file"`` (the default), for the random access Arrow
+                IPC file format, or ``"stream"``, for the Arrow IPC streaming
+                format.
+
+        Returns:
+            int:
+                The number of rows written.
+        """
+        return self.rows(read_session).to_arrow_ipc(where, ipc_format=ipc_format)
+
+    def to_dataframe(
+        self, read_session, dtypes=None, low_memory=False, decode_executor=None
+    ):
         """Create a :class:`pandas.DataFrame` of all rows in the stream.
 
         This method requires the pandas libary to create a data frame and the
@@ -225,15 +558,123 @@ class ReadRowsStream(object):
                 provided ``dtype`` is used when constructing the series for
                 the column specified. Otherwise, the default pandas behavior
                 is used.
+            low_memory (Optional[bool]):
+                If ``True``, copy each page into separate buffers per column
+                as it is read, so that the memory of each page can be freed
+                right away, and release the Arrow memory of each column once
+                it is converted to pandas. Column ``dtypes`` are applied in
+                Arrow while copying where possible. This costs one copy of
+                each page, but keeps the Arrow data and the data frame from
+                being held in full at the same time. Columns are only
+                released during the conversion with versions of pyarrow
+                that support ``to_pandas(self_destruct=True)``. Only used
+                when pyarrow is installed.
+            decode_executor (Optional[concurrent.futures.Executor]):
+                An executor, such as a
+                :class:`concurrent.futures.ProcessPoolExecutor`, used to
+                decode Avro messages into Arrow record batches. Decoding
+                Avro holds the GIL, so a process pool lets decoding use
+                more than one core. Only used when pyarrow is installed.
+                Ignored for streams using the Arrow format.
 
         Returns:
             pandas.DataFrame:
                 A data frame of all rows in the stream.
         """
-        if pandas is None:
+        if not pandas:
             raise ImportError(_PANDAS_REQUIRED)
 
-        return self.rows(read_session).to_dataframe(dtypes=dtypes)
+        return self.rows(read_session, decode_executor=decode_executor).to_dataframe(
+            dtypes=dtypes, low_memory=low_memory
+        )
+
+
+class _PrefetchBuffer(object):
+    """A bounded buffer of messages received ahead of the caller.
+
+    Args:
+        max_messages (int):
+            Maximum number of messages to hold.
+        max_bytes (Optional[int]):
+            Maximum total size of messages to hold. A message is always
+            accepted when the buffer is empty, so that a single large message
+            can't block the stream.
+    """
+
+    def __init__(self, max_messages, max_bytes=None):
+        self._max_messages = max_messages
+        self._max_bytes = max_bytes
+        self._condition = threading.Condition()
+        self._messages = collections.deque()
+        self._bytes = 0
+        self._finished = False
+        self._error = None
+        self._closed = False
+
+    def _is_full(self, size):
+        if not self._messages:
+            return False
+        if len(self._messages) >= self._max_messages:
+            return True
+        return self._max_bytes is not None and self._bytes + size > self._max_bytes
+
+    def put(self, message, size):
+        """Add a message, waiting until there is room for it.
+
+        Returns:
+            bool: ``False`` if the buffer was closed by the caller.
+        """
+        with self._condition:
+            while not self._closed and self._is_full(size):
+                self._condition.wait()
+            if self._closed:
+                return False
+            self._messages.append((message, size))
+            self._bytes += size
+            self._condition.notify_all()
+            return True
+
+    def finish(self, error=None):
+        """Mark the end of the stream, optionally with an error to raise."""
+        with self._condition:
+            self._finished = True
+            self._error = error
+            self._condition.notify_all()
+
+    def get(self):
+        """Remove the next message, waiting until one is available.
+
+        Returns:
+            Optional[~google.cloud.bigquery_storage_v1.types.ReadRowsResponse]:
+                The next message, or ``None`` at the end of the stream.
+
+        Raises:
+            Exception: The error which ended the stream, if any.
+        """
+        with self._condition:
+            while not self._messages and not self._finished:
+                self._condition.wait()
+            if self._messages:
+                message, size = self._messages.popleft()
+                self._bytes -= size
+                self._condition.notify_all()
+                return message
+            if self._error is not None:
+                raise self._error
+            return None
+
+    def close(self):
+        """Stop accepting messages and discard any that were buffered.
+
+        Returns:
+            bool: ``True`` if the stream had not finished yet.
+        """
+        with self._condition:
+            self._closed = True
+            self._messages.clear()
+            self._bytes = 0
+            self._condition.notify_all()
+            return not self._finished
 
 
 class ReadRowsIterable(object):
@@ -245,16 +686,52 @@ class ReadRowsIterable(object):
         read_session (google.cloud.bigquery_storage_v1.types.ReadSession):
             A read session. This is required because it contains the schema
             used in the stream messages.
+        row_type (Optional[type]):
+            The type of rows to produce. Either :class:`dict` (the default)
+            or :class:`~google.cloud.bigquery_storage_v1.reader.Row`.
+        decode_executor (Optional[concurrent.futures.Executor]):
+            An executor used to decode Avro messages into Arrow record
+            batches in :meth:`to_arrow`, :meth:`to_dataframe`,
+            :meth:`to_parquet` and :meth:`to_arrow_ipc`. Use a
+            :class:`concurrent.futures.ProcessPoolExecutor` to decode on
+            more than one core.
+        page_callback (Optional[Callable[ \
+            [~google.cloud.bigquery_storage_v1.reader.PageStats], None \
+        ]]):
+            Called with statistics about each page once it has been
+            decoded. When iterating over rows, the rows of a page are parsed
+            as soon as the page is read, so that their parse time is
+            reported.
     """
 
     # This class is modelled after the google.cloud.bigquery.table.RowIterator
     # and aims to be API compatible where possible.
 
-    def __init__(self, reader, read_session):
+    def __init__(
+        self,
+        reader,
+        read_session,
+        row_type=dict,
+        decode_executor=None,
+        page_callback=None,
+    ):
+        if row_type not in (dict, Row):
+            raise ValueError(
+                "Unsupported row_type: {0}. Expected dict or Row.".format(row_type)
+            )
+
         self._reader = reader
         self._read_session = read_session
+        self._row_type = row_type
         self._stream_parser = _StreamParser.from_read_session(self._read_session)
 
+        # Arrow messages are not worth sending to another process, as reading
+        # them doesn't copy or convert the data.
+        if not isinstance(self._stream_parser, _AvroStreamParser):
+            decode_executor = None
+        self._decode_executor = decode_executor
+        self._page_callback = page_callback
+
     @property
     def pages(self):
         """A generator of all pages in the stream.
@@ -265,8 +742,15 @@ class ReadRowsIterable(object):
         """
         # Each page is an iterator of rows. But also has num_items, remaining,
         # and to_dataframe.
-        for message in self._reader:
-            yield ReadRowsPage(self._stream_parser, message)
+        if self._page_callback is None:
+            for message in self._reader:
+                yield ReadRowsPage(
+                    self._stream_parser, message, row_type=self._row_type
+                )
+            return
+
+        for page in self._decode_pages(_parse_page):
+            yield page
 
     def __iter__(self):
         """Iterator for each row in all pages."""
@@ -277,25 +761,182 @@ class ReadRowsIterable(object):
     def to_arrow(self):
         """Create a :class:`pyarrow.Table` of all rows in the stream.
 
-        This method requires the pyarrow library and a stream using the Arrow
-        format.
+        This method requires the pyarrow library. Streams using the Avro
+        format also require the fastavro library.
 
         Returns:
             pyarrow.Table:
                 A table of all rows in the stream.
         """
-        record_batches = []
-        for page in self.pages:
-            record_batches.append(page.to_arrow())
+        record_batches = list(self._record_batches())
 
         if record_batches:
             return pyarrow.Table.from_batches(record_batches)
 
         # No data, return an empty Table.
+        return pyarrow.Table.from_batches([], schema=self._arrow_schema())
+
+    def to_parquet(self, where, row_group_size=None, compression="snappy"):
+        """Write all rows in the stream to a Parquet file.
+
+        Each page is written as soon as it is decoded, so the whole stream is
+        never held in memory. This method requires the pyarrow library.
+        Streams using the Avro format also require the fastavro library.
+
+        Args:
+            where (Union[str, pyarrow.NativeFile]):
+                The path or file to write to.
+            row_group_size (Optional[int]):
+                Number of rows in each Parquet row group. Pages are coalesced
+                until they contain this many rows. If not set, each page is
+                written as its own row group.
+            compression (Optional[str]):
+                Compression codec to use, such as ``"snappy"`` (the default),
+                ``"zstd"``, ``"gzip"``, or ``"none"``.
+
+        Returns:
+            int:
+                The number of rows written.
+        """
+        if not pyarrow:
+            raise ImportError(_PYARROW_REQUIRED)
+
+        return _write_parquet(
+            self._record_batches(),
+            self._arrow_schema(),
+            where,
+            row_group_size=row_group_size,
+            compression=compression,
+        )
+
+    def to_arrow_ipc(self, where, ipc_format="file"):
+        """Write all rows in the stream to an Arrow IPC file or stream.
+
+        For streams using the Arrow format, the serialized record batches
+        are written as they were received, without decoding them. This
+        method requires the pyarrow library. Streams using the Avro format
+        also require the fastavro library.
+
+        Args:
+            where (Union[str, pyarrow.NativeFile]):
+                The path or file to write to.
+            ipc_format (Optional[str]):
+                Either ``"file"`` (the default), for the random access Arrow
+                IPC file format, or ``"stream"``, for the Arrow IPC streaming
+                format.
+
+        Returns:
+            int:
+                The number of rows written.
+        """
+        if not pyarrow:
+            raise ImportError(_PYARROW_REQUIRED)
+
+        return _write_arrow_ipc(
+            self._ipc_messages(),
+            self._arrow_schema(),
+            self._stream_parser.to_ipc_schema(),
+            where,
+            ipc_format=ipc_format,
+        )
+
+    def _decode_pages(self, decode):
+        """Decode each page, reporting its statistics to ``page_callback``.
+
+        Args:
+            decode (Callable[[ReadRowsPage], Any]):
+                Function which decodes a page.
+
+        Returns:
+            Iterable[Any]: The result of ``decode`` for each page.
+        """
+        stats = self._page_stats()
+        for message, wait_time in self._timed_messages():
+            page = ReadRowsPage(self._stream_parser, message, row_type=self._row_type)
+            if stats is None:
+                yield decode(page)
+                continue
+
+            start = time.monotonic()
+            value = decode(page)
+            stats.record(message, wait_time, time.monotonic() - start)
+            yield value
+
+    def _page_stats(self):
+        """Get a recorder for page statistics, if there is a callback."""
+        if self._page_callback is None:
+            return None
+        return _PageStatsRecorder(self._reader._name, self._page_callback)
+
+    def _timed_messages(self):
+        """Get each message, with the seconds spent waiting to receive it.
+
+        The wait time is only measured if there is a ``page_callback``.
+        """
+        if self._page_callback is None:
+            return ((message, None) for message in self._reader)
+        # Iterate over the stream without its own callback, so that pages
+        # are only reported once.
+        return _timed(self._reader._iter())
+
+    def _record_batches(self):
+        """Decode each page into a :class:`pyarrow.RecordBatch`."""
+        if self._decode_executor is None:
+            return self._decode_pages(ReadRowsPage.to_arrow)
+        return self._executor_record_batches()
+
+    def _executor_record_batches(self):
+        """Decode each page into a record batch with ``decode_executor``."""
+        schema = self._arrow_schema()
+        for _, message in self._ipc_messages():
+            yield pyarrow.ipc.read_record_batch(message, schema)
+
+    def _ipc_messages(self):
+        """Get each page as an encapsulated Arrow IPC message.
+
+        With a ``decode_executor``, Avro pages are decoded by the executor.
+        A few pages are submitted ahead, but results are still returned in
+        stream order.
+
+        Returns:
+            Iterable[Tuple[int, pyarrow.Buffer]]:
+                The number of rows and the serialized record batch of each
+                page.
+        """
+        if self._decode_executor is None:
+            return self._decode_pages(ReadRowsPage._to_ipc_message)
+        return self._executor_ipc_messages()
+
+    def _executor_ipc_messages(self):
+        """Decode Avro pages into IPC messages with ``decode_executor``."""
+        stats = self._page_stats()
+        schema = self._read_session.avro_schema.schema
+        max_pending = 2 * (os.cpu_count() or 1)
+        pending = collections.deque()
+        try:
+            for message, wait_time in self._timed_messages():
+                future = self._decode_executor.submit(
+                    _avro_to_ipc_message,
+                    schema,
+                    message.row_count,
+                    message.avro_rows.serialized_binary_rows,
+                )
+                pending.append((message, wait_time, future))
+                if len(pending) >= max_pending:
+                    yield _collect_ipc_message(pending.popleft(), stats)
+
+            while pending:
+                yield _collect_ipc_message(pending.popleft(), stats)
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+    def _arrow_schema(self):
+        """Get the Arrow schema of record batches from the stream."""
         self._stream_parser._parse_arrow_schema()
-        return pyarrow.Table.from_batches([], schema=self._stream_parser._schema)
+        return self._stream_parser._schema
 
-    def to_dataframe(self, dtypes=None):
+    def to_dataframe(self, dtypes=None, low_memory=False):
         """Create a :class:`pandas.DataFrame` of all rows in the stream.
 
         This method requires the pandas libary to create a data frame and the
@@ -313,31 +954,45 @@ class ReadRowsIterable(object):
                 provided ``dtype`` is used when constructing the series for
                 the column specified. Otherwise, the default pandas behavior
                 is used.
+            low_memory (Optional[bool]):
+                If ``True``, copy each page into separate buffers per column
+                as it is read, so that the memory of each page can be freed
+                right away, and release the Arrow memory of each column once
+                it is converted to pandas. Column ``dtypes`` are applied in
+                Arrow while copying where possible. This costs one copy of
+                each page, but keeps the Arrow data and the data frame from
+                being held in full at the same time. Columns are only
+                released during the conversion with versions of pyarrow
+                that support ``to_pandas(self_destruct=True)``. Only used
+                when pyarrow is installed.
 
         Returns:
             pandas.DataFrame:
                 A data frame of all rows in the stream.
         """
-        if pandas is None:
+        if not pandas:
             raise ImportError(_PANDAS_REQUIRED)
 
         if dtypes is None:
             dtypes = {}
 
-        # If it's an Arrow stream, calling to_arrow, then converting to a
-        # pandas dataframe is about 2x faster. This is because pandas.concat is
-        # rarely no-copy, whereas pyarrow.Table.from_batches + to_pandas is
-        # usually no-copy.
+        # Calling to_arrow, then converting to a pandas dataframe is about 2x
+        # faster. This is because pandas.concat is rarely no-copy, whereas
+        # pyarrow.Table.from_batches + to_pandas is usually no-copy. Avro
+        # streams are decoded into Arrow record batches, too, if pyarrow is
+        # installed.
         schema_type = self._read_session._pb.WhichOneof("schema")
 
-        if schema_type == "arrow_schema":
-            record_batch = self.to_arrow()
-            df = record_batch.to_pandas()
-            for column in dtypes:
-                df[column] = pandas.Series(df[column], dtype=dtypes[column])
-            return df
+        if schema_type == "arrow_schema" or pyarrow:
+            if low_memory:
+                table = _low_memory_table(
+                    self._record_batches(), self._arrow_schema(), dtypes
+                )
+            else:
+                table = self.to_arrow()
+            return _arrow_to_dataframe(table, dtypes, low_memory)
 
-        frames = [page.to_dataframe(dtypes=dtypes) for page in self.pages]
+        frames = list(self._decode_pages(lambda page: page.to_dataframe(dtypes=dtypes)))
 
         if frames:
             return pandas.concat(frames)
@@ -391,6 +1046,312 @@ class ReadRowsIterable(object):
         return result
 
 
+class _PageStatsRecorder(object):
+    """Keep running totals of pages read from a stream, and report them.
+
+    Args:
+        stream_name (str): Name of the stream being read.
+        callback (Callable[[PageStats], None]): Called for each page.
+    """
+
+    def __init__(self, stream_name, callback):
+        self._stream_name = stream_name
+        self._callback = callback
+        self._start = time.monotonic()
+        self._total_rows = 0
+        self._total_bytes = 0
+
+    def record(self, message, wait_time, decode_time):
+        """Report a page which has been read and decoded."""
+        byte_count = message._pb.ByteSize()
+        self._total_rows += message.row_count
+        self._total_bytes += byte_count
+
+        elapsed_time = time.monotonic() - self._start
+        rows_per_second = 0.0
+        megabytes_per_second = 0.0
+        if elapsed_time > 0:
+            rows_per_second = self._total_rows / elapsed_time
+            megabytes_per_second = (
+                self._total_bytes / _BYTES_PER_MEGABYTE / elapsed_time
+            )
+
+        self._callback(
+            PageStats(
+                stream_name=self._stream_name,
+                row_count=message.row_count,
+                byte_count=byte_count,
+                wait_time=wait_time,
+                decode_time=decode_time,
+                progress=message.stats.progress.at_response_end,
+                throttle_percent=message.throttle_state.throttle_percent,
+                total_rows=self._total_rows,
+                total_bytes=self._total_bytes,
+                elapsed_time=elapsed_time,
+                rows_per_second=rows_per_second,
+                megabytes_per_second=megabytes_per_second,
+            )
+        )
+
+
+def _timed(iterator):
+    """Yield each item of ``iterator`` with the seconds spent waiting for it."""
+    try:
+        while True:
+            start = time.monotonic()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            yield item, time.monotonic() - start
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def _parse_page(page):
+    """Parse the rows of a page up front, rather than on first access."""
+    page._parse_rows()
+    return page
+
+
+def _collect_ipc_message(pending, stats):
+    """Wait for an IPC message submitted to a decode executor.
+
+    Args:
+        pending (Tuple[ \
+            ~google.cloud.bigquery_storage_v1.types.ReadRowsResponse, \
+            Optional[float], \
+            concurrent.futures.Future, \
+        ]):
+            The message, the seconds spent waiting for it, and the future of
+            its serialized record batch.
+        stats (Optional[_PageStatsRecorder]):
+            Where to report the page, if anywhere. The time spent waiting for
+            the future is reported as the decode time.
+
+    Returns:
+        Tuple[int, pyarrow.Buffer]:
+            The number of rows and the serialized record batch.
+    """
+    message, wait_time, future = pending
+    start = time.monotonic()
+    buffer = pyarrow.py_buffer(future.result())
+    if stats is not None:
+        stats.record(message, wait_time, time.monotonic() - start)
+    return message.row_count, buffer
+
+
+def _arrow_to_dataframe(table, dtypes, low_memory=False):
+    """Convert a :class:`pyarrow.Table` to a :class:`pandas.DataFrame`.
+
+    Args:
+        table (pyarrow.Table):
+            The table to convert. In low memory mode, the table is built by
+            :func:`_low_memory_table` and is unusable afterwards.
+        dtypes (Mapping[str, Union[str, pandas.Series.dtype]]):
+            Column names to pandas ``dtype``s.
+        low_memory (Optional[bool]):
+            Whether to release the Arrow memory of each column once it is
+            converted.
+
+    Returns:
+        pandas.DataFrame:
+            The converted data frame.
+    """
+    if not low_memory:
+        df = table.to_pandas()
+        for column in dtypes:
+            df[column] = pandas.Series(df[column], dtype=dtypes[column])
+        return df
+
+    try:
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+    except TypeError:
+        # This version of pyarrow can't release columns while converting.
+        df = table.to_pandas()
+    del table
+
+    for column, dtype in dtypes.items():
+        if df[column].dtype != pandas.api.types.pandas_dtype(dtype):
+            df[column] = pandas.Series(df[column], dtype=dtype)
+    return df
+
+
+def _low_memory_table(record_batches, schema, dtypes):
+    """Build a table whose columns can be released one at a time.
+
+    A record batch read from an Arrow IPC message is a view of the whole
+    message, so the message is only freed once every column of the batch
+    is. Each batch is copied as it arrives, so that every column owns its
+    buffers and the message can be freed right away.
+
+    Args:
+        record_batches (Iterable[pyarrow.RecordBatch]):
+            Record batches to copy.
+        schema (pyarrow.Schema):
+            The schema of the table, used if there are no record batches.
+        dtypes (Mapping[str, Union[str, pandas.Series.dtype]]):
+            Column names to pandas ``dtype``s. Columns are cast to the
+            matching Arrow type while they are copied, where possible.
+
+    Returns:
+        pyarrow.Table:
+            A table of the copied record batches.
+    """
+    copies = [
+        _copy_record_batch(record_batch, dtypes) for record_batch in record_batches
+    ]
+
+    if copies:
+        return pyarrow.Table.from_batches(copies)
+    return pyarrow.Table.from_batches([], schema=schema)
+
+
+def _copy_record_batch(record_batch, dtypes):
+    """Copy a record batch into new buffers for each of its columns."""
+    names = record_batch.schema.names
+    columns = []
+    for name, column in zip(names, record_batch.columns):
+        dtype = dtypes.get(name)
+        copy = column if dtype is None else _cast_arrow_column(column, dtype)
+        if copy.type == column.type and hasattr(pyarrow, "concat_arrays"):
+            copy = pyarrow.concat_arrays([column])
+        columns.append(copy)
+    return pyarrow.RecordBatch.from_arrays(columns, names=names)
+
+
+def _cast_arrow_column(column, dtype):
+    """Cast a column to the Arrow type matching a pandas ``dtype``, if any.
+
+    Casting before the conversion to pandas avoids holding both the default
+    and the requested representation of a column in memory at once.
+    """
+    try:
+        arrow_type = pyarrow.from_numpy_dtype(pandas.api.types.pandas_dtype(dtype))
+        return column.cast(arrow_type)
+    except (TypeError, ValueError, NotImplementedError):
+        # Extension dtypes, such as "category", and unsafe casts are left to
+        # pandas.
+        return column
+
+
+def _write_parquet(
+    record_batches, schema, where, row_group_size=None, compression="snappy"
+):
+    """Write record batches to a Parquet file as they arrive.
+
+    Args:
+        record_batches (Iterable[pyarrow.RecordBatch]):
+            Record batches to write.
+        schema (pyarrow.Schema):
+            The schema of all record batches.
+        where (Union[str, pyarrow.NativeFile]):
+            The path or file to write to.
+        row_group_size (Optional[int]):
+            Number of rows in each row group. If not set, each record batch
+            is written as its own row group.
+        compression (Optional[str]):
+            Compression codec to use.
+
+    Returns:
+        int:
+            The number of rows written.
+    """
+    # Imported here, as pyarrow.parquet is slow to import and not needed by
+    # any other method.
+    import pyarrow.parquet
+
+    num_rows = 0
+    pending = []
+    pending_rows = 0
+    writer = pyarrow.parquet.ParquetWriter(where, schema, compression=compression)
+    try:
+        for record_batch in record_batches:
+            num_rows += record_batch.num_rows
+            if row_group_size is None:
+                writer.write_table(pyarrow.Table.from_batches([record_batch]))
+                continue
+
+            pending.append(record_batch)
+            pending_rows += record_batch.num_rows
+            if pending_rows < row_group_size:
+                continue
+
+            # Write as many full row groups as possible and keep the rest
+            # for the next row group. Slicing a table doesn't copy the data.
+            table = pyarrow.Table.from_batches(pending, schema=schema)
+            full_rows = pending_rows - pending_rows % row_group_size
+            writer.write_table(table.slice(0, full_rows), row_group_size=row_group_size)
+            pending = table.slice(full_rows).to_batches()
+            pending_rows -= full_rows
+
+        if pending_rows:
+            writer.write_table(pyarrow.Table.from_batches(pending, schema=schema))
+    finally:
+        writer.close()
+    return num_rows
+
+
+def _write_arrow_ipc(ipc_messages, schema, ipc_schema, where, ipc_format="file"):
+    """Write serialized record batches to an Arrow IPC file or stream.
+
+    Args:
+        ipc_messages (Iterable[Tuple[int, pyarrow.Buffer]]):
+            The number of rows and the encapsulated IPC message of each
+            record batch.
+        schema (pyarrow.Schema):
+            The schema of all record batches.
+        ipc_schema (pyarrow.Buffer):
+            The schema, as an encapsulated IPC message.
+        where (Union[str, pyarrow.NativeFile]):
+            The path or file to write to. A file is not closed.
+        ipc_format (Optional[str]):
+            Either ``"file"`` or ``"stream"``.
+
+    Returns:
+        int:
+            The number of rows written.
+    """
+    if ipc_format not in ("file", "stream"):
+        raise ValueError(
+            "Unsupported ipc_format: {0}. Expected 'file' or 'stream'.".format(
+                ipc_format
+            )
+        )
+
+    num_rows = 0
+    if isinstance(where, six.string_types):
+        sink = pyarrow.OSFile(where, "wb")
+    else:
+        sink = where
+    try:
+        if ipc_format == "stream":
+            # A stream is just the schema message, followed by the record
+            # batch messages, so the messages can be copied as-is.
+            sink.write(ipc_schema)
+            for message_rows, message in ipc_messages:
+                num_rows += message_rows
+                sink.write(message)
+            sink.write(_ARROW_IPC_EOS)
+        else:
+            # The file footer records the offset of every record batch, so
+            # let pyarrow write the messages. Reading a record batch from a
+            # message only points at its buffers, it doesn't copy the data.
+            writer = pyarrow.ipc.new_file(sink, schema)
+            try:
+                for message_rows, message in ipc_messages:
+                    num_rows += message_rows
+                    writer.write_batch(pyarrow.ipc.read_record_batch(message, schema))
+            finally:
+                writer.close()
+    finally:
+        if sink is not where:
+            sink.close()
+    return num_rows
+
+
 class ReadRowsPage(object):
     """An iterator of rows from a read session message.
 
@@ -399,14 +1360,18 @@ class ReadRowsPage(object):
             A helper for parsing messages into rows.
         message (google.cloud.bigquery_storage_v1.types.ReadRowsResponse):
             A message of data from a read rows stream.
+        row_type (Optional[type]):
+            The type of rows to produce. Either :class:`dict` (the default)
+            or :class:`~google.cloud.bigquery_storage_v1.reader.Row`.
     """
 
     # This class is modeled after google.api_core.page_iterator.Page and aims
     # to provide API compatibility where possible.
 
-    def __init__(self, stream_parser, message):
+    def __init__(self, stream_parser, message, row_type=dict):
         self._stream_parser = stream_parser
         self._message = message
+        self._row_type = row_type
         self._iter_rows = None
         self._num_items = self._message.row_count
         self._remaining = self._message.row_count
@@ -416,7 +1381,10 @@ class ReadRowsPage(object):
         if self._iter_rows is not None:
             return
 
-        rows = self._stream_parser.to_rows(self._message)
+        if self._row_type is Row:
+            rows = self._stream_parser.to_row_objects(self._message)
+        else:
+            rows = self._stream_parser.to_rows(self._message)
         self._iter_rows = iter(rows)
 
     @property
@@ -452,6 +1420,16 @@ class ReadRowsPage(object):
         """
         return self._stream_parser.to_arrow(self._message)
 
+    def _to_ipc_message(self):
+        """Get the rows in the page as an encapsulated Arrow IPC message.
+
+        Returns:
+            Tuple[int, pyarrow.Buffer]:
+                The number of rows in the page, and the serialized record
+                batch.
+        """
+        return self._num_items, self._stream_parser.to_ipc_message(self._message)
+
     def to_dataframe(self, dtypes=None):
         """Create a :class:`pandas.DataFrame` of rows in the page.
 
@@ -475,12 +1453,124 @@ class ReadRowsPage(object):
             pandas.DataFrame:
                 A data frame of all rows in the stream.
         """
-        if pandas is None:
+        if not pandas:
             raise ImportError(_PANDAS_REQUIRED)
 
         return self._stream_parser.to_dataframe(self._message, dtypes=dtypes)
 
 
+class Row(object):
+    """A row of values from a read rows stream.
+
+    Values can be accessed by position, by column name, or as attributes::
+
+        >>> row
+        Row(('a', 'b'), {'x': 0, 'y': 1})
+        >>> row[0]
+        'a'
+        >>> row["y"]
+        'b'
+        >>> row.x
+        'a'
+
+    Unlike a dictionary, a row only holds a tuple of values. The map from
+    column names to positions is shared by all rows with the same schema.
+
+    Args:
+        values (Sequence[object]): The row values.
+        field_to_index (Mapping[str, int]):
+            A mapping from schema field names to indexes.
+    """
+
+    # This class is modelled after google.cloud.bigquery.table.Row and aims
+    # to be API compatible where possible.
+
+    # Choose unusual field names to try to avoid conflict with schema fields.
+    __slots__ = ("_xxx_values", "_xxx_field_to_index")
+
+    def __init__(self, values, field_to_index):
+        self._xxx_values = values
+        self._xxx_field_to_index = field_to_index
+
+    def values(self):
+        """Return the values included in this row.
+
+        Returns:
+            Sequence[object]: A sequence of length ``len(row)``.
+        """
+        return self._xxx_values
+
+    def keys(self):
+        """Return the keys for using a row as a dict.
+
+        Returns:
+            Iterable[str]: The keys corresponding to the columns of a row.
+        """
+        return self._xxx_field_to_index.keys()
+
+    def items(self):
+        """Return items as ``(key, value)`` pairs.
+
+        Returns:
+            Iterable[Tuple[str, object]]:
+                The ``(key, value)`` pairs representing this row.
+        """
+        for key, index in self._xxx_field_to_index.items():
+            yield (key, self._xxx_values[index])
+
+    def get(self, key, default=None):
+        """Return a value for key, with a default value if it does not exist.
+
+        Args:
+            key (str): The key of the column to access.
+            default (object):
+                The default value to use if the key does not exist. (Defaults
+                to :data:`None`.)
+
+        Returns:
+            object:
+                The value associated with the provided key, or a default value.
+        """
+        index = self._xxx_field_to_index.get(key)
+        if index is None:
+            return default
+        return self._xxx_values[index]
+
+    def __getattr__(self, name):
+        index = self._xxx_field_to_index.get(name)
+        if index is None:
+            raise AttributeError("no row field {!r}".format(name))
+        return self._xxx_values[index]
+
+    def __len__(self):
+        return len(self._xxx_values)
+
+    def __getitem__(self, key):
+        if isinstance(key, six.string_types):
+            index = self._xxx_field_to_index.get(key)
+            if index is None:
+                raise KeyError("no row field {!r}".format(key))
+            key = index
+        return self._xxx_values[key]
+
+    def __eq__(self, other):
+        if not isinstance(other, Row):
+            return NotImplemented
+        return (
+            self._xxx_values == other._xxx_values
+            and self._xxx_field_to_index == other._xxx_field_to_index
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        # Sort fields by index, for determinism.
+        items = sorted(self._xxx_field_to_index.items(), key=operator.itemgetter(1))
+        f2i = "{" + ", ".join("%r: %d" % item for item in items) + "}"
+        return "Row({}, {})".format(self._xxx_values, f2i)
+
+
 class _StreamParser(object):
     def to_arrow(self, message):
         raise NotImplementedError("Not implemented.")
@@ -491,6 +1581,24 @@ class _StreamParser(object):
     def to_rows(self, message):
         raise NotImplementedError("Not implemented.")
 
+    def to_tuples(self, message):
+        raise NotImplementedError("Not implemented.")
+
+    def to_ipc_message(self, message):
+        raise NotImplementedError("Not implemented.")
+
+    def to_ipc_schema(self):
+        raise NotImplementedError("Not implemented.")
+
+    def to_row_objects(self, message):
+        """Parse all rows in a stream message into :class:`Row` objects.
+
+        All rows share the field name to index map of the schema.
+        """
+        values = self.to_tuples(message)
+        field_to_index = self._field_to_index
+        return (Row(row, field_to_index) for row in values)
+
     @staticmethod
     def from_read_session(read_session):
         schema_type = read_session._pb.WhichOneof("schema")
@@ -515,17 +1623,31 @@ class _AvroStreamParser(_StreamParser):
                 A read session. This is required because it contains the schema
                 used in the stream messages.
         """
-        if fastavro is None:
+        if not fastavro:
             raise ImportError(_FASTAVRO_REQUIRED)
 
         self._read_session = read_session
         self._avro_schema_json = None
-        self._fastavro_schema = None
+        self._fastavro_block_schema = None
         self._column_names = None
+        self._field_to_index = None
+        self._schema = None
+        self._decimal_types = None
+        self._decoders = {}
 
     def to_arrow(self, message):
         """Create an :class:`pyarrow.RecordBatch` of rows in the page.
 
+        This method requires the pyarrow library. Values are decoded into
+        one list per column, by a decoder compiled for the session's schema,
+        and converted to Arrow arrays with types derived from the Avro
+        schema. DATE, TIME, TIMESTAMP, NUMERIC and BIGNUMERIC values are
+        kept as integers, without creating Python objects for them.
+
+        .. warning::
+            DATETIME columns are not supported. They are currently parsed as
+            strings in the fastavro library.
+
         Args:
             message (google.cloud.bigquery_storage_v1.types.ReadRowsResponse):
                 Protocol buffer from the read rows stream, to convert into an
@@ -535,7 +1657,27 @@ class _AvroStreamParser(_StreamParser):
             pyarrow.RecordBatch:
                 Rows from the message, as an Arrow record batch.
         """
-        raise NotImplementedError("to_arrow not implemented for Avro streams.")
+        if not pyarrow:
+            raise ImportError(_PYARROW_REQUIRED)
+
+        self._parse_arrow_schema()
+
+        decode = self._decoder(raw_logical_types=True)
+        if decode is None:
+            columns, raw = self._to_columns(message), False
+        else:
+            columns = decode(
+                message.avro_rows.serialized_binary_rows, message.row_count
+            )
+            raw = True
+
+        arrays = [
+            _avro_column_to_arrow(column, field.type, decimal_type, raw)
+            for column, field, decimal_type in zip(
+                columns, self._schema, self._decimal_types
+            )
+        ]
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=self._schema)
 
     def to_dataframe(self, message, dtypes=None):
         """Create a :class:`pandas.DataFrame` of rows in the page.
@@ -560,15 +1702,18 @@ class _AvroStreamParser(_StreamParser):
             pandas.DataFrame:
                 A data frame of all rows in the stream.
         """
-        self._parse_avro_schema()
-
         if dtypes is None:
             dtypes = {}
 
-        columns = collections.defaultdict(list)
-        for row in self.to_rows(message):
-            for column in row:
-                columns[column].append(row[column])
+        if pyarrow:
+            df = self.to_arrow(message).to_pandas()
+            for column in dtypes:
+                df[column] = pandas.Series(df[column], dtype=dtypes[column])
+            return df
+
+        self._parse_avro_schema()
+
+        columns = dict(zip(self._column_names, self._to_columns(message)))
         for column in dtypes:
             columns[column] = pandas.Series(columns[column], dtype=dtypes[column])
         return pandas.DataFrame(columns, columns=self._column_names)
@@ -578,15 +1723,107 @@ class _AvroStreamParser(_StreamParser):
         if self._avro_schema_json:
             return
 
-        self._avro_schema_json = json.loads(self._read_session.avro_schema.schema)
-        self._column_names = tuple(
-            (field["name"] for field in self._avro_schema_json["fields"])
+        schema = self._read_session.avro_schema.schema
+        (
+            self._avro_schema_json,
+            self._column_names,
+            self._field_to_index,
+        ) = _SCHEMA_CACHE.get(("avro", schema), lambda: _load_avro_schema(schema))
+
+    def _parse_arrow_schema(self):
+        """Convert parsed Avro schema to an Arrow schema."""
+        if self._schema:
+            return
+
+        self._parse_avro_schema()
+        self._schema, self._decimal_types = _SCHEMA_CACHE.get(
+            ("avro_to_arrow", self._read_session.avro_schema.schema),
+            lambda: (
+                pyarrow.schema(
+                    _avro_to_arrow_field(field["name"], field["type"])
+                    for field in self._avro_schema_json["fields"]
+                ),
+                [
+                    _avro_decimal_type(field["type"])
+                    for field in self._avro_schema_json["fields"]
+                ],
+            ),
         )
 
     def _parse_fastavro(self):
         """Convert parsed Avro schema to fastavro format."""
+        if self._fastavro_block_schema:
+            return
+
         self._parse_avro_schema()
-        self._fastavro_schema = fastavro.parse_schema(self._avro_schema_json)
+
+        # The rows in a message are concatenated Avro records. Reading them
+        # as the items of an Avro array lets fastavro decode the whole block
+        # in a single call, instead of dispatching on the schema from Python
+        # for every row.
+        self._fastavro_block_schema = _SCHEMA_CACHE.get(
+            ("fastavro", self._read_session.avro_schema.schema),
+            lambda: fastavro.parse_schema(
+                {"type": "array", "items": self._avro_schema_json}
+            ),
+        )
+
+    def _decoder(self, layout=_avro.COLUMNS, raw_logical_types=False):
+        """Get a decoder compiled for the session's schema.
+
+        Returns:
+            Optional[Callable[[bytes, int], Any]]:
+                The decoder, or ``None`` if the schema uses types it doesn't
+                support, in which case fastavro decodes the rows instead.
+        """
+        key = (layout, raw_logical_types)
+        if key not in self._decoders:
+            self._parse_avro_schema()
+            self._decoders[key] = _SCHEMA_CACHE.get(
+                ("avro_decoder", layout, raw_logical_types)
+                + (self._read_session.avro_schema.schema,),
+                lambda: _compile_avro_decoder(
+                    self._avro_schema_json, layout, raw_logical_types
+                ),
+            )
+        return self._decoders[key]
+
+    def _decode_block(self, message):
+        """Decode all rows in a stream message with a single fastavro call.
+
+        Returns:
+            List[Mapping]:
+                The rows in the message, represented as dictionaries.
+        """
+        self._parse_fastavro()
+
+        if not message.row_count:
+            return []
+
+        # An Avro array is encoded as a count of items followed by the items
+        # and an empty block, which marks the end of the array.
+        blockio = six.BytesIO(
+            _encode_avro_long(message.row_count)
+            + message.avro_rows.serialized_binary_rows
+            + b"\x00"
+        )
+        # TODO: Parse DATETIME into datetime.datetime (no timezone),
+        #       instead of as a string.
+        return fastavro.schemaless_reader(blockio, self._fastavro_block_schema)
+
+    def _to_columns(self, message):
+        """Parse all rows in a stream message into one list per column.
+
+        Returns:
+            List[List[Any]]:
+                The values of each column, in schema order.
+        """
+        decode = self._decoder()
+        if decode is not None:
+            return decode(message.avro_rows.serialized_binary_rows, message.row_count)
+
+        rows = self._decode_block(message)
+        return [[row[name] for row in rows] for name in self._column_names]
 
     def to_rows(self, message):
         """Parse all rows in a stream message.
@@ -601,26 +1838,252 @@ class _AvroStreamParser(_StreamParser):
             Iterable[Mapping]:
                 A sequence of rows, represented as dictionaries.
         """
-        self._parse_fastavro()
-        messageio = six.BytesIO(message.avro_rows.serialized_binary_rows)
-        while True:
-            # Loop in a while loop because schemaless_reader can only read
-            # a single record.
-            try:
-                # TODO: Parse DATETIME into datetime.datetime (no timezone),
-                #       instead of as a string.
-                yield fastavro.schemaless_reader(messageio, self._fastavro_schema)
-            except StopIteration:
-                break  # Finished with message
+        decode = self._decoder(_avro.DICTS)
+        if decode is not None:
+            return decode(message.avro_rows.serialized_binary_rows, message.row_count)
+        return self._decode_block(message)
+
+    def to_tuples(self, message):
+        """Parse all rows in a stream message into tuples of values.
+
+        Returns:
+            List[Tuple[Any, ...]]:
+                The values of each row, in schema order.
+        """
+        decode = self._decoder(_avro.TUPLES)
+        if decode is not None:
+            return decode(message.avro_rows.serialized_binary_rows, message.row_count)
+
+        # fastavro fills in each record dictionary in schema order.
+        return [tuple(row.values()) for row in self._decode_block(message)]
+
+    def to_ipc_message(self, message):
+        """Decode a stream message and serialize it as an Arrow IPC message.
+
+        Returns:
+            pyarrow.Buffer:
+                The rows in the message, as an encapsulated record batch.
+        """
+        return self.to_arrow(message).serialize()
+
+    def to_ipc_schema(self):
+        """Serialize the schema as an Arrow IPC message.
+
+        Returns:
+            pyarrow.Buffer:
+                The Arrow schema derived from the Avro schema.
+        """
+        self._parse_arrow_schema()
+        return self._schema.serialize()
+
+
+def _load_avro_schema(schema):
+    """Parse an Avro schema from its JSON representation.
+
+    Returns:
+        Tuple[Mapping[str, Any], Tuple[str, ...], Mapping[str, int]]:
+            The parsed schema, its column names, and a map from column names
+            to indexes.
+    """
+    avro_schema_json = json.loads(schema)
+    column_names = tuple(field["name"] for field in avro_schema_json["fields"])
+    return avro_schema_json, column_names, _field_to_index(column_names)
+
+
+def _avro_to_ipc_message(schema, row_count, serialized_binary_rows):
+    """Decode Avro rows into a serialized Arrow record batch.
+
+    This runs in a ``decode_executor``, which may be another process, so it
+    only takes and returns picklable values.
+
+    Args:
+        schema (str): The Avro schema of the read session, as JSON.
+        row_count (int): The number of rows.
+        serialized_binary_rows (bytes): The Avro-encoded rows.
+
+    Returns:
+        bytes:
+            The rows, as an encapsulated Arrow IPC record batch.
+    """
+    parser = _AvroStreamParser(types.ReadSession(avro_schema={"schema": schema}))
+    message = types.ReadRowsResponse(
+        row_count=row_count,
+        avro_rows={"serialized_binary_rows": serialized_binary_rows},
+    )
+    return parser.to_ipc_message(message).to_pybytes()
+
+
+def _compile_avro_decoder(schema, layout, raw_logical_types):
+    """Compile a decoder, or return ``None`` if the schema isn't supported."""
+    try:
+        return _avro.compile_decoder(
+            schema, layout=layout, raw_logical_types=raw_logical_types
+        )
+    except _avro.UnsupportedSchemaError:
+        return None
+
+
+def _avro_decimal_type(avro_type):
+    """The precision and scale of a NUMERIC or BIGNUMERIC column, if it is one.
+
+    Returns:
+        Optional[Tuple[int, int]]: The precision and scale.
+    """
+    if isinstance(avro_type, list):
+        avro_type = [item for item in avro_type if item != "null"][0]
+    if isinstance(avro_type, dict) and avro_type.get("logicalType") == "decimal":
+        return avro_type.get("precision", 38), avro_type.get("scale", 0)
+    return None
+
+
+def _avro_column_to_arrow(column, arrow_type, decimal_type, raw):
+    """Convert the decoded values of a column to an Arrow array.
+
+    Args:
+        column (List[Any]): The values of the column.
+        arrow_type (pyarrow.DataType): The type of the array.
+        decimal_type (Optional[Tuple[int, int]]):
+            The precision and scale of a NUMERIC or BIGNUMERIC column.
+        raw (bool):
+            Whether the values of logical types are the integers they're
+            encoded as, rather than Python objects.
+
+    Returns:
+        pyarrow.Array: The values of the column.
+    """
+    if decimal_type is not None:
+        if pyarrow.types.is_string(arrow_type):
+            # pyarrow doesn't support decimals with this precision.
+            if raw:
+                precision, scale = decimal_type
+                context = decimal.Context(prec=precision)
+                column = [
+                    None
+                    if value is None
+                    else context.create_decimal(value).scaleb(-scale, context)
+                    for value in column
+                ]
+            column = [None if value is None else str(value) for value in column]
+        elif raw:
+            return _unscaled_to_decimal_array(column, arrow_type)
+    return pyarrow.array(column, type=arrow_type, size=len(column))
+
+
+def _unscaled_to_decimal_array(column, arrow_type):
+    """Build a decimal array from unscaled integers, without Decimal objects."""
+    width = arrow_type.byte_width
+    null = bytes(width)
+    data = b"".join(
+        null if value is None else value.to_bytes(width, "little", signed=True)
+        for value in column
+    )
+
+    validity = None
+    null_count = column.count(None)
+    if null_count:
+        # The data buffer of a boolean array is a bitmap, as validity is.
+        validity = pyarrow.array(
+            [value is not None for value in column], type=pyarrow.bool_()
+        ).buffers()[1]
+    return pyarrow.Array.from_buffers(
+        arrow_type,
+        len(column),
+        [validity, pyarrow.py_buffer(data)],
+        null_count=null_count,
+    )
+
+
+def _field_to_index(column_names):
+    """Map column names to their position in a row."""
+    return {name: index for index, name in enumerate(column_names)}
+
+
+def _encode_avro_long(value):
+    """Encode an integer as an Avro ``long`` (a zig-zag encoded varint)."""
+    value = (value << 1) ^ (value >> 63)
+    encoded = bytearray()
+    while value & ~0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+# Arrow types for Avro primitive types, by pyarrow factory function name.
+_AVRO_TO_ARROW_TYPE_NAMES = {
+    "boolean": "bool_",
+    "int": "int32",
+    "long": "int64",
+    "float": "float32",
+    "double": "float64",
+    "bytes": "binary",
+    "string": "string",
+}
+
+
+def _avro_to_arrow_field(name, avro_type):
+    """Convert an Avro record field to a :class:`pyarrow.Field`.
+
+    BigQuery marks NULLABLE columns with a union of ``"null"`` and the column
+    type.
+    """
+    nullable = False
+    if isinstance(avro_type, list):
+        nullable = "null" in avro_type
+        (avro_type,) = [item for item in avro_type if item != "null"]
+    return pyarrow.field(name, _avro_to_arrow_type(avro_type), nullable)
+
+
+def _avro_to_arrow_type(avro_type):
+    """Convert an Avro type, as used by BigQuery, to a :class:`pyarrow.DataType`.
+
+    The types match those of the same columns in an Arrow read session,
+    except DATETIME, which fastavro parses as a string.
+    """
+    if isinstance(avro_type, six.string_types):
+        return getattr(pyarrow, _AVRO_TO_ARROW_TYPE_NAMES[avro_type])()
+
+    logical_type = avro_type.get("logicalType")
+    if logical_type == "decimal":
+        precision = avro_type.get("precision", 38)
+        scale = avro_type.get("scale", 0)
+        if precision > 38:
+            decimal256 = getattr(pyarrow, "decimal256", None)
+            if decimal256 is None:
+                # pyarrow < 3.0 only has 128-bit decimals, which can't hold
+                # BIGNUMERIC values. Keep them as strings instead.
+                return pyarrow.string()
+            # BIGNUMERIC has a precision of 77 in Avro, but Arrow only
+            # supports up to 76 digits, as used by Arrow read sessions.
+            return decimal256(min(precision, 76), scale)
+        return pyarrow.decimal128(precision, scale)
+    if logical_type == "date":
+        return pyarrow.date32()
+    if logical_type == "time-micros":
+        return pyarrow.time64("us")
+    if logical_type == "timestamp-micros":
+        return pyarrow.timestamp("us", tz="UTC")
+
+    type_name = avro_type["type"]
+    if type_name == "array":
+        return pyarrow.list_(_avro_to_arrow_type(avro_type["items"]))
+    if type_name == "record":
+        return pyarrow.struct(
+            _avro_to_arrow_field(field["name"], field["type"])
+            for field in avro_type["fields"]
+        )
+    return _avro_to_arrow_type(type_name)
 
 
 class _ArrowStreamParser(_StreamParser):
     def __init__(self, read_session):
-        if pyarrow is None:
+        if not pyarrow:
             raise ImportError(_PYARROW_REQUIRED)
 
         self._read_session = read_session
         self._schema = None
+        self._column_names = None
+        self._field_to_index = None
 
     def to_arrow(self, message):
         return self._parse_arrow_message(message)
@@ -629,9 +2092,27 @@ class _ArrowStreamParser(_StreamParser):
         record_batch = self._parse_arrow_message(message)
 
         # Iterate through each column simultaneously, and make a dict from the
-        # row values
-        for row in zip(*record_batch.columns):
-            yield dict(zip(self._column_names, row))
+        # row values. The values are converted right away, so that they are
+        # parsed along with the message.
+        column_names = self._column_names
+        return (dict(zip(column_names, row)) for row in self._to_tuples(record_batch))
+
+    def to_tuples(self, message):
+        return self._to_tuples(self._parse_arrow_message(message))
+
+    def _to_tuples(self, record_batch):
+        # Convert each column to Python values in bulk. This is much faster
+        # than creating a pyarrow scalar for every value and converting those
+        # one at a time.
+        columns = [column.to_pylist() for column in record_batch.columns]
+        return zip(*columns)
+
+    def to_ipc_message(self, message):
+        # The message already contains an encapsulated IPC record batch.
+        return pyarrow.py_buffer(message.arrow_record_batch.serialized_record_batch)
+
+    def to_ipc_schema(self):
+        return pyarrow.py_buffer(self._read_session.arrow_schema.serialized_schema)
 
     def to_dataframe(self, message, dtypes=None):
         record_batch = self._parse_arrow_message(message)
@@ -658,7 +2139,20 @@ class _ArrowStreamParser(_StreamParser):
         if self._schema:
             return
 
-        self._schema = pyarrow.ipc.read_schema(
-            pyarrow.py_buffer(self._read_session.arrow_schema.serialized_schema)
+        schema = self._read_session.arrow_schema.serialized_schema
+        self._schema, self._column_names, self._field_to_index = _SCHEMA_CACHE.get(
+            ("arrow", schema), lambda: _load_arrow_schema(schema)
         )
-        self._column_names = [field.name for field in self._schema]
+
+
+def _load_arrow_schema(serialized_schema):
+    """Read an Arrow IPC schema message.
+
+    Returns:
+        Tuple[pyarrow.Schema, Tuple[str, ...], Mapping[str, int]]:
+            The schema, its column names, and a map from column names to
+            indexes.
+    """
+    schema = pyarrow.ipc.read_schema(pyarrow.py_buffer(serialized_schema))
+    column_names = tuple(field.name for field in schema)
+    return schema, column_names, _field_to_index(column_names)
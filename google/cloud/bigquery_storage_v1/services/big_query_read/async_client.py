@@ -19,7 +19,7 @@ from collections import OrderedDict
 import functools
 import re
 from typing import Dict, AsyncIterable, Sequence, Tuple, Type, Union
-import pkg_resources
+from google.cloud.bigquery_storage_v1 import version as package_version
 
 import google.api_core.client_options as ClientOptions  # type: ignore
 from google.api_core import exceptions  # type: ignore
@@ -405,14 +405,9 @@ class BigQueryReadAsyncClient:
         return response
 
 
-try:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            "google-cloud-bigquery-storage",
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo()
+DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
+    gapic_version=package_version.__version__,
+)
 
 
 __all__ = ("BigQueryReadAsyncClient",)
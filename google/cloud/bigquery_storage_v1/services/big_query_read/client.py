@@ -16,11 +16,10 @@
 #
 
 from collections import OrderedDict
-from distutils import util
 import os
 import re
 from typing import Callable, Dict, Iterable, Sequence, Tuple, Type, Union
-import pkg_resources
+from google.cloud.bigquery_storage_v1 import version as package_version
 
 import google.api_core.client_options as ClientOptions  # type: ignore
 from google.api_core import exceptions  # type: ignore
@@ -218,9 +217,18 @@ class BigQueryReadClient(metaclass=BigQueryReadClientMeta):
             client_options = ClientOptions.ClientOptions()
 
         # Create SSL credentials for mutual TLS if needed.
-        use_client_cert = bool(
-            util.strtobool(os.getenv("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false"))
-        )
+        use_client_cert = os.getenv("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false")
+        use_client_cert = use_client_cert.lower()
+        if use_client_cert in ("y", "yes", "t", "true", "on", "1"):
+            use_client_cert = True
+        elif use_client_cert in ("n", "no", "f", "false", "off", "0"):
+            use_client_cert = False
+        else:
+            raise ValueError(
+                "Environment variable `GOOGLE_API_USE_CLIENT_CERTIFICATE` "
+                "must be one of `true`, `t`, `yes`, `y`, `on`, `1`, "
+                "`false`, `f`, `no`, `n`, `off` or `0`"
+            )
 
         ssl_credentials = None
         is_mtls = False
@@ -563,14 +571,9 @@ class BigQueryReadClient(metaclass=BigQueryReadClientMeta):
         return response
 
 
-try:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            "google-cloud-bigquery-storage",
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo()
+DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
+    gapic_version=package_version.__version__,
+)
 
 
 __all__ = ("BigQueryReadClient",)
@@ -0,0 +1,193 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reuse read sessions which read the same snapshot of a table."""
+
+from __future__ import absolute_import
+
+import collections
+import concurrent.futures
+import threading
+import time
+
+from google.cloud.bigquery_storage_v1 import types
+
+
+# Maximum number of seconds to reuse a session for.
+DEFAULT_TTL = 3600.0
+
+# Seconds before a session's ``expire_time`` to stop reusing it, so that
+# callers have time to read it.
+DEFAULT_EXPIRY_MARGIN = 1800.0
+
+_CacheEntry = collections.namedtuple("_CacheEntry", ("read_session", "evict_at"))
+
+
+class ReadSessionCache(object):
+    """A cache of read sessions, keyed by what they read.
+
+    Pass a cache to :class:`~google.cloud.bigquery_storage_v1.client.BigQueryReadClient`
+    to have :meth:`create_read_session` return an earlier session instead of
+    creating a new one, when the request has the same parent, table, data
+    format, maximum stream count, selected fields, row restriction and
+    snapshot time.
+
+    Only requests with a ``table_modifiers.snapshot_time`` are cached. A
+    session without one reads the table as it was when the session was
+    created, so reusing it would return stale rows.
+
+    A cached session is shared: every caller gets the same streams, not new
+    ones. Reading a stream doesn't use it up, as its rows can be read any
+    number of times while the session is valid, so each caller can read
+    every stream from the start. Splitting a stream changes it for every
+    caller, though, so a
+    :class:`~google.cloud.bigquery_storage_v1.session_reader.ReadSessionReader`
+    which splits or hedges streams removes its session from the cache
+    first, and callers which split streams themselves should call
+    :meth:`invalidate` before doing so. A caller which already got the
+    session may still be reading the original streams, so only split the
+    streams of a cached session while no one else reads it. Don't use a
+    cached session with a ``checkpoint_store``, since all callers would
+    share the offsets saved for the session.
+
+    When several callers ask for a session which isn't cached yet at the
+    same time, only one of them creates it, and the others wait for it.
+
+    Args:
+        max_size (Optional[int]):
+            Maximum number of sessions to keep. The least recently used
+            session is evicted when there are more.
+        ttl (Optional[float]):
+            Maximum number of seconds to reuse a session for.
+        expiry_margin (Optional[float]):
+            Seconds before a session's ``expire_time`` to stop reusing it.
+    """
+
+    def __init__(
+        self, max_size=128, ttl=DEFAULT_TTL, expiry_margin=DEFAULT_EXPIRY_MARGIN
+    ):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._expiry_margin = expiry_margin
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._creating = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_or_create(self, request, create_read_session):
+        """Get a session for a request from the cache, or create one.
+
+        Args:
+            request (~google.cloud.bigquery_storage_v1.types.CreateReadSessionRequest):
+                The request which the session is for.
+            create_read_session (Callable[[], \
+                ~google.cloud.bigquery_storage_v1.types.ReadSession \
+            ]):
+                Creates a new session for the request.
+
+        Returns:
+            ~google.cloud.bigquery_storage_v1.types.ReadSession:
+                A copy of the cached session, or a new session. Copies of
+                the same session have the same streams.
+        """
+        key = _cache_key(request)
+        if key is None:
+            return create_read_session()
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.evict_at > now:
+                self._entries.move_to_end(key)
+                return _copy(entry.read_session)
+            self._entries.pop(key, None)
+
+            creating = self._creating.get(key)
+            if creating is None:
+                self._creating[key] = future = concurrent.futures.Future()
+
+        if creating is not None:
+            # Another caller is creating this session already.
+            return _copy(creating.result())
+
+        try:
+            read_session = create_read_session()
+        except BaseException as exc:
+            with self._lock:
+                del self._creating[key]
+            future.set_exception(exc)
+            raise
+
+        evict_at = now + self._ttl
+        if "expire_time" in read_session:
+            evict_at = min(
+                evict_at, read_session.expire_time.timestamp() - self._expiry_margin
+            )
+
+        cached = _copy(read_session)
+        with self._lock:
+            del self._creating[key]
+            if evict_at > now:
+                self._entries[key] = _CacheEntry(cached, evict_at)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+        future.set_result(cached)
+        return read_session
+
+    def invalidate(self, read_session=None):
+        """Stop reusing a session, such as after reading it failed.
+
+        Args:
+            read_session (Optional[~google.cloud.bigquery_storage_v1.types.ReadSession]):
+                The session to remove. If not set, remove all sessions.
+        """
+        with self._lock:
+            if read_session is None:
+                self._entries.clear()
+                return
+
+            for key, entry in list(self._entries.items()):
+                if entry.read_session.name == read_session.name:
+                    del self._entries[key]
+
+
+def _cache_key(request):
+    """What a session created for ``request`` reads.
+
+    Returns:
+        Optional[Tuple]: The key, or ``None`` if the session must not be reused.
+    """
+    read_session = request.read_session
+    if "snapshot_time" not in read_session.table_modifiers:
+        return None
+
+    snapshot_time = read_session.table_modifiers.snapshot_time.timestamp_pb()
+    return (
+        request.parent,
+        read_session.table,
+        read_session.data_format,
+        request.max_stream_count,
+        tuple(read_session.read_options.selected_fields),
+        read_session.read_options.row_restriction,
+        (snapshot_time.seconds, snapshot_time.nanos),
+    )
+
+
+def _copy(read_session):
+    """Copy a session, so that callers can't change the cached one."""
+    return types.ReadSession.deserialize(types.ReadSession.serialize(read_session))
@@ -0,0 +1,1294 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import bisect
+import collections
+import concurrent.futures
+import itertools
+import queue
+import threading
+import time
+
+import google.api_core.exceptions
+
+from google.cloud.bigquery_storage_v1 import _lazy
+from google.cloud.bigquery_storage_v1 import checkpoint
+from google.cloud.bigquery_storage_v1 import reader
+
+pandas = _lazy.LazyModule("pandas")
+pyarrow = _lazy.LazyModule("pyarrow")
+
+
+# Number of worker threads used when ``max_workers`` is not set. Reading is
+# mostly network-bound, so this is larger than the number of CPUs on most
+# machines.
+_DEFAULT_MAX_WORKERS = 32
+
+# Seconds to wait on a full result queue before checking whether the reader
+# has been closed.
+_QUEUE_PUT_TIMEOUT = 0.1
+
+# Streams which the server reports as further along than this are not worth
+# splitting, as the remainder would be too small to make up for the extra
+# requests.
+_MAX_SPLIT_PROGRESS = 0.8
+
+# Number of streams read at the same time when ``adaptive_concurrency`` is
+# set, before the first adjustment.
+_ADAPTIVE_INITIAL_STREAMS = 2
+
+# Seconds of reading over which throughput and throttling are measured
+# before each adjustment of the number of streams read at the same time.
+_ADAPTIVE_INTERVAL = 2.0
+
+# Minimum relative increase in throughput, from one interval to the next,
+# for another stream to be worth reading at the same time.
+_ADAPTIVE_MIN_GAIN = 0.05
+
+# Increase in the throttling reported by the server, in percentage points
+# since the last back-off, for which fewer streams are read at the same
+# time. Steady throttling doesn't shrink the limit again.
+_ADAPTIVE_THROTTLE_STEP = 10
+
+# A stream is hedged when it has been read for at least this many seconds,
+# and its rows per second are below this fraction of the median of all
+# streams in the session.
+_HEDGE_MIN_SECONDS = 1.0
+_HEDGE_SLOWDOWN = 0.5
+
+# Seconds between checks for slow streams by a worker which has no streams
+# left to read.
+_HEDGE_POLL_INTERVAL = 0.1
+
+_PAGE = "page"
+_DONE = "done"
+_SPLIT = "split"
+_HEDGE_PAGE = "hedge_page"
+_HEDGE_DONE = "hedge_done"
+_ERROR = "error"
+_EXIT = "exit"
+
+# The two reads of the rest of a hedged stream.
+_ORIGINAL = "original"
+_HEDGED = "hedged"
+
+
+class ReadSessionReader(object):
+    """Read all streams in a read session concurrently.
+
+    Each stream is read on a worker thread with
+    :meth:`~google.cloud.bigquery_storage_v1.client.BigQueryReadClient.read_rows`,
+    so reconnecting after transient errors works the same way as it does
+    for a single :class:`~google.cloud.bigquery_storage_v1.reader.ReadRowsStream`.
+    Pages are decoded on the worker threads as they arrive.
+
+    Use the
+    :func:`~google.cloud.bigquery_storage_v1.session_reader.ReadSessionReader.to_arrow()`
+    or
+    :func:`~google.cloud.bigquery_storage_v1.session_reader.ReadSessionReader.to_dataframe()`
+    methods to combine all streams into a single table, or the
+    :func:`~google.cloud.bigquery_storage_v1.session_reader.ReadSessionReader.record_batches()`
+    method to process record batches as they are decoded.
+
+    If ``split_streams`` is set, a worker which runs out of streams to read
+    splits the stream with the most work left with
+    :meth:`~google.cloud.bigquery_storage_v1.services.big_query_read.BigQueryReadClient.split_read_stream`
+    and reads the remainder, so that a few slow streams don't hold up the
+    whole session.
+
+    If ``adaptive_concurrency`` is set, the number of streams read at the
+    same time starts small and grows while the server isn't throttling the
+    read and throughput keeps rising. It shrinks again when the server
+    reports more throttling.
+
+    If ``hedge_streams`` is set, a worker which runs out of streams to read
+    watches for streams read much more slowly than the others, such as
+    streams served by an overloaded backend. It splits the rest of such a
+    stream and reads both halves, racing the original reader to the end of
+    the stream. Rows from whichever read finishes first are returned, and
+    the other read is cancelled.
+    """
+
+    def __init__(
+        self,
+        client,
+        read_session,
+        max_workers=None,
+        read_rows_kwargs=None,
+        split_streams=False,
+        checkpoint_store=None,
+        checkpoint_interval=checkpoint.DEFAULT_CHECKPOINT_INTERVAL,
+        adaptive_concurrency=False,
+        hedge_streams=False,
+    ):
+        """Construct a ReadSessionReader.
+
+        Args:
+            client ( \
+                ~google.cloud.bigquery_storage_v1.client.BigQueryReadClient \
+            ):
+                A client used to open a ReadRows stream for each stream in the
+                session.
+            read_session ( \
+                ~google.cloud.bigquery_storage_v1.types.ReadSession \
+            ):
+                The read session to read. This contains the streams to read
+                and the schema, which is required to parse the data messages.
+            max_workers (Optional[int]):
+                Maximum number of streams to read at the same time. Defaults
+                to the number of streams in the session, up to 32.
+            read_rows_kwargs (Optional[dict]):
+                Keyword arguments to use when opening each ReadRows stream.
+            split_streams (Optional[bool]):
+                If ``True``, split streams which are still being read when
+                a worker becomes idle. Rows from split streams are still
+                returned in stream order when results are ordered.
+            checkpoint_store (Optional[ \
+                ~google.cloud.bigquery_storage_v1.checkpoint.CheckpointStore \
+            ]):
+                If set, the session is saved to the store, each stream starts
+                from the offset saved in the store, if any, and offsets are
+                saved as record batches from :meth:`record_batches` are
+                processed. A record batch counts as processed once the caller
+                asks for the next one. Can't be used with ``split_streams``.
+            checkpoint_interval (Optional[float]):
+                Minimum number of seconds between saves of offsets to the
+                ``checkpoint_store``. Offsets are also saved when reading
+                stops.
+            adaptive_concurrency (Optional[bool]):
+                If ``True``, adjust the number of streams read at the same
+                time, up to ``max_workers``, based on the throughput and the
+                throttling reported by the server. A stream which is already
+                open is paused between pages while there are too many
+                streams being read.
+            hedge_streams (Optional[bool]):
+                If ``True``, start a second read of the rest of any stream
+                whose rows per second fall well below the median of the
+                session, once a worker is idle. Rows read by both are held
+                in memory until one of them reaches the end of the stream.
+                Can't be used with ``split_streams`` or a
+                ``checkpoint_store``.
+        """
+        if checkpoint_store is not None and split_streams:
+            raise ValueError("split_streams can't be used with a checkpoint_store.")
+        if hedge_streams and (split_streams or checkpoint_store is not None):
+            raise ValueError(
+                "hedge_streams can't be used with split_streams or a checkpoint_store."
+            )
+
+        if max_workers is None:
+            max_workers = min(len(read_session.streams), _DEFAULT_MAX_WORKERS)
+        if max_workers < 1:
+            max_workers = 1
+
+        self._client = client
+        self._read_session = read_session
+        self._max_workers = max_workers
+        self._read_rows_kwargs = read_rows_kwargs or {}
+        self._split_streams = split_streams
+        self._checkpoint_store = checkpoint_store
+        self._checkpoint_interval = checkpoint_interval
+        self._adaptive_concurrency = adaptive_concurrency
+        self._hedge_streams = hedge_streams
+        self._offsets = {}
+
+        # Splitting changes the streams for everyone who reads the session,
+        # so stop handing it out from the client's cache.
+        session_cache = getattr(client, "_session_cache", None)
+        if session_cache is not None and (split_streams or hedge_streams):
+            session_cache.invalidate(read_session)
+
+        if checkpoint_store is not None:
+            checkpoint_store.save_session(read_session)
+            self._offsets = checkpoint_store.load_offsets(read_session.name)
+
+    def record_batches(self, ordered=True):
+        """Iterate over record batches from all streams in the session.
+
+        This method requires the pyarrow library. Streams using the Avro
+        format also require the fastavro library.
+
+        Args:
+            ordered (Optional[bool]):
+                If ``True`` (the default), all record batches from a stream
+                are returned before any record batch from the next stream in
+                the session. Record batches from streams later in the session
+                are buffered in memory until it is their turn. If ``False``,
+                record batches are returned as soon as any worker has decoded
+                them.
+
+        Returns:
+            Iterable[pyarrow.RecordBatch]:
+                A sequence of record batches.
+        """
+        if not pyarrow:
+            raise ImportError(reader._PYARROW_REQUIRED)
+
+        return self._iter_decoded(_page_to_arrow, ordered, commit_offsets=True)
+
+    def to_arrow(self):
+        """Create a :class:`pyarrow.Table` of all rows in the session.
+
+        This method requires the pyarrow library. Streams using the Avro
+        format also require the fastavro library.
+
+        Returns:
+            pyarrow.Table:
+                A table of all rows in the session, in stream order.
+        """
+        if not pyarrow:
+            raise ImportError(reader._PYARROW_REQUIRED)
+
+        record_batches = list(self._iter_decoded(_page_to_arrow, ordered=True))
+
+        if record_batches:
+            return pyarrow.Table.from_batches(record_batches)
+
+        # No data, return an empty Table.
+        return self._empty_rows().to_arrow()
+
+    def to_parquet(
+        self, where, row_group_size=None, compression="snappy", ordered=False
+    ):
+        """Write all rows in the session to a Parquet file.
+
+        Each page is written as soon as it is decoded, so the whole session
+        is never held in memory. This method requires the pyarrow library.
+        Streams using the Avro format also require the fastavro library.
+
+        Args:
+            where (Union[str, pyarrow.NativeFile]):
+                The path or file to write to.
+            row_group_size (Optional[int]):
+                Number of rows in each Parquet row group. Pages are coalesced
+                until they contain this many rows. If not set, each page is
+                written as its own row group.
+            compression (Optional[str]):
+                Compression codec to use, such as ``"snappy"`` (the default),
+                ``"zstd"``, ``"gzip"``, or ``"none"``.
+            ordered (Optional[bool]):
+                If ``True``, write rows in stream order. This buffers pages
+                from streams later in the session in memory until it is their
+                turn. If ``False`` (the default), pages are written in the
+                order they are decoded.
+
+        Returns:
+            int:
+                The number of rows written.
+        """
+        if not pyarrow:
+            raise ImportError(reader._PYARROW_REQUIRED)
+
+        return reader._write_parquet(
+            self._iter_decoded(_page_to_arrow, ordered),
+            self._empty_rows()._arrow_schema(),
+            where,
+            row_group_size=row_group_size,
+            compression=compression,
+        )
+
+    def to_arrow_ipc(self, where, ipc_format="file", ordered=False):
+        """Write all rows in the session to an Arrow IPC file or stream.
+
+        For sessions using the Arrow format, the serialized record batches
+        are written as they were received, without decoding them, so the
+        result can be memory-mapped with :func:`pyarrow.memory_map` and read
+        without copies. This method requires the pyarrow library. Sessions
+        using the Avro format also require the fastavro library.
+
+        Args:
+            where (Union[str, pyarrow.NativeFile]):
+                The path or file to write to.
+            ipc_format (Optional[str]):
+                Either ``"file"`` (the default), for the random access Arrow
+                IPC file format, or ``"stream"``, for the Arrow IPC streaming
+                format.
+            ordered (Optional[bool]):
+                If ``True``, write rows in stream order. This buffers pages
+                from streams later in the session in memory until it is their
+                turn. If ``False`` (the default), pages are written in the
+                order they are received.
+
+        Returns:
+            int:
+                The number of rows written.
+        """
+        if not pyarrow:
+            raise ImportError(reader._PYARROW_REQUIRED)
+
+        empty_rows = self._empty_rows()
+        return reader._write_arrow_ipc(
+            self._iter_decoded(_page_to_ipc_message, ordered),
+            empty_rows._arrow_schema(),
+            empty_rows._stream_parser.to_ipc_schema(),
+            where,
+            ipc_format=ipc_format,
+        )
+
+    def to_dataframe(self, dtypes=None, low_memory=False):
+        """Create a :class:`pandas.DataFrame` of all rows in the session.
+
+        This method requires the pandas libary to create a data frame and the
+        fastavro library to parse row messages.
+
+        .. warning::
+            DATETIME columns are not supported. They are currently parsed as
+            strings in the fastavro library.
+
+        Args:
+            dtypes ( \
+                Map[str, Union[str, pandas.Series.dtype]] \
+            ):
+                Optional. A dictionary of column names pandas ``dtype``s. The
+                provided ``dtype`` is used when constructing the series for
+                the column specified. Otherwise, the default pandas behavior
+                is used.
+            low_memory (Optional[bool]):
+                If ``True``, release memory while reading and converting,
+                as in
+                :meth:`~google.cloud.bigquery_storage_v1.reader.ReadRowsIterable.to_dataframe`.
+
+        Returns:
+            pandas.DataFrame:
+                A data frame of all rows in the session, in stream order.
+        """
+        if not pandas:
+            raise ImportError(reader._PANDAS_REQUIRED)
+
+        if dtypes is None:
+            dtypes = {}
+
+        # As with a single stream, converting the whole session with to_arrow
+        # and to_pandas is faster than concatenating per-page data frames.
+        schema_type = self._read_session._pb.WhichOneof("schema")
+
+        if schema_type == "arrow_schema" or pyarrow:
+            if low_memory:
+                table = reader._low_memory_table(
+                    self._iter_decoded(_page_to_arrow, ordered=True),
+                    self._empty_rows()._arrow_schema(),
+                    dtypes,
+                )
+            else:
+                table = self.to_arrow()
+            return reader._arrow_to_dataframe(table, dtypes, low_memory)
+
+        frames = list(
+            self._iter_decoded(
+                lambda page: page.to_dataframe(dtypes=dtypes), ordered=True
+            )
+        )
+
+        if frames:
+            return pandas.concat(frames)
+
+        # No data, construct an empty dataframe with columns matching the schema.
+        return self._empty_rows().to_dataframe(dtypes=dtypes)
+
+    def _empty_rows(self):
+        """Create an iterable with no rows, used for empty results."""
+        return reader.ReadRowsIterable((), self._read_session)
+
+    def _iter_decoded(self, decode, ordered, commit_offsets=False):
+        """Read all streams, decoding each page on a worker thread.
+
+        Args:
+            decode (Callable[[reader.ReadRowsPage], Any]):
+                Function called on a worker thread to decode each page.
+            ordered (bool):
+                Whether to return results in stream order.
+            commit_offsets (Optional[bool]):
+                Whether to save the offsets of pages processed by the caller
+                to the checkpoint store, if any.
+
+        Returns:
+            Iterable[Any]:
+                The result of ``decode`` for each page.
+        """
+        checkpointer = None
+        if commit_offsets and self._checkpoint_store is not None:
+            checkpointer = checkpoint._Checkpointer(
+                self._checkpoint_store,
+                self._read_session.name,
+                interval=self._checkpoint_interval,
+            )
+
+        try:
+            for value, stream_name, offset in self._iter_pages(decode, ordered):
+                yield value
+                # The caller has asked for the next result, so it's done
+                # with this one.
+                if checkpointer is not None:
+                    checkpointer.commit(stream_name, offset)
+        finally:
+            if checkpointer is not None:
+                checkpointer.flush()
+
+    def _iter_pages(self, decode, ordered):
+        """Read all streams, decoding each page on a worker thread.
+
+        Returns:
+            Iterable[Tuple[Any, str, int]]:
+                The result of ``decode`` for each page, and the name of the
+                stream and offset after the page.
+        """
+        tasks = [
+            _StreamTask((index,), stream.name, offset=self._offsets.get(stream.name, 0))
+            for index, stream in enumerate(self._read_session.streams)
+        ]
+        if not tasks:
+            return
+
+        # Bound the number of decoded pages waiting for the caller, so that
+        # workers don't read far ahead of a slow consumer.
+        results = queue.Queue(maxsize=2 * self._max_workers)
+        stop = threading.Event()
+        scheduler = _Scheduler(tasks)
+        order = _StreamOrder(task.key for task in tasks)
+        workers = min(self._max_workers, len(tasks))
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        controller = None
+        if self._adaptive_concurrency:
+            controller = _ConcurrencyController(workers)
+
+        # Streams which haven't been read to the end. Once there are none,
+        # the only workers left are readers of hedged streams which lost, and
+        # they may be waiting on the network.
+        remaining = len(tasks)
+
+        try:
+            for _ in range(workers):
+                executor.submit(
+                    self._work, scheduler, decode, results, stop, controller
+                )
+
+            while workers and remaining:
+                kind, key, value = results.get()
+
+                if kind == _ERROR:
+                    raise value
+                elif kind == _EXIT:
+                    workers -= 1
+                elif kind == _SPLIT:
+                    order.insert(value)
+                    remaining += 1
+                elif kind in (_DONE, _HEDGE_DONE):
+                    values, finished = (), True
+                    if kind == _HEDGE_DONE:
+                        hedge, succeeded = value
+                        values, finished = hedge.finish(_HEDGED, succeeded)
+                    elif value is not None:
+                        values, finished = value.finish(_ORIGINAL, True)
+
+                    for item in _deliver(order, ordered, key, values):
+                        yield item
+                    if finished:
+                        remaining -= 1
+                        if ordered:
+                            for buffered in order.finish(key):
+                                yield buffered
+                elif kind == _HEDGE_PAGE:
+                    hedge, contestant, page = value
+                    values = hedge.add_page(contestant, page)
+                    for item in _deliver(order, ordered, key, values):
+                        yield item
+                else:
+                    for item in _deliver(order, ordered, key, (value,)):
+                        yield item
+        finally:
+            stop.set()
+            # Workers may be waiting on the network for their next message.
+            scheduler.close()
+            executor.shutdown(wait=False)
+
+    def _work(self, scheduler, decode, results, stop, controller=None):
+        """Read streams from ``scheduler`` until there are none left."""
+        try:
+            stream_parser = reader._StreamParser.from_read_session(self._read_session)
+            task = scheduler.next_task()
+            while task is not None and not stop.is_set():
+                self._read_task(
+                    scheduler, task, stream_parser, decode, results, stop, controller
+                )
+                _put(results, (_DONE, task.key, task.hedge), stop)
+
+                task = scheduler.next_task()
+                if task is None and self._split_streams:
+                    task = self._steal(scheduler, stop)
+
+            if self._hedge_streams:
+                self._hedge(scheduler, stream_parser, decode, results, stop, controller)
+        except Exception as exc:
+            _put(results, (_ERROR, None, exc), stop)
+        finally:
+            _put(results, (_EXIT, None, None), stop)
+
+    def _read_task(
+        self, scheduler, task, stream_parser, decode, results, stop, controller=None
+    ):
+        """Read a single stream, sending each decoded page to ``results``.
+
+        With a ``controller``, the worker holds one of its permits while
+        reading the stream, and gives it up between pages while too many
+        streams are being read.
+        """
+        holds_permit = False
+        try:
+            if controller is not None:
+                holds_permit = controller.acquire(stop)
+                if not holds_permit:
+                    return
+
+            task.stream = self._open_stream(scheduler, task.name, task.offset)
+            messages = iter(task.stream)
+            while not stop.is_set():
+                if task.hedge is not None and task.hedge.is_lost(_ORIGINAL):
+                    return
+
+                offer = scheduler.take_split_offer(task)
+                if offer is not None:
+                    messages = self._accept_split(
+                        scheduler, task, offer, messages, results, stop
+                    )
+
+                if controller is not None and controller.over_limit():
+                    controller.release()
+                    holds_permit = controller.acquire(stop)
+                    if not holds_permit:
+                        return
+
+                try:
+                    message = next(messages, None)
+                except google.api_core.exceptions.GoogleAPICallError:
+                    # The read is cancelled when a hedge of the stream wins.
+                    if task.hedge is not None and task.hedge.is_lost(_ORIGINAL):
+                        return
+                    raise
+                if message is None:
+                    return
+
+                if controller is not None:
+                    controller.record(message)
+                hedge = scheduler.advance(task, message.row_count)
+                task.progress = message.stats.progress.at_response_end
+                page = reader.ReadRowsPage(stream_parser, message)
+                result = (decode(page), task.name, task.offset)
+                if hedge is None:
+                    _put(results, (_PAGE, task.key, result), stop)
+                else:
+                    _put(
+                        results,
+                        (_HEDGE_PAGE, task.key, (hedge, _ORIGINAL, result)),
+                        stop,
+                    )
+        finally:
+            if holds_permit:
+                controller.release()
+            if task.stream is not None:
+                scheduler.untrack(task.stream)
+            scheduler.finish(task)
+
+    def _open_stream(self, scheduler, name, offset):
+        """Start reading a stream, so that it's cancelled if the read stops.
+
+        Returns:
+            ~google.cloud.bigquery_storage_v1.reader.ReadRowsStream:
+                The stream of messages from ``offset``.
+        """
+        stream = self._client.read_rows(name, offset=offset, **self._read_rows_kwargs)
+        scheduler.track(stream)
+        return stream
+
+    def _steal(self, scheduler, stop):
+        """Split the stream with the most remaining work with an idle worker.
+
+        Returns:
+            Optional[_StreamTask]:
+                The remainder of a split stream, or ``None`` if there are no
+                streams left worth splitting.
+        """
+        while not stop.is_set():
+            victim = scheduler.choose_victim()
+            if victim is None:
+                return None
+
+            # Split the part of the stream that hasn't been read yet in half.
+            fraction = (1.0 + victim.progress) / 2.0
+            try:
+                response = self._client.split_read_stream(
+                    request={"name": victim.name, "fraction": fraction},
+                    metadata=self._read_rows_kwargs.get("metadata", ()),
+                )
+            except google.api_core.exceptions.GoogleAPICallError:
+                response = None
+
+            if (
+                response is None
+                or not response.primary_stream.name
+                or not response.remainder_stream.name
+            ):
+                scheduler.end_split(victim, None)
+                continue
+
+            offer = scheduler.offer_split(
+                victim, response.primary_stream.name, response.remainder_stream.name
+            )
+            if offer is None or not offer.wait(stop):
+                scheduler.end_split(victim, None)
+                continue
+
+            scheduler.end_split(victim, offer.remainder)
+            return offer.remainder
+
+        return None
+
+    def _hedge(self, scheduler, stream_parser, decode, results, stop, controller=None):
+        """Hedge slow streams until none are left which could need it."""
+        while not stop.is_set():
+            straggler, waiting = scheduler.choose_straggler()
+            if straggler is None:
+                if not waiting:
+                    return
+                stop.wait(_HEDGE_POLL_INTERVAL)
+                continue
+
+            self._read_hedge(
+                scheduler, straggler, stream_parser, decode, results, stop, controller
+            )
+
+    def _read_hedge(
+        self,
+        scheduler,
+        straggler,
+        stream_parser,
+        decode,
+        results,
+        stop,
+        controller=None,
+    ):
+        """Read the rest of a slow stream from the two halves of a split.
+
+        The worker reading ``straggler`` keeps reading the original stream.
+        The original stream has the same rows as the primary stream followed
+        by the remainder stream, so this worker reads the primary stream from
+        the offset the original reader has reached, then the remainder.
+        """
+        # Split what hasn't been read yet in half, as for split_streams.
+        fraction = (1.0 + straggler.progress) / 2.0
+        try:
+            response = self._client.split_read_stream(
+                request={"name": straggler.name, "fraction": fraction},
+                metadata=self._read_rows_kwargs.get("metadata", ()),
+            )
+        except google.api_core.exceptions.GoogleAPICallError:
+            response = None
+
+        hedge = None
+        if (
+            response is not None
+            and response.primary_stream.name
+            and response.remainder_stream.name
+        ):
+            hedge = _Hedge(response.primary_stream.name, response.remainder_stream.name)
+        hedge = scheduler.start_hedge(straggler, hedge)
+        if hedge is None:
+            return
+
+        holds_permit = False
+        succeeded = False
+        try:
+            if controller is not None:
+                holds_permit = controller.acquire(stop)
+                if not holds_permit:
+                    return
+
+            for name, offset in (
+                (hedge.primary_name, hedge.offset),
+                (hedge.remainder_name, 0),
+            ):
+                stream = self._open_stream(scheduler, name, offset)
+                hedge.streams[_HEDGED] = stream
+                for message in stream:
+                    if stop.is_set() or hedge.is_lost(_HEDGED):
+                        return
+                    offset += message.row_count
+                    page = reader.ReadRowsPage(stream_parser, message)
+                    _put(
+                        results,
+                        (
+                            _HEDGE_PAGE,
+                            straggler.key,
+                            (hedge, _HEDGED, (decode(page), name, offset)),
+                        ),
+                        stop,
+                    )
+            succeeded = True
+        except google.api_core.exceptions.GoogleAPICallError:
+            # The original reader is still reading the whole stream, so a
+            # failed hedge doesn't fail the session.
+            pass
+        finally:
+            if holds_permit:
+                controller.release()
+            if _HEDGED in hedge.streams:
+                scheduler.untrack(hedge.streams[_HEDGED])
+            _put(results, (_HEDGE_DONE, straggler.key, (hedge, succeeded)), stop)
+
+    def _accept_split(self, scheduler, task, offer, messages, results, stop):
+        """Continue reading ``task`` from the primary stream of a split.
+
+        The primary stream is read from the current offset. If the worker
+        has already read past the split point, the server rejects this with
+        ``FailedPrecondition``. On that or any other error reading the
+        primary stream, the split is declined and the original stream is
+        read to the end instead.
+
+        Returns:
+            Iterator[~google.cloud.bigquery_storage_v1.types.ReadRowsResponse]:
+                The messages to read for the rest of the task.
+        """
+        stream = None
+        try:
+            # The error may be raised when opening the stream or on the first
+            # message, depending on whether the first message is prefetched.
+            stream = self._open_stream(scheduler, offer.primary_name, task.offset)
+            primary = iter(stream)
+            first = next(primary, None)
+        except google.api_core.exceptions.GoogleAPICallError:
+            if stream is not None:
+                scheduler.untrack(stream)
+                stream._cancel()
+            offer.resolve(False)
+            return messages
+
+        # Nothing more is read from the original stream.
+        if task.stream is not None:
+            scheduler.untrack(task.stream)
+            task.stream._cancel()
+        task.stream = stream
+        task.name = offer.primary_name
+        _put(results, (_SPLIT, task.key, offer.remainder.key), stop)
+        offer.resolve(True)
+
+        if first is None:
+            return primary
+        return itertools.chain((first,), primary)
+
+
+class _StreamTask(object):
+    """A stream in the session which a worker should read.
+
+    Attributes:
+        key (Tuple[int, ...]):
+            Position of the stream's rows in the session. Streams split off
+            from this one get keys which sort after it, but before the next
+            stream.
+        name (str):
+            Name of the stream to read.
+        offset (int):
+            Number of rows read from the stream so far.
+        progress (float):
+            Fraction of the stream processed by the server, as reported by
+            the most recent message.
+        hedge (Optional[_Hedge]):
+            The second read of the rest of the stream, if it was slow.
+    """
+
+    def __init__(self, key, name, offset=0):
+        self.key = key
+        self.name = name
+        self.offset = offset
+        self.progress = 0.0
+        self.finished = False
+        self.splittable = True
+        self.splitting = False
+        self.split_offer = None
+        self.split_count = 0
+        self.stream = None
+        self.started = None
+        self.start_offset = offset
+        self.hedge = None
+        self.hedgeable = True
+        self.hedging = False
+
+    def rows_per_second(self, now):
+        """Rows read per second since a worker started reading the stream."""
+        return (self.offset - self.start_offset) / max(now - self.started, 1e-6)
+
+
+class _SplitOffer(object):
+    """The result of splitting a stream, waiting for its reader to accept."""
+
+    def __init__(self, primary_name, remainder):
+        self.primary_name = primary_name
+        self.remainder = remainder
+        self.accepted = False
+        self._resolved = threading.Event()
+
+    def resolve(self, accepted):
+        self.accepted = accepted
+        self._resolved.set()
+
+    def wait(self, stop):
+        """Wait for the reader of the split stream to accept or reject.
+
+        Returns:
+            bool: ``True`` if the remainder stream should be read.
+        """
+        while not self._resolved.wait(_QUEUE_PUT_TIMEOUT):
+            if stop.is_set():
+                return False
+        return self.accepted
+
+
+class _Hedge(object):
+    """A second read of the rest of a slow stream, racing the first.
+
+    Pages which either read returns from ``offset`` on are held until one of
+    the reads reaches the end of the stream. That read wins, its pages are
+    returned, and the other read is cancelled. Only the thread returning
+    results calls :meth:`add_page` and :meth:`finish`.
+
+    Attributes:
+        primary_name (str): The primary stream of the split.
+        remainder_name (str): The remainder stream of the split.
+        offset (int):
+            Offset in the original stream at which the hedge started.
+        streams (Dict[str, reader.ReadRowsStream]):
+            The stream each read is receiving messages from, to cancel.
+    """
+
+    def __init__(self, primary_name, remainder_name):
+        self.primary_name = primary_name
+        self.remainder_name = remainder_name
+        self.offset = 0
+        self.streams = {}
+        self._winner = None
+        self._pages = {_ORIGINAL: [], _HEDGED: []}
+        self._lost = {_ORIGINAL: threading.Event(), _HEDGED: threading.Event()}
+
+    def is_lost(self, contestant):
+        """Should ``contestant`` stop reading?"""
+        return self._lost[contestant].is_set()
+
+    def add_page(self, contestant, page):
+        """Hold a page of ``contestant`` until the race is decided.
+
+        Returns:
+            Sequence[Any]: Pages which can be returned now.
+        """
+        if self._winner is None:
+            self._pages[contestant].append(page)
+            return ()
+        if self._winner == contestant:
+            return (page,)
+        return ()
+
+    def finish(self, contestant, succeeded):
+        """Record that ``contestant`` stopped reading.
+
+        Args:
+            contestant (str): Which read stopped.
+            succeeded (bool): Whether it read to the end of the stream.
+
+        Returns:
+            Tuple[Sequence[Any], bool]:
+                Pages which can be returned now, and whether the stream has
+                been read to the end.
+        """
+        if self._winner is not None:
+            return (), self._winner == contestant
+
+        other = _HEDGED if contestant == _ORIGINAL else _ORIGINAL
+        self._winner = contestant if succeeded else other
+        loser = other if succeeded else contestant
+        self._lost[loser].set()
+        stream = self.streams.get(loser)
+        if stream is not None:
+            stream._cancel()
+
+        pages, self._pages = self._pages[self._winner], None
+        return pages, succeeded
+
+
+class _Scheduler(object):
+    """Hand out streams to workers, and pick streams to split or hedge.
+
+    Also keeps track of the open ReadRows calls, so that they can be
+    cancelled when the reader stops early.
+
+    Args:
+        tasks (Iterable[_StreamTask]):
+            Streams to read, in the order in which to start them.
+    """
+
+    def __init__(self, tasks):
+        self._lock = threading.Lock()
+        self._pending = collections.deque(tasks)
+        self._active = []
+        self._finished_rates = []
+        self._streams = set()
+        self._closed = False
+
+    def track(self, stream):
+        """Remember an open ReadRows call, to cancel it in :meth:`close`."""
+        with self._lock:
+            if not self._closed:
+                self._streams.add(stream)
+                return
+        stream._cancel()
+
+    def untrack(self, stream):
+        """Forget a ReadRows call which is no longer read."""
+        with self._lock:
+            self._streams.discard(stream)
+
+    def close(self):
+        """Cancel all ReadRows calls which are still open."""
+        with self._lock:
+            self._closed = True
+            streams, self._streams = self._streams, set()
+        for stream in streams:
+            stream._cancel()
+
+    def next_task(self):
+        """Start the next stream which hasn't been read yet, if any."""
+        with self._lock:
+            if not self._pending:
+                return None
+            task = self._pending.popleft()
+            task.started = time.monotonic()
+            task.start_offset = task.offset
+            self._active.append(task)
+            return task
+
+    def advance(self, task, row_count):
+        """Count rows read from a stream.
+
+        Returns:
+            Optional[_Hedge]:
+                The hedge of the stream, if the rows are part of its race.
+        """
+        with self._lock:
+            task.offset += row_count
+            return task.hedge
+
+    def finish(self, task):
+        """Mark a stream as read, rejecting any split that is not accepted."""
+        with self._lock:
+            task.finished = True
+            if task in self._active:
+                self._active.remove(task)
+                if task.hedge is None and task.started is not None:
+                    self._finished_rates.append(task.rows_per_second(time.monotonic()))
+            offer, task.split_offer = task.split_offer, None
+        if offer is not None:
+            offer.resolve(False)
+
+    def choose_victim(self):
+        """Pick the stream being read with the most work left to split."""
+        with self._lock:
+            candidates = [
+                task
+                for task in self._active
+                if task.splittable
+                and not task.splitting
+                and task.progress < _MAX_SPLIT_PROGRESS
+            ]
+            if not candidates:
+                return None
+            victim = min(candidates, key=lambda task: task.progress)
+            victim.splitting = True
+            return victim
+
+    def end_split(self, victim, remainder):
+        """Finish an attempt to split ``victim``.
+
+        Args:
+            victim (_StreamTask): The stream which was split.
+            remainder (Optional[_StreamTask]):
+                The remainder to read, or ``None`` if the split failed, in
+                which case the victim isn't split again.
+        """
+        with self._lock:
+            victim.splitting = False
+            if remainder is None:
+                victim.splittable = False
+            else:
+                self._active.append(remainder)
+
+    def offer_split(self, victim, primary_name, remainder_name):
+        """Ask the reader of ``victim`` to switch to the primary stream.
+
+        Returns:
+            Optional[_SplitOffer]:
+                The offer to wait on, or ``None`` if the victim has already
+                been read to the end.
+        """
+        with self._lock:
+            if victim.finished:
+                return None
+
+            # Each new remainder sorts before the remainders of earlier
+            # splits, as it comes from the front of what's left.
+            victim.split_count += 1
+            remainder = _StreamTask(victim.key + (-victim.split_count,), remainder_name)
+            offer = _SplitOffer(primary_name, remainder)
+            victim.split_offer = offer
+            return offer
+
+    def take_split_offer(self, task):
+        """Return the split offered to the reader of ``task``, if any."""
+        with self._lock:
+            offer, task.split_offer = task.split_offer, None
+            return offer
+
+    def choose_straggler(self):
+        """Pick the slowest stream, if it's much slower than the others.
+
+        Returns:
+            Tuple[Optional[_StreamTask], bool]:
+                The stream to hedge, if any, and whether any stream being
+                read could still need to be hedged later.
+        """
+        # Imported here, as only readers that hedge streams need it.
+        import statistics
+
+        now = time.monotonic()
+        with self._lock:
+            rates = list(self._finished_rates)
+            candidates = []
+            for task in self._active:
+                rate = task.rows_per_second(now)
+                rates.append(rate)
+                if task.hedgeable and task.hedge is None and not task.hedging:
+                    candidates.append((rate, task))
+            if not candidates:
+                return None, False
+
+            threshold = _HEDGE_SLOWDOWN * statistics.median(rates)
+            slow = [
+                (rate, task)
+                for rate, task in candidates
+                if rate < threshold and now - task.started >= _HEDGE_MIN_SECONDS
+            ]
+            if not slow:
+                return None, True
+
+            _, straggler = min(slow, key=lambda candidate: candidate[0])
+            straggler.hedging = True
+            return straggler, True
+
+    def start_hedge(self, straggler, hedge):
+        """Attach a hedge to ``straggler``, starting at its current offset.
+
+        Args:
+            straggler (_StreamTask): The stream which was split.
+            hedge (Optional[_Hedge]):
+                The hedge, or ``None`` if the split failed, in which case
+                the stream isn't hedged again.
+
+        Returns:
+            Optional[_Hedge]:
+                The hedge to read, or ``None`` if the split failed or the
+                stream has already been read to the end.
+        """
+        with self._lock:
+            straggler.hedging = False
+            if hedge is None:
+                straggler.hedgeable = False
+                return None
+            if straggler.finished:
+                return None
+
+            hedge.offset = straggler.offset
+            if straggler.stream is not None:
+                hedge.streams[_ORIGINAL] = straggler.stream
+            straggler.hedge = hedge
+            return hedge
+
+
+class _ConcurrencyController(object):
+    """Limit how many streams are read at the same time, adapting to load.
+
+    The limit grows by one stream after each interval in which the server
+    didn't throttle the read and throughput rose, and shrinks by a quarter
+    after each interval in which the throttling reported by the server rose
+    by at least ``_ADAPTIVE_THROTTLE_STEP`` percentage points, compared to
+    when the limit last shrank or to the lowest throttling since. Otherwise
+    it stays the same, so it settles at the number of streams past which
+    reading more of them at once stops paying off, and holds while the
+    server keeps reporting the same throttling.
+
+    Args:
+        maximum (int):
+            The most streams to read at the same time.
+        initial (Optional[int]):
+            The number of streams to read at the same time to begin with.
+        interval (Optional[float]):
+            Seconds between adjustments.
+    """
+
+    def __init__(
+        self, maximum, initial=_ADAPTIVE_INITIAL_STREAMS, interval=_ADAPTIVE_INTERVAL
+    ):
+        self._condition = threading.Condition()
+        self._maximum = maximum
+        self._interval = interval
+        self.limit = max(1, min(initial, maximum))
+        self._active = 0
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self._window_throttle = 0
+        self._last_throughput = None
+        self._throttle_baseline = 0
+
+    def acquire(self, stop):
+        """Wait until another stream may be read.
+
+        Returns:
+            bool: ``True``, or ``False`` if the reader was closed first.
+        """
+        with self._condition:
+            while self._active >= self.limit:
+                if stop.is_set():
+                    return False
+                self._condition.wait(_QUEUE_PUT_TIMEOUT)
+            self._active += 1
+            return True
+
+    def release(self):
+        """Stop counting a stream as being read."""
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+    def over_limit(self):
+        """Are more streams being read than the current limit allows?"""
+        with self._condition:
+            return self._active > self.limit
+
+    def record(self, message):
+        """Measure a message, adjusting the limit at the end of an interval."""
+        with self._condition:
+            self._window_bytes += message._pb.ByteSize()
+            self._window_throttle = max(
+                self._window_throttle, message.throttle_state.throttle_percent
+            )
+
+            elapsed = time.monotonic() - self._window_start
+            if elapsed < self._interval:
+                return
+
+            self._adjust(self._window_bytes / elapsed, self._window_throttle)
+            self._window_start = time.monotonic()
+            self._window_bytes = 0
+            self._window_throttle = 0
+            self._condition.notify_all()
+
+    def _adjust(self, throughput, throttle_percent):
+        """Pick the limit for the next interval.
+
+        Args:
+            throughput (float):
+                Bytes per second received during the last interval.
+            throttle_percent (int):
+                The most throttling reported during the last interval.
+        """
+        if throttle_percent >= self._throttle_baseline + _ADAPTIVE_THROTTLE_STEP:
+            self.limit = max(1, self.limit * 3 // 4)
+            self._throttle_baseline = throttle_percent
+        else:
+            self._throttle_baseline = min(self._throttle_baseline, throttle_percent)
+            if (
+                throttle_percent == 0
+                and self._active >= self.limit
+                and self.limit < self._maximum
+                and (
+                    self._last_throughput is None
+                    or throughput > self._last_throughput * (1.0 + _ADAPTIVE_MIN_GAIN)
+                )
+            ):
+                self.limit += 1
+
+        self._last_throughput = throughput
+
+
+class _StreamOrder(object):
+    """Buffer results so that they can be returned in stream order."""
+
+    def __init__(self, keys):
+        self._keys = sorted(keys)
+        self._buffered = collections.defaultdict(list)
+        self._finished = set()
+
+    def is_head(self, key):
+        """Is ``key`` the stream whose results are currently returned?"""
+        return bool(self._keys) and self._keys[0] == key
+
+    def insert(self, key):
+        """Add a stream split off from a stream which hasn't finished."""
+        bisect.insort(self._keys, key)
+
+    def buffer(self, key, value):
+        """Hold on to a result until its stream reaches the head."""
+        self._buffered[key].append(value)
+
+    def finish(self, key):
+        """Mark a stream as finished.
+
+        Returns:
+            Iterable[Any]:
+                Buffered results which can now be returned, in order.
+        """
+        self._finished.add(key)
+
+        while self._keys and self._keys[0] in self._finished:
+            self._keys.pop(0)
+            if not self._keys:
+                break
+            for value in self._buffered.pop(self._keys[0], ()):
+                yield value
+
+
+def _deliver(order, ordered, key, values):
+    """Return the results of a stream which can be returned now.
+
+    Results of streams which aren't at the head of the order are buffered.
+    """
+    if not ordered or order.is_head(key):
+        return values
+    for value in values:
+        order.buffer(key, value)
+    return ()
+
+
+def _page_to_arrow(page):
+    return page.to_arrow()
+
+
+def _page_to_ipc_message(page):
+    return page._to_ipc_message()
+
+
+def _put(results, item, stop):
+    """Put ``item`` in ``results``, giving up if the reader is closed."""
+    while not stop.is_set():
+        try:
+            results.put(item, timeout=_QUEUE_PUT_TIMEOUT)
+            return
+        except queue.Full:
+            continue
@@ -0,0 +1,379 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A local BigQuery Read API server, for testing and benchmarking offline.
+
+The server implements ``CreateReadSession``, ``ReadRows`` and
+``SplitReadStream`` over gRPC with the real protocol buffers, and serves
+synthetic rows in Avro or Arrow format. Use it to measure the transport,
+reconnect and decode paths without a live service::
+
+    from google.cloud.bigquery_storage_v1 import testing
+
+    with testing.FakeBigQueryReadServer(rows_per_stream=100000) as server:
+        client = server.make_client()
+        session = client.create_read_session(
+            parent="projects/fake",
+            read_session={"table": "projects/fake/datasets/d/tables/t"},
+            max_stream_count=4,
+        )
+        table = client.read_session(session).to_arrow()
+
+Every table has the same schema, with an ``int_col``, a ``float_col`` and a
+``string_col``. Rows are numbered across the streams of a session, and row
+``n`` has the values ``n``, ``n / 2`` and ``str(n)``.
+"""
+
+from __future__ import absolute_import
+
+import concurrent.futures
+import functools
+import itertools
+import json
+import threading
+import time
+
+try:
+    import fastavro
+except ImportError:  # pragma: NO COVER
+    fastavro = None
+import grpc
+
+try:
+    import pyarrow
+except ImportError:  # pragma: NO COVER
+    pyarrow = None
+import six
+
+from google.cloud.bigquery_storage_v1 import client
+from google.cloud.bigquery_storage_v1 import types
+from google.cloud.bigquery_storage_v1.services.big_query_read import transports
+
+
+_SERVICE_NAME = "google.cloud.bigquery.storage.v1.BigQueryRead"
+
+# Number of encoded pages to keep, so that the server spends less time
+# encoding when the same rows are read again.
+_PAGE_CACHE_SIZE = 1024
+
+_AVRO_SCHEMA = {
+    "type": "record",
+    "name": "__root__",
+    "fields": [
+        {"name": "int_col", "type": ["null", "long"]},
+        {"name": "float_col", "type": ["null", "double"]},
+        {"name": "string_col", "type": ["null", "string"]},
+    ],
+}
+
+
+class FakeBigQueryReadServer(object):
+    """A BigQuery Read API server running on a local port.
+
+    Args:
+        stream_count (Optional[int]):
+            Number of streams in each read session, unless the request
+            asks for fewer with ``max_stream_count``.
+        rows_per_stream (Optional[int]):
+            Number of rows in each stream.
+        rows_per_page (Optional[int]):
+            Maximum number of rows in each ``ReadRowsResponse``.
+        latency (Optional[float]):
+            Seconds to wait before sending each page.
+        bandwidth (Optional[float]):
+            Maximum bytes per second to send on each stream. Not limited if
+            ``None``.
+        throttle_percent (Optional[int]):
+            Throttle state reported with each page.
+        error_after_pages (Optional[int]):
+            If set, fail each ``ReadRows`` call after sending this many
+            pages, until ``errors_per_stream`` errors have been sent for
+            the stream.
+        errors_per_stream (Optional[int]):
+            Number of errors to inject into each stream.
+        error_code (Optional[grpc.StatusCode]):
+            Status of injected errors. Defaults to ``UNAVAILABLE``, which
+            clients reconnect after.
+        error_message (Optional[str]):
+            Details of injected errors.
+        max_workers (Optional[int]):
+            Number of threads to handle calls with. Each open stream uses a
+            thread.
+    """
+
+    def __init__(
+        self,
+        stream_count=4,
+        rows_per_stream=10000,
+        rows_per_page=1000,
+        latency=0.0,
+        bandwidth=None,
+        throttle_percent=0,
+        error_after_pages=None,
+        errors_per_stream=1,
+        error_code=grpc.StatusCode.UNAVAILABLE,
+        error_message="injected error",
+        max_workers=64,
+    ):
+        self._stream_count = stream_count
+        self._rows_per_stream = rows_per_stream
+        self._rows_per_page = rows_per_page
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self._throttle_percent = throttle_percent
+        self._error_after_pages = error_after_pages
+        self._errors_per_stream = errors_per_stream
+        self._error_code = error_code
+        self._error_message = error_message
+        self._max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._session_ids = itertools.count()
+        self._streams = {}
+        self._errors_sent = {}
+        self._encode_page = functools.lru_cache(maxsize=_PAGE_CACHE_SIZE)(_encode_page)
+        self._server = None
+        self.address = None
+
+    def start(self):
+        """Start serving on a free local port.
+
+        Returns:
+            str: The address of the server, such as ``"localhost:12345"``.
+        """
+        handler = grpc.method_handlers_generic_handler(
+            _SERVICE_NAME,
+            {
+                "CreateReadSession": grpc.unary_unary_rpc_method_handler(
+                    self._create_read_session,
+                    request_deserializer=types.CreateReadSessionRequest.deserialize,
+                    response_serializer=types.ReadSession.serialize,
+                ),
+                "ReadRows": grpc.unary_stream_rpc_method_handler(
+                    self._read_rows,
+                    request_deserializer=types.ReadRowsRequest.deserialize,
+                    response_serializer=types.ReadRowsResponse.serialize,
+                ),
+                "SplitReadStream": grpc.unary_unary_rpc_method_handler(
+                    self._split_read_stream,
+                    request_deserializer=types.SplitReadStreamRequest.deserialize,
+                    response_serializer=types.SplitReadStreamResponse.serialize,
+                ),
+            },
+        )
+        self._server = grpc.server(
+            concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers),
+            handlers=(handler,),
+            options=(("grpc.max_send_message_length", -1),),
+        )
+        port = self._server.add_insecure_port("localhost:0")
+        self._server.start()
+        self.address = "localhost:{}".format(port)
+        return self.address
+
+    def stop(self):
+        """Stop the server, cancelling any calls in progress."""
+        if self._server is not None:
+            self._server.stop(None)
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def make_client(self, channel_options=()):
+        """Create a client connected to this server.
+
+        Args:
+            channel_options (Optional[Sequence[Tuple[str, Any]]]):
+                gRPC channel arguments to use.
+
+        Returns:
+            ~google.cloud.bigquery_storage_v1.client.BigQueryReadClient:
+                A client which sends requests to this server.
+        """
+        channel = grpc.insecure_channel(self.address, options=channel_options)
+        return client.BigQueryReadClient(
+            transport=transports.BigQueryReadGrpcTransport(channel=channel)
+        )
+
+    def _create_read_session(self, request, context):
+        data_format = request.read_session.data_format
+        if data_format == types.DataFormat.DATA_FORMAT_UNSPECIFIED:
+            data_format = types.DataFormat.AVRO
+
+        stream_count = self._stream_count
+        if request.max_stream_count:
+            stream_count = min(stream_count, request.max_stream_count)
+
+        session_name = "projects/fake/locations/local/sessions/{}".format(
+            next(self._session_ids)
+        )
+        stream_names = [
+            "{}/streams/{}".format(session_name, index) for index in range(stream_count)
+        ]
+        with self._lock:
+            for index, name in enumerate(stream_names):
+                start = index * self._rows_per_stream
+                self._streams[name] = _FakeStream(
+                    data_format, start, start + self._rows_per_stream
+                )
+
+        read_session = types.ReadSession(
+            name=session_name,
+            table=request.read_session.table,
+            data_format=data_format,
+            streams=[{"name": name} for name in stream_names],
+        )
+        if data_format == types.DataFormat.ARROW:
+            read_session.arrow_schema.serialized_schema = (
+                _arrow_schema().serialize().to_pybytes()
+            )
+        else:
+            read_session.avro_schema.schema = json.dumps(_AVRO_SCHEMA)
+        return read_session
+
+    def _read_rows(self, request, context):
+        stream = self._get_stream(request.read_stream, context)
+        if request.offset > stream.end - stream.start:
+            context.abort(
+                grpc.StatusCode.FAILED_PRECONDITION, "Offset is past the end."
+            )
+
+        total_rows = stream.total_rows
+        row = stream.start + request.offset
+        pages_sent = 0
+        while row < stream.end:
+            if pages_sent == self._error_after_pages and self._take_error(
+                request.read_stream
+            ):
+                context.abort(self._error_code, self._error_message)
+
+            if self._latency:
+                time.sleep(self._latency)
+
+            row_count = min(self._rows_per_page, stream.end - row)
+            message = types.ReadRowsResponse(row_count=row_count)
+            message.stats.progress.at_response_start = (row - stream.start) / total_rows
+            message.stats.progress.at_response_end = (
+                row + row_count - stream.start
+            ) / total_rows
+            message.throttle_state.throttle_percent = self._throttle_percent
+            payload = self._encode_page(stream.data_format, row, row_count)
+            if stream.data_format == types.DataFormat.ARROW:
+                message.arrow_record_batch.serialized_record_batch = payload
+            else:
+                message.avro_rows.serialized_binary_rows = payload
+
+            yield message
+            pages_sent += 1
+            row += row_count
+
+            if self._bandwidth:
+                time.sleep(len(payload) / float(self._bandwidth))
+
+    def _split_read_stream(self, request, context):
+        stream = self._get_stream(request.name, context)
+        split = stream.start + int((stream.end - stream.start) * request.fraction)
+        if not stream.start < split < stream.end:
+            return types.SplitReadStreamResponse()
+
+        primary_name = "{}/primary".format(request.name)
+        remainder_name = "{}/remainder".format(request.name)
+        with self._lock:
+            self._streams[primary_name] = _FakeStream(
+                stream.data_format, stream.start, split
+            )
+            self._streams[remainder_name] = _FakeStream(
+                stream.data_format, split, stream.end
+            )
+        return types.SplitReadStreamResponse(
+            primary_stream={"name": primary_name},
+            remainder_stream={"name": remainder_name},
+        )
+
+    def _get_stream(self, name, context):
+        with self._lock:
+            stream = self._streams.get(name)
+        if stream is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, "No stream {}.".format(name))
+        return stream
+
+    def _take_error(self, stream_name):
+        """Count an error to inject, if the stream has any left."""
+        with self._lock:
+            sent = self._errors_sent.get(stream_name, 0)
+            if sent >= self._errors_per_stream:
+                return False
+            self._errors_sent[stream_name] = sent + 1
+            return True
+
+
+class _FakeStream(object):
+    """The rows ``[start, end)`` of a session, served in ``data_format``.
+
+    Splitting a stream adds a primary and a remainder stream, and leaves
+    the original stream as it was, so it can still be read to its end.
+    """
+
+    def __init__(self, data_format, start, end):
+        self.data_format = data_format
+        self.start = start
+        self.end = end
+
+    @property
+    def total_rows(self):
+        return max(1, self.end - self.start)
+
+
+def _arrow_schema():
+    return pyarrow.schema(
+        [
+            pyarrow.field("int_col", pyarrow.int64()),
+            pyarrow.field("float_col", pyarrow.float64()),
+            pyarrow.field("string_col", pyarrow.string()),
+        ]
+    )
+
+
+def _encode_page(data_format, first_row, row_count):
+    """Serialize rows ``first_row`` to ``first_row + row_count``.
+
+    Returns:
+        bytes: A serialized Arrow record batch or Avro rows.
+    """
+    numbers = range(first_row, first_row + row_count)
+    if data_format == types.DataFormat.ARROW:
+        record_batch = pyarrow.RecordBatch.from_arrays(
+            [
+                pyarrow.array(numbers, type=pyarrow.int64()),
+                pyarrow.array([number / 2.0 for number in numbers]),
+                pyarrow.array([str(number) for number in numbers]),
+            ],
+            schema=_arrow_schema(),
+        )
+        return record_batch.serialize().to_pybytes()
+
+    schema = fastavro.parse_schema(_AVRO_SCHEMA)
+    blockio = six.BytesIO()
+    for number in numbers:
+        fastavro.schemaless_writer(
+            blockio,
+            schema,
+            {"int_col": number, "float_col": number / 2.0, "string_col": str(number)},
+        )
+    return blockio.getvalue()
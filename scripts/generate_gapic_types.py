@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Write the table of types in google/cloud/bigquery_storage_v1/gapic_types.py.
+
+Finds every protobuf message and enum class in the generated types modules,
+and in the shared protobuf modules they use, and writes their names and
+modules between the ``BEGIN GENERATED TYPES`` and ``END GENERATED TYPES``
+comments. Run it after regenerating the library::
+
+    python scripts/generate_gapic_types.py
+
+With ``--check``, exits with status 1 if the table is out of date instead.
+"""
+
+import argparse
+import importlib
+import inspect
+import os
+import pkgutil
+import re
+import sys
+
+import proto
+
+from google.protobuf import message as protobuf_message
+
+
+_GAPIC_TYPES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "google",
+    "cloud",
+    "bigquery_storage_v1",
+    "gapic_types.py",
+)
+_LOCAL_PACKAGE = "google.cloud.bigquery_storage_v1.types"
+_SHARED_MODULES = ("google.protobuf.timestamp_pb2",)
+
+_TABLE_PATTERN = re.compile(
+    r"(# BEGIN GENERATED TYPES\n).*?(# END GENERATED TYPES\n)", re.DOTALL
+)
+
+
+# The current api core helper does not find new proto messages of type proto.Message,
+# thus we need our own helper. Adjusted from
+# https://github.com/googleapis/python-api-core/blob/8595f620e7d8295b6a379d6fd7979af3bef717e2/google/api_core/protobuf_helpers.py#L101-L118
+def _get_protobuf_messages(module):
+    """Discover all protobuf Message classes in a given import module.
+
+    Args:
+        module (module): A Python module; :func:`dir` will be run against this
+            module to find Message subclasses.
+
+    Returns:
+        List[str]: The names of the Message and Enum subclasses.
+    """
+    answer = []
+    for name in dir(module):
+        candidate = getattr(module, name)
+        if inspect.isclass(candidate) and issubclass(
+            candidate, (proto.Enum, proto.Message, protobuf_message.Message)
+        ):
+            answer.append(name)
+    return answer
+
+
+def find_types():
+    """Map each type name to the module which defines it."""
+    local_package = importlib.import_module(_LOCAL_PACKAGE)
+    local_modules = [
+        "{}.{}".format(_LOCAL_PACKAGE, info.name)
+        for info in pkgutil.iter_modules(local_package.__path__)
+    ]
+
+    types = {}
+    for module_name in list(_SHARED_MODULES) + sorted(local_modules):
+        module = importlib.import_module(module_name)
+        for name in _get_protobuf_messages(module):
+            # Modules also import the types they use from other modules.
+            if getattr(module, name).__module__ == module_name:
+                types[name] = module_name
+    return types
+
+
+def render_table(types):
+    lines = ["_TYPES = {\n"]
+    for name in sorted(types):
+        lines.append('    "{}": "{}",\n'.format(name, types[name]))
+    lines.append("}\n")
+    return "".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit with status 1 if the table is out of date, without writing it.",
+    )
+    args = parser.parse_args()
+
+    with open(_GAPIC_TYPES_PATH) as source_file:
+        source = source_file.read()
+    table = render_table(find_types())
+    updated = _TABLE_PATTERN.sub(
+        lambda match: match.group(1) + table + match.group(2), source
+    )
+
+    if updated == source:
+        return
+    if args.check:
+        print("{} is out of date.".format(_GAPIC_TYPES_PATH))
+        sys.exit(1)
+    with open(_GAPIC_TYPES_PATH, "w") as source_file:
+        source_file.write(updated)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,6 @@ import setuptools
 
 name = "google-cloud-bigquery-storage"
 description = "BigQuery Storage API API client library"
-version = "2.0.0"
 release_status = "Development Status :: 5 - Production/Stable"
 dependencies = [
     "google-api-core[grpc] >= 1.22.2, < 2.0.0dev",
@@ -36,6 +35,15 @@ extras = {
 
 package_root = os.path.abspath(os.path.dirname(__file__))
 
+# The version is read from the package rather than from the installed
+# distribution, so that importing the library doesn't need pkg_resources.
+version = {}
+with open(
+    os.path.join(package_root, "google/cloud/bigquery_storage_v1/version.py")
+) as fp:
+    exec(fp.read(), version)
+version = version["__version__"]
+
 readme_filename = os.path.join(package_root, "README.rst")
 with io.open(readme_filename, encoding="utf-8") as readme_file:
     readme = readme_file.read()
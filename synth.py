@@ -103,20 +103,11 @@ s.replace(
     "from google.cloud.bigquery_storage_v1 import"
 )
 
-# We also don't want to expose the async client just yet, at least not until
-# it is wrapped in its own manual client class.
+# Likewise, expose the hand written async client instead of the generated one.
 s.replace(
     "google/cloud/bigquery_storage/__init__.py",
-    (
-        r"from google\.cloud\.bigquery_storage_v1\.services.big_query_read.async_client "
-        r"import BigQueryReadAsyncClient\n"
-    ),
-    "",
-)
-s.replace(
-    "google/cloud/bigquery_storage/__init__.py",
-   r"""["']BigQueryReadAsyncClient["'],\n""",
-    "",
+    r"from google\.cloud\.bigquery_storage_v1\.services.big_query_read.async_client import",
+    "from google.cloud.bigquery_storage_v1 import"
 )
 
 # We want types and __version__ to be accessible through the "main" library
@@ -195,7 +186,71 @@ s.replace(
     '--cov=tests/unit',
 )
 
+# Take the client version from the package instead of looking up the installed
+# distribution with pkg_resources, which is slow to import.
+for path in (
+    "google/cloud/bigquery_storage_v1/services/big_query_read/client.py",
+    "google/cloud/bigquery_storage_v1/services/big_query_read/async_client.py",
+    "google/cloud/bigquery_storage_v1/services/big_query_read/transports/base.py",
+):
+    s.replace(
+        path,
+        r"import pkg_resources\n",
+        "from google.cloud.bigquery_storage_v1 import version as package_version\n",
+    )
+    s.replace(
+        path,
+        (
+            r"try:\n"
+            r"    DEFAULT_CLIENT_INFO = gapic_v1\.client_info\.ClientInfo\(\n"
+            r"        gapic_version=pkg_resources\.get_distribution\(\n"
+            r"            \"google-cloud-bigquery-storage\",\n"
+            r"        \)\.version,\n"
+            r"    \)\n"
+            r"except pkg_resources\.DistributionNotFound:\n"
+            r"    DEFAULT_CLIENT_INFO = gapic_v1\.client_info\.ClientInfo\(\)\n"
+        ),
+        (
+            "DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(\n"
+            "    gapic_version=package_version.__version__,\n"
+            ")\n"
+        ),
+    )
+
+# distutils imports setuptools, and with it pkg_resources, on recent versions of
+# Python. Accept the same values as distutils.util.strtobool.
+s.replace(
+    "google/cloud/bigquery_storage_v1/services/big_query_read/client.py",
+    r"from distutils import util\n",
+    "",
+)
+s.replace(
+    "google/cloud/bigquery_storage_v1/services/big_query_read/client.py",
+    (
+        r"use_client_cert = bool\(\n"
+        r"\s+util\.strtobool\(os\.getenv\(\"GOOGLE_API_USE_CLIENT_CERTIFICATE\", \"false\"\)\)\n"
+        r"\s+\)\n"
+    ),
+    (
+        'use_client_cert = os.getenv("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false")\n'
+        "        use_client_cert = use_client_cert.lower()\n"
+        '        if use_client_cert in ("y", "yes", "t", "true", "on", "1"):\n'
+        "            use_client_cert = True\n"
+        '        elif use_client_cert in ("n", "no", "f", "false", "off", "0"):\n'
+        "            use_client_cert = False\n"
+        "        else:\n"
+        "            raise ValueError(\n"
+        '                "Environment variable `GOOGLE_API_USE_CLIENT_CERTIFICATE` "\n'
+        '                "must be one of `true`, `t`, `yes`, `y`, `on`, `1`, "\n'
+        '                "`false`, `f`, `no`, `n`, `off` or `0`"\n'
+        "            )\n"
+    ),
+)
+
 # TODO(busunkim): Use latest sphinx after microgenerator transition
 s.replace("noxfile.py", """['"]sphinx['"]""", '"sphinx<3.0.0"')
 
+# List the generated types in gapic_types.py, which looks them up on first use.
+s.shell.run(["python", "scripts/generate_gapic_types.py"], hide_output=False)
+
 s.shell.run(["nox", "-s", "blacken"], hide_output=False)
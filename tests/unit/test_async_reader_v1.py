@@ -0,0 +1,378 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import fastavro
+import mock
+import pandas
+import pandas.testing
+import pyarrow
+import pytest
+import six
+
+import google.api_core.exceptions
+from google.cloud.bigquery_storage import types
+
+
+AVRO_SCHEMA = {
+    "type": "record",
+    "name": "__root__",
+    "fields": [{"name": "int_col", "type": ["null", "long"]}],
+}
+ARROW_SCHEMA = pyarrow.schema([pyarrow.field("int_col", pyarrow.int64())])
+BLOCKS = [[{"int_col": 1}, {"int_col": 2}], [{"int_col": 3}]]
+
+
+@pytest.fixture()
+def mut():
+    from google.cloud.bigquery_storage_v1 import async_reader
+
+    return async_reader
+
+
+@pytest.fixture()
+def class_under_test(mut):
+    return mut.AsyncReadRowsStream
+
+
+@pytest.fixture()
+def mock_gapic_client():
+    from google.cloud.bigquery_storage_v1.services import big_query_read
+
+    return mock.create_autospec(big_query_read.BigQueryReadAsyncClient)
+
+
+def _generate_read_session(data_format):
+    if data_format == "avro":
+        return types.ReadSession(avro_schema={"schema": json.dumps(AVRO_SCHEMA)})
+    return types.ReadSession(
+        arrow_schema={"serialized_schema": ARROW_SCHEMA.serialize().to_pybytes()}
+    )
+
+
+def _bq_to_avro_blocks(bq_blocks):
+    avro_schema = fastavro.parse_schema(AVRO_SCHEMA)
+    avro_blocks = []
+    for block in bq_blocks:
+        blockio = six.BytesIO()
+        for row in block:
+            fastavro.schemaless_writer(blockio, avro_schema, row)
+        response = types.ReadRowsResponse()
+        response.row_count = len(block)
+        response.avro_rows.serialized_binary_rows = blockio.getvalue()
+        avro_blocks.append(response)
+    return avro_blocks
+
+
+def _bq_to_arrow_batches(bq_blocks):
+    arrow_batches = []
+    for block in bq_blocks:
+        record_batch = pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array([row["int_col"] for row in block], type=pyarrow.int64())],
+            schema=ARROW_SCHEMA,
+        )
+        response = types.ReadRowsResponse()
+        response.row_count = len(block)
+        response.arrow_record_batch.serialized_record_batch = (
+            record_batch.serialize().to_pybytes()
+        )
+        arrow_batches.append(response)
+    return arrow_batches
+
+
+async def _aiter(messages, exc=None):
+    for message in messages:
+        yield message
+    if exc is not None:
+        raise exc
+
+
+async def _open(messages):
+    """Mimic the GAPIC client, which returns a coroutine that opens the call."""
+    return _aiter(messages)
+
+
+async def _collect(aiterable):
+    return [item async for item in aiterable]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data_format", ["avro", "arrow"])
+async def test_rows(class_under_test, mock_gapic_client, data_format):
+    read_session = _generate_read_session(data_format)
+    if data_format == "avro":
+        messages = _bq_to_avro_blocks(BLOCKS)
+    else:
+        messages = _bq_to_arrow_batches(BLOCKS)
+    reader = class_under_test(_open(messages), mock_gapic_client, "", 0, {})
+
+    got = await _collect(reader.rows(read_session))
+
+    assert got == [{"int_col": 1}, {"int_col": 2}, {"int_col": 3}]
+    mock_gapic_client.read_rows.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_rows_w_row_type(mut, class_under_test, mock_gapic_client):
+    from google.cloud.bigquery_storage_v1 import reader
+
+    read_session = _generate_read_session("arrow")
+    messages = _bq_to_arrow_batches(BLOCKS)
+    stream = class_under_test(_aiter(messages), mock_gapic_client, "", 0, {})
+
+    got = await _collect(stream.rows(read_session, row_type=reader.Row))
+
+    assert [row.int_col for row in got] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_to_arrow_w_reconnect(class_under_test, mock_gapic_client):
+    read_session = _generate_read_session("arrow")
+    messages = _bq_to_arrow_batches(BLOCKS)
+    first = _aiter(
+        messages[:1], google.api_core.exceptions.ServiceUnavailable("try again")
+    )
+    mock_gapic_client.read_rows.return_value = _open(messages[1:])
+    reader = class_under_test(
+        first, mock_gapic_client, "teststream", 0, {"metadata": {"test-key": "val"}}
+    )
+
+    table = await reader.to_arrow(read_session)
+
+    assert table.column("int_col").to_pylist() == [1, 2, 3]
+    mock_gapic_client.read_rows.assert_called_once_with(
+        read_stream="teststream", offset=2, metadata={"test-key": "val"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_to_arrow_w_resumable_internal_error(class_under_test, mock_gapic_client):
+    read_session = _generate_read_session("avro")
+    messages = _bq_to_avro_blocks(BLOCKS)
+    first = _aiter(
+        messages[:1],
+        google.api_core.exceptions.InternalServerError(
+            "INTERNAL: Received RST_STREAM with error code 2."
+        ),
+    )
+    mock_gapic_client.read_rows.return_value = _aiter(messages[1:])
+    reader = class_under_test(first, mock_gapic_client, "teststream", 0, {})
+
+    table = await reader.to_arrow(read_session)
+
+    assert table.column("int_col").to_pylist() == [1, 2, 3]
+    mock_gapic_client.read_rows.assert_called_once_with(
+        read_stream="teststream", offset=2
+    )
+
+
+@pytest.mark.asyncio
+async def test_to_arrow_w_nonresumable_internal_error(
+    class_under_test, mock_gapic_client
+):
+    read_session = _generate_read_session("avro")
+    first = _aiter(
+        _bq_to_avro_blocks(BLOCKS),
+        google.api_core.exceptions.InternalServerError("nope"),
+    )
+    reader = class_under_test(first, mock_gapic_client, "teststream", 0, {})
+
+    with pytest.raises(google.api_core.exceptions.InternalServerError, match="nope"):
+        await reader.to_arrow(read_session)
+
+    mock_gapic_client.read_rows.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_to_arrow_w_empty_stream(class_under_test, mock_gapic_client):
+    read_session = _generate_read_session("arrow")
+    reader = class_under_test(_aiter([]), mock_gapic_client, "", 0, {})
+
+    table = await reader.to_arrow(read_session)
+
+    assert table.num_rows == 0
+    assert table.schema.names == ["int_col"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data_format", ["avro", "arrow"])
+async def test_to_dataframe(class_under_test, mock_gapic_client, data_format):
+    read_session = _generate_read_session(data_format)
+    if data_format == "avro":
+        messages = _bq_to_avro_blocks(BLOCKS)
+    else:
+        messages = _bq_to_arrow_batches(BLOCKS)
+    reader = class_under_test(_aiter(messages), mock_gapic_client, "", 0, {})
+
+    df = await reader.to_dataframe(read_session, dtypes={"int_col": "float32"})
+
+    expected = pandas.DataFrame({"int_col": pandas.Series([1, 2, 3], dtype="float32")})
+    pandas.testing.assert_frame_equal(df.reset_index(drop=True), expected)
+
+
+@pytest.mark.asyncio
+async def test_to_dataframe_w_avro_without_pyarrow(
+    mut, class_under_test, mock_gapic_client, monkeypatch
+):
+    from google.cloud.bigquery_storage_v1 import reader as reader_module
+
+    monkeypatch.setattr(mut, "pyarrow", None)
+    monkeypatch.setattr(reader_module, "pyarrow", None)
+    read_session = _generate_read_session("avro")
+    messages = _bq_to_avro_blocks(BLOCKS)
+    reader = class_under_test(_aiter(messages), mock_gapic_client, "", 0, {})
+
+    df = await reader.to_dataframe(read_session)
+
+    assert df["int_col"].tolist() == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_client_read_rows_wraps_gapic_stream(monkeypatch):
+    from google.cloud import bigquery_storage
+    from google.cloud.bigquery_storage_v1 import async_reader
+    from google.cloud.bigquery_storage_v1.services import big_query_read
+
+    messages = _bq_to_arrow_batches(BLOCKS)
+    gapic_read_rows = mock.Mock(return_value=_open(messages))
+    monkeypatch.setattr(
+        big_query_read.BigQueryReadAsyncClient, "read_rows", gapic_read_rows
+    )
+    client = bigquery_storage.BigQueryReadAsyncClient.__new__(
+        bigquery_storage.BigQueryReadAsyncClient
+    )
+
+    stream = client.read_rows("teststream", offset=4)
+
+    assert isinstance(stream, async_reader.AsyncReadRowsStream)
+    assert len(await _collect(stream)) == len(BLOCKS)
+    gapic_read_rows.assert_called_once_with(
+        read_stream="teststream", offset=4, retry=mock.ANY, timeout=None, metadata=(),
+    )
+
+
+def _fake_read_rows(mock_gapic_client, messages_by_stream):
+    def read_rows(read_stream=None, offset=0, **kwargs):
+        return _open(messages_by_stream[read_stream][offset:])
+
+    mock_gapic_client.read_rows.side_effect = read_rows
+
+
+def _session_w_streams(names):
+    read_session = _generate_read_session("arrow")
+    read_session.streams.extend(types.ReadStream(name=name) for name in names)
+    return read_session
+
+
+@pytest.mark.asyncio
+async def test_read_session_batches(mut, mock_gapic_client):
+    names = ["a", "b", "c"]
+    read_session = _session_w_streams(names)
+    _fake_read_rows(
+        mock_gapic_client,
+        {
+            "a": _bq_to_arrow_batches([[{"int_col": 1}], [{"int_col": 2}]]),
+            "b": _bq_to_arrow_batches([[{"int_col": 3}]]),
+            "c": _bq_to_arrow_batches([[{"int_col": 4}, {"int_col": 5}]]),
+        },
+    )
+
+    batches = await _collect(
+        mut.read_session_batches(
+            mock_gapic_client,
+            read_session,
+            concurrency=2,
+            read_rows_kwargs={"metadata": ()},
+        )
+    )
+
+    got = sorted(value for batch in batches for value in batch.column(0).to_pylist())
+    assert got == [1, 2, 3, 4, 5]
+    assert (
+        sorted(
+            call[1]["read_stream"]
+            for call in mock_gapic_client.read_rows.call_args_list
+        )
+        == names
+    )
+    mock_gapic_client.read_rows.assert_any_call(read_stream="a", offset=0, metadata=())
+
+
+@pytest.mark.asyncio
+async def test_read_session_batches_w_empty_session(mut, mock_gapic_client):
+    read_session = _session_w_streams([])
+
+    assert (
+        await _collect(mut.read_session_batches(mock_gapic_client, read_session)) == []
+    )
+    mock_gapic_client.read_rows.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_read_session_batches_w_error(mut, mock_gapic_client):
+    read_session = _session_w_streams(["a", "b"])
+
+    def read_rows(read_stream=None, offset=0, **kwargs):
+        if read_stream == "b":
+            return _aiter([], google.api_core.exceptions.InternalServerError("nope"))
+        return _aiter(_bq_to_arrow_batches([[{"int_col": 1}]]))
+
+    mock_gapic_client.read_rows.side_effect = read_rows
+
+    with pytest.raises(google.api_core.exceptions.InternalServerError, match="nope"):
+        await _collect(mut.read_session_batches(mock_gapic_client, read_session))
+
+
+@pytest.mark.asyncio
+async def test_read_session_batches_stops_streams_when_closed(mut, mock_gapic_client):
+    read_session = _session_w_streams(["a", "b"])
+    _fake_read_rows(
+        mock_gapic_client,
+        {
+            name: _bq_to_arrow_batches([[{"int_col": value}] for value in range(10)])
+            for name in ("a", "b")
+        },
+    )
+
+    batches = mut.read_session_batches(mock_gapic_client, read_session, concurrency=1)
+    first = await batches.__anext__()
+    await batches.aclose()
+
+    assert first.num_rows == 1
+    mock_gapic_client.read_rows.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_client_read_session_batches(monkeypatch):
+    from google.cloud import bigquery_storage
+    from google.cloud.bigquery_storage_v1.services import big_query_read
+
+    messages = _bq_to_arrow_batches(BLOCKS)
+    gapic_read_rows = mock.Mock(return_value=_open(messages))
+    monkeypatch.setattr(
+        big_query_read.BigQueryReadAsyncClient, "read_rows", gapic_read_rows
+    )
+    client = bigquery_storage.BigQueryReadAsyncClient.__new__(
+        bigquery_storage.BigQueryReadAsyncClient
+    )
+
+    batches = await _collect(
+        client.read_session_batches(_session_w_streams(["a"]), concurrency=4)
+    )
+
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    gapic_read_rows.assert_called_once_with(
+        read_stream="a", offset=0, retry=mock.ANY, timeout=None, metadata=()
+    )
@@ -0,0 +1,253 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import decimal
+
+import fastavro
+import pytest
+import six
+
+
+NUMERIC = {"type": "bytes", "logicalType": "decimal", "precision": 38, "scale": 9}
+BIGNUMERIC = {"type": "bytes", "logicalType": "decimal", "precision": 77, "scale": 38}
+SCHEMA = {
+    "type": "record",
+    "name": "__root__",
+    "fields": [
+        {"name": "int_col", "type": ["null", "long"]},
+        {"name": "float_col", "type": ["null", "double"]},
+        {"name": "float32_col", "type": "float"},
+        {"name": "bool_col", "type": ["null", "boolean"]},
+        {"name": "str_col", "type": ["null", "string"]},
+        {"name": "bytes_col", "type": ["null", "bytes"]},
+        {"name": "num_col", "type": ["null", NUMERIC]},
+        {"name": "bignum_col", "type": ["null", BIGNUMERIC]},
+        {"name": "date_col", "type": ["null", {"type": "int", "logicalType": "date"}]},
+        {
+            "name": "time_col",
+            "type": ["null", {"type": "long", "logicalType": "time-micros"}],
+        },
+        {
+            "name": "ts_col",
+            "type": ["null", {"type": "long", "logicalType": "timestamp-micros"}],
+        },
+        {
+            "name": "datetime_col",
+            "type": ["null", {"type": "string", "sqlType": "DATETIME"}],
+        },
+        {"name": "ints", "type": {"type": "array", "items": "long"}},
+        {
+            "name": "struct_col",
+            "type": [
+                {
+                    "type": "record",
+                    "name": "__struct_col",
+                    "fields": [
+                        {"name": "sub_num", "type": NUMERIC},
+                        {
+                            "name": "sub_dates",
+                            "type": {
+                                "type": "array",
+                                "items": {"type": "int", "logicalType": "date"},
+                            },
+                        },
+                    ],
+                },
+                "null",
+            ],
+        },
+    ],
+}
+ROWS = [
+    {
+        "int_col": 123,
+        "float_col": 3.14,
+        "float32_col": 0.5,
+        "bool_col": True,
+        "str_col": u"こんにちは世界",
+        "bytes_col": b"\xbb\xee\xff",
+        "num_col": decimal.Decimal("-9.99"),
+        "bignum_col": decimal.Decimal("1234567890.0123456789"),
+        "date_col": datetime.date(1998, 9, 4),
+        "time_col": datetime.time(23, 59, 59, 999999),
+        "ts_col": datetime.datetime(
+            1965, 4, 3, 2, 1, 0, 123456, tzinfo=datetime.timezone.utc
+        ),
+        "datetime_col": "2000-01-01T05:00:00",
+        "ints": list(range(-70, 70)),
+        "struct_col": {
+            "sub_num": decimal.Decimal("0.5"),
+            "sub_dates": [datetime.date(1970, 1, 1)],
+        },
+    },
+    {
+        "int_col": -(2 ** 63),
+        "float_col": None,
+        "float32_col": -2.0,
+        "bool_col": None,
+        "str_col": None,
+        "bytes_col": None,
+        "num_col": None,
+        "bignum_col": None,
+        "date_col": None,
+        "time_col": None,
+        "ts_col": None,
+        "datetime_col": None,
+        "ints": [],
+        "struct_col": None,
+    },
+    {
+        "int_col": 2 ** 63 - 1,
+        "float_col": -0.0,
+        "float32_col": 1.0,
+        "bool_col": False,
+        "str_col": "",
+        "bytes_col": b"",
+        "num_col": decimal.Decimal("99999999999999999999999999999.999999999"),
+        "bignum_col": decimal.Decimal("-0.00000000000000000000000000000000000001"),
+        "date_col": datetime.date(1, 1, 1),
+        "time_col": datetime.time(0, 0),
+        "ts_col": datetime.datetime(9999, 12, 31, tzinfo=datetime.timezone.utc),
+        "datetime_col": "9999-12-31T23:59:59.999999",
+        "ints": [2 ** 62],
+        "struct_col": {"sub_num": decimal.Decimal(0), "sub_dates": []},
+    },
+]
+COLUMN_NAMES = [field["name"] for field in SCHEMA["fields"]]
+
+
+@pytest.fixture()
+def mut():
+    from google.cloud.bigquery_storage_v1 import _avro
+
+    return _avro
+
+
+def _encode(rows, schema=SCHEMA):
+    parsed = fastavro.parse_schema(schema)
+    blockio = six.BytesIO()
+    for row in rows:
+        fastavro.schemaless_writer(blockio, parsed, row)
+    return blockio.getvalue()
+
+
+def _fastavro_rows(buf, row_count, schema=SCHEMA):
+    parsed = fastavro.parse_schema(schema)
+    blockio = six.BytesIO(buf)
+    return [fastavro.schemaless_reader(blockio, parsed) for _ in range(row_count)]
+
+
+def test_columns_match_fastavro(mut):
+    buf = _encode(ROWS)
+    expected = _fastavro_rows(buf, len(ROWS))
+
+    columns = mut.compile_decoder(SCHEMA, layout=mut.COLUMNS)(buf, len(ROWS))
+
+    assert columns == [[row[name] for row in expected] for name in COLUMN_NAMES]
+    assert columns == [[row[name] for row in ROWS] for name in COLUMN_NAMES]
+
+
+def test_dicts_match_fastavro(mut):
+    buf = _encode(ROWS)
+    expected = _fastavro_rows(buf, len(ROWS))
+
+    rows = mut.compile_decoder(SCHEMA, layout=mut.DICTS)(buf, len(ROWS))
+
+    assert rows == expected
+    assert [list(row) for row in rows] == [COLUMN_NAMES] * len(ROWS)
+
+
+def test_tuples_match_fastavro(mut):
+    buf = _encode(ROWS)
+    expected = _fastavro_rows(buf, len(ROWS))
+
+    rows = mut.compile_decoder(SCHEMA, layout=mut.TUPLES)(buf, len(ROWS))
+
+    assert rows == [tuple(row.values()) for row in expected]
+
+
+@pytest.mark.parametrize("layout", ["columns", "dicts", "tuples"])
+def test_record_wo_fields(mut, layout):
+    schema = {"type": "record", "name": "__root__", "fields": []}
+
+    decoded = mut.compile_decoder(schema, layout=layout)(b"", 2)
+
+    assert decoded == {"columns": [], "dicts": [{}, {}], "tuples": [(), ()]}[layout]
+
+
+def test_columns_w_raw_logical_types(mut):
+    buf = _encode(ROWS[:2])
+
+    columns = mut.compile_decoder(SCHEMA, raw_logical_types=True)(buf, 2)
+    by_name = dict(zip(COLUMN_NAMES, columns))
+
+    assert by_name["num_col"] == [-9990000000, None]
+    assert by_name["bignum_col"] == [12345678900123456789 * 10 ** 28, None]
+    assert by_name["date_col"] == [10473, None]
+    assert by_name["time_col"] == [86399999999, None]
+    assert by_name["ts_col"] == [-149810339876544, None]
+    # Nested values are still converted.
+    assert by_name["struct_col"][0]["sub_num"] == decimal.Decimal("0.5")
+
+
+def test_arrays_w_negative_block_counts(mut):
+    schema = {
+        "type": "record",
+        "name": "__root__",
+        "fields": [{"name": "ints", "type": {"type": "array", "items": "long"}}],
+    }
+    # Two items in a block of 2 bytes, then one item, then the end of the
+    # array.
+    buf = b"\x03\x04" + b"\x02\x04" + b"\x02\x06" + b"\x00"
+
+    columns = mut.compile_decoder(schema)(buf, 1)
+
+    assert columns == [[[1, 2, 3]]]
+
+
+def test_truncated_block_raises_eof_error(mut):
+    buf = _encode(ROWS)
+
+    with pytest.raises(EOFError):
+        mut.compile_decoder(SCHEMA)(buf[:-3], len(ROWS))
+    with pytest.raises(EOFError):
+        mut.compile_decoder(SCHEMA)(buf, len(ROWS) + 1)
+
+
+@pytest.mark.parametrize(
+    "field_type",
+    [
+        {"type": "map", "values": "long"},
+        {"type": "enum", "name": "e", "symbols": ["A"]},
+        ["null", "long", "string"],
+        {"type": "long", "logicalType": "timestamp-millis"},
+        {"type": "fixed", "name": "f", "size": 16, "logicalType": "decimal"},
+        "__named_type",
+    ],
+)
+def test_unsupported_schema_raises(mut, field_type):
+    schema = {
+        "type": "record",
+        "name": "__root__",
+        "fields": [{"name": "col", "type": field_type}],
+    }
+
+    with pytest.raises(mut.UnsupportedSchemaError):
+        mut.compile_decoder(schema)
+
+
+def test_unknown_layout_raises_value_error(mut):
+    with pytest.raises(ValueError):
+        mut.compile_decoder(SCHEMA, layout="not-a-layout")
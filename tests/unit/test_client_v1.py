@@ -111,3 +111,124 @@ def test_read_rows(mock_transport, client_under_test):
     mock_transport.create_read_session.read_rows(
         expected_request, metadata=mock.ANY, timeout=mock.ANY
     )
+
+
+def test_read_session(mock_transport, client_under_test):
+    from google.cloud.bigquery_storage_v1 import session_reader
+
+    read_session = types.ReadSession(
+        streams=[{"name": "stream-0"}, {"name": "stream-1"}]
+    )
+
+    got = client_under_test.read_session(read_session, max_workers=1)
+
+    assert isinstance(got, session_reader.ReadSessionReader)
+    assert got._client is client_under_test
+    assert got._read_session is read_session
+    assert got._max_workers == 1
+
+
+def test_resume_read_session(mock_transport, client_under_test):
+    from google.cloud.bigquery_storage_v1 import checkpoint
+
+    read_session = types.ReadSession(
+        name="projects/p/locations/l/sessions/s", streams=[{"name": "stream-0"}]
+    )
+    store = checkpoint.SQLiteCheckpointStore(":memory:")
+    store.save_session(read_session)
+    store.save_offsets(read_session.name, {"stream-0": 42})
+
+    got = client_under_test.resume_read_session(read_session.name, store)
+
+    assert got._read_session == read_session
+    assert got._offsets == {"stream-0": 42}
+
+
+def test_resume_read_session_wo_checkpoint(mock_transport, client_under_test):
+    from google.cloud.bigquery_storage_v1 import checkpoint
+
+    store = checkpoint.SQLiteCheckpointStore(":memory:")
+
+    with pytest.raises(ValueError, match="No checkpoint"):
+        client_under_test.resume_read_session("projects/p/sessions/s", store)
+
+
+def test_resume_read_session_w_expired_session(mock_transport, client_under_test):
+    from google.cloud.bigquery_storage_v1 import checkpoint
+
+    read_session = types.ReadSession(
+        name="projects/p/locations/l/sessions/s",
+        expire_time={"seconds": 1},
+        streams=[{"name": "stream-0"}],
+    )
+    store = checkpoint.SQLiteCheckpointStore(":memory:")
+    store.save_session(read_session)
+
+    with pytest.raises(ValueError, match="expired"):
+        client_under_test.resume_read_session(read_session.name, store)
+
+
+def test_create_read_session_w_session_cache(mock_transport):
+    from google.cloud import bigquery_storage
+    from google.cloud.bigquery_storage_v1 import session_cache
+
+    client_under_test = bigquery_storage.BigQueryReadClient(
+        transport=mock_transport, session_cache=session_cache.ReadSessionCache()
+    )
+    rpc_callable = mock_transport._wrapped_methods[mock_transport.create_read_session]
+    rpc_callable.return_value = types.ReadSession(name="projects/p/sessions/s")
+    read_session = types.ReadSession(
+        table="projects/p/datasets/d/tables/t",
+        table_modifiers={"snapshot_time": {"seconds": 1600000000}},
+    )
+
+    first = client_under_test.create_read_session(
+        parent="projects/p", read_session=read_session
+    )
+    second = client_under_test.create_read_session(
+        request={"parent": "projects/p", "read_session": read_session}
+    )
+
+    assert first.name == "projects/p/sessions/s"
+    assert second == first
+    rpc_callable.assert_called_once_with(
+        types.CreateReadSessionRequest(parent="projects/p", read_session=read_session),
+        metadata=mock.ANY,
+        retry=mock.ANY,
+        timeout=mock.ANY,
+    )
+
+
+def test_create_read_session_w_session_cache_wo_snapshot_time(mock_transport):
+    from google.cloud import bigquery_storage
+    from google.cloud.bigquery_storage_v1 import session_cache
+
+    client_under_test = bigquery_storage.BigQueryReadClient(
+        transport=mock_transport, session_cache=session_cache.ReadSessionCache()
+    )
+    rpc_callable = mock_transport._wrapped_methods[mock_transport.create_read_session]
+    rpc_callable.return_value = types.ReadSession(name="projects/p/sessions/s")
+    read_session = types.ReadSession(table="projects/p/datasets/d/tables/t")
+
+    client_under_test.create_read_session(
+        parent="projects/p", read_session=read_session
+    )
+    client_under_test.create_read_session(
+        parent="projects/p", read_session=read_session
+    )
+
+    assert rpc_callable.call_count == 2
+
+
+def test_create_read_session_w_session_cache_w_request_and_fields(mock_transport):
+    from google.cloud import bigquery_storage
+    from google.cloud.bigquery_storage_v1 import session_cache
+
+    client_under_test = bigquery_storage.BigQueryReadClient(
+        transport=mock_transport, session_cache=session_cache.ReadSessionCache()
+    )
+
+    with pytest.raises(ValueError):
+        client_under_test.create_read_session(
+            request=types.CreateReadSessionRequest(), parent="projects/p"
+        )
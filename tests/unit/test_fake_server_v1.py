@@ -0,0 +1,133 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import google.api_core.exceptions
+import grpc
+import pytest
+
+from google.cloud.bigquery_storage import types
+
+
+TABLE = "projects/fake/datasets/dataset/tables/table"
+
+
+@pytest.fixture()
+def mut():
+    from google.cloud.bigquery_storage_v1 import testing
+
+    return testing
+
+
+@pytest.fixture()
+def class_under_test(mut):
+    return mut.FakeBigQueryReadServer
+
+
+def _create_session(client, data_format, max_stream_count=0):
+    return client.create_read_session(
+        parent="projects/fake",
+        read_session={"table": TABLE, "data_format": data_format},
+        max_stream_count=max_stream_count,
+    )
+
+
+@pytest.mark.parametrize("data_format", [types.DataFormat.AVRO, types.DataFormat.ARROW])
+def test_read_session(class_under_test, data_format):
+    with class_under_test(
+        stream_count=3, rows_per_stream=25, rows_per_page=10
+    ) as server:
+        client = server.make_client()
+        session = _create_session(client, data_format, max_stream_count=2)
+        table = client.read_session(session).to_arrow()
+
+    assert session.table == TABLE
+    assert len(session.streams) == 2
+    assert table.column("int_col").to_pylist() == list(range(50))
+    assert table.column("float_col").to_pylist() == [n / 2.0 for n in range(50)]
+    assert table.column("string_col").to_pylist() == [str(n) for n in range(50)]
+
+
+def test_read_rows_reports_progress_and_throttling(class_under_test):
+    with class_under_test(
+        stream_count=1, rows_per_stream=20, rows_per_page=10, throttle_percent=30
+    ) as server:
+        client = server.make_client()
+        session = _create_session(client, types.DataFormat.ARROW)
+        messages = list(client.read_rows(session.streams[0].name))
+
+    assert [message.row_count for message in messages] == [10, 10]
+    assert [m.stats.progress.at_response_end for m in messages] == [0.5, 1.0]
+    assert messages[1].stats.progress.at_response_start == 0.5
+    assert messages[0].throttle_state.throttle_percent == 30
+
+
+def test_read_rows_reconnects_after_injected_error(class_under_test):
+    with class_under_test(
+        stream_count=1,
+        rows_per_stream=30,
+        rows_per_page=10,
+        error_after_pages=1,
+        errors_per_stream=2,
+    ) as server:
+        client = server.make_client()
+        session = _create_session(client, types.DataFormat.AVRO)
+        rows = list(client.read_rows(session.streams[0].name).rows(session))
+
+    assert [row["int_col"] for row in rows] == list(range(30))
+
+
+def test_read_rows_w_nonresumable_injected_error(class_under_test):
+    with class_under_test(
+        stream_count=1,
+        rows_per_stream=30,
+        rows_per_page=10,
+        error_after_pages=0,
+        error_code=grpc.StatusCode.PERMISSION_DENIED,
+    ) as server:
+        client = server.make_client()
+        session = _create_session(client, types.DataFormat.AVRO)
+
+        with pytest.raises(google.api_core.exceptions.PermissionDenied):
+            list(client.read_rows(session.streams[0].name))
+
+
+def test_split_read_stream(class_under_test):
+    with class_under_test(
+        stream_count=1, rows_per_stream=40, rows_per_page=10
+    ) as server:
+        client = server.make_client()
+        session = _create_session(client, types.DataFormat.ARROW)
+        name = session.streams[0].name
+        split = client.split_read_stream(request={"name": name, "fraction": 0.25})
+
+        primary = client.read_rows(split.primary_stream.name).to_arrow(session)
+        remainder = client.read_rows(split.remainder_stream.name).to_arrow(session)
+        original = client.read_rows(name).to_arrow(session)
+        unsplittable = client.split_read_stream(request={"name": name, "fraction": 1.0})
+
+        with pytest.raises(google.api_core.exceptions.FailedPrecondition):
+            list(client.read_rows(split.primary_stream.name, offset=20))
+
+    assert primary.column("int_col").to_pylist() == list(range(10))
+    assert remainder.column("int_col").to_pylist() == list(range(10, 40))
+    assert original.num_rows == 40
+    assert not unsplittable.primary_stream.name
+
+
+def test_read_rows_w_unknown_stream(class_under_test):
+    with class_under_test() as server:
+        client = server.make_client()
+
+        with pytest.raises(google.api_core.exceptions.NotFound):
+            list(client.read_rows("projects/fake/locations/local/sessions/x/streams/0"))
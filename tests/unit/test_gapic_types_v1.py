@@ -0,0 +1,78 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from google.cloud.bigquery_storage_v1.types import storage
+from google.protobuf import timestamp_pb2
+
+
+SCRIPTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "scripts",
+)
+
+
+@pytest.fixture()
+def mut():
+    from google.cloud.bigquery_storage_v1 import gapic_types
+
+    return gapic_types
+
+
+def test_local_type(mut):
+    assert mut.ReadRowsResponse is storage.ReadRowsResponse
+    assert mut.ReadRowsResponse.__module__ == "google.cloud.bigquery_storage_v1.types"
+
+
+def test_local_type_module_doesnt_depend_on_lookup():
+    # Set on import, even for types which weren't looked up yet.
+    code = (
+        "from google.cloud.bigquery_storage_v1 import gapic_types\n"
+        "from google.cloud.bigquery_storage_v1.types import storage\n"
+        "print(storage.SplitReadStreamResponse.__module__)\n"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code])
+    assert output.decode().strip() == "google.cloud.bigquery_storage_v1.types"
+
+
+def test_names(mut):
+    assert mut.names == list(mut.__all__)
+    assert "ReadSession" in mut.names
+    assert "Timestamp" in mut.names
+
+
+def test_shared_type(mut):
+    assert mut.Timestamp is timestamp_pb2.Timestamp
+    assert mut.Timestamp.__module__ == "google.protobuf.timestamp_pb2"
+
+
+def test_unknown_type_raises_attribute_error(mut):
+    with pytest.raises(AttributeError):
+        mut.NotAType
+
+
+def test_all_types_can_be_looked_up(mut):
+    for name in mut.__all__:
+        assert getattr(mut, name).__name__ == name
+        assert name in dir(mut)
+
+
+def test_types_table_is_up_to_date():
+    script = os.path.join(SCRIPTS_DIR, "generate_gapic_types.py")
+    subprocess.check_call([sys.executable, script, "--check"])
@@ -0,0 +1,232 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.auth import credentials
+import grpc
+import mock
+import pytest
+
+from google.cloud.bigquery_storage import types
+
+
+@pytest.fixture()
+def mut():
+    from google.cloud.bigquery_storage_v1 import grpc_transport
+
+    return grpc_transport
+
+
+@pytest.fixture()
+def class_under_test(mut):
+    return mut.BigQueryReadGrpcTransport
+
+
+class _FakeCall(object):
+    """A streaming call which finishes when ``finish`` is called."""
+
+    def __init__(self):
+        self._callbacks = []
+
+    def add_done_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def finish(self):
+        for callback in self._callbacks:
+            callback(self)
+
+
+def _make_channels(count):
+    channels = []
+    for _ in range(count):
+        channel = mock.create_autospec(grpc.Channel, instance=True)
+        channel.unary_stream.return_value.side_effect = lambda *a, **kw: _FakeCall()
+        channels.append(channel)
+    return channels
+
+
+def _make_transport(class_under_test, channels, **kwargs):
+    with mock.patch.object(
+        class_under_test, "create_channel", side_effect=channels
+    ) as create_channel:
+        transport = class_under_test(
+            credentials=credentials.AnonymousCredentials(), **kwargs
+        )
+    return transport, create_channel
+
+
+def test_constructor_w_channel_pool_size(class_under_test, mut):
+    channels = _make_channels(3)
+
+    transport, create_channel = _make_transport(
+        class_under_test, channels, channel_pool_size=3
+    )
+
+    assert create_channel.call_count == 3
+    for call in create_channel.call_args_list:
+        assert call[1]["options"] == mut._POOL_CHANNEL_OPTIONS
+    assert transport.grpc_channel is channels[0]
+    assert transport._channel_pool.channels == channels
+
+
+def test_constructor_wo_channel_pool_size(class_under_test):
+    channels = _make_channels(1)
+
+    transport, create_channel = _make_transport(class_under_test, channels)
+
+    create_channel.assert_called_once()
+    assert "options" not in create_channel.call_args[1]
+    assert transport._channel_pool is None
+
+
+def test_constructor_w_channel_pool_size_zero(class_under_test):
+    with pytest.raises(ValueError):
+        class_under_test(channel_pool_size=0)
+
+
+def test_constructor_w_channel_and_channel_pool_size(class_under_test):
+    (channel,) = _make_channels(1)
+
+    with pytest.raises(ValueError):
+        class_under_test(channel=channel, channel_pool_size=2)
+
+
+def test_read_rows_uses_channel_w_fewest_open_streams(class_under_test):
+    channels = _make_channels(2)
+    transport, _ = _make_transport(class_under_test, channels, channel_pool_size=2)
+    stubs = [channel.unary_stream.return_value for channel in channels]
+    request = types.ReadRowsRequest(read_stream="stream")
+
+    first = transport.read_rows(request)
+    second = transport.read_rows(request)
+    assert stubs[0].call_count == 1
+    assert stubs[1].call_count == 1
+
+    first.finish()
+    transport.read_rows(request)
+    assert stubs[0].call_count == 2
+
+    second.finish()
+    transport.read_rows(request)
+    assert stubs[1].call_count == 2
+
+
+def test_read_rows_releases_channel_on_error(class_under_test):
+    channels = _make_channels(2)
+    transport, _ = _make_transport(class_under_test, channels, channel_pool_size=2)
+    stubs = [channel.unary_stream.return_value for channel in channels]
+    stubs[0].side_effect = grpc.RpcError()
+
+    with pytest.raises(grpc.RpcError):
+        transport.read_rows(types.ReadRowsRequest())
+
+    assert transport._channel_pool._open_streams == [0, 0]
+
+
+def test_unary_calls_use_first_channel(class_under_test):
+    channels = _make_channels(2)
+    transport, _ = _make_transport(class_under_test, channels, channel_pool_size=2)
+
+    transport.create_read_session
+    transport.split_read_stream
+
+    assert channels[0].unary_unary.call_count == 2
+    channels[1].unary_unary.assert_not_called()
+
+
+def test_constructor_w_channel_options(class_under_test, mut):
+    channels = _make_channels(2)
+
+    _, create_channel = _make_transport(
+        class_under_test,
+        channels,
+        channel_pool_size=2,
+        channel_options=mut.BULK_READ_CHANNEL_OPTIONS,
+    )
+
+    for call in create_channel.call_args_list:
+        assert call[1]["options"] == (
+            mut.BULK_READ_CHANNEL_OPTIONS + mut._POOL_CHANNEL_OPTIONS
+        )
+
+
+def test_constructor_w_channel_options_wo_channel_pool_size(class_under_test):
+    channels = _make_channels(1)
+    options = (("grpc.max_receive_message_length", -1),)
+
+    transport, create_channel = _make_transport(
+        class_under_test, channels, channel_options=options
+    )
+
+    create_channel.assert_called_once()
+    assert create_channel.call_args[1]["options"] == options
+    assert transport.grpc_channel is channels[0]
+    assert transport._channel_pool is None
+
+
+def test_constructor_w_channel_pool_size_and_api_mtls_endpoint(class_under_test):
+    with pytest.raises(ValueError):
+        class_under_test(channel_pool_size=2, api_mtls_endpoint="mtls.example.com")
+
+
+def test_client_w_channel_pool_size(mut):
+    from google.cloud.bigquery_storage_v1 import client
+
+    channels = _make_channels(2)
+    with mock.patch.object(
+        mut.BigQueryReadGrpcTransport, "create_channel", side_effect=channels
+    ):
+        read_client = client.BigQueryReadClient(
+            credentials=credentials.AnonymousCredentials(), channel_pool_size=2
+        )
+
+    assert isinstance(read_client._transport, mut.BigQueryReadGrpcTransport)
+    assert read_client._transport._channel_pool.channels == channels
+
+
+def test_client_w_channel_pool_size_and_transport(mut):
+    from google.cloud.bigquery_storage_v1 import client
+
+    with pytest.raises(ValueError):
+        client.BigQueryReadClient(transport="grpc_asyncio", channel_pool_size=2)
+
+
+def test_read_rows_w_channel_pool_reconnects_after_error(class_under_test, mut):
+    from google.cloud.bigquery_storage_v1 import client
+    from google.cloud.bigquery_storage_v1 import testing
+
+    with testing.FakeBigQueryReadServer(
+        stream_count=2,
+        rows_per_stream=40,
+        rows_per_page=10,
+        error_after_pages=2,
+        error_code=grpc.StatusCode.UNAVAILABLE,
+    ) as server:
+        channels = [
+            grpc.insecure_channel(server.address, options=mut._POOL_CHANNEL_OPTIONS)
+            for _ in range(2)
+        ]
+        transport, _ = _make_transport(class_under_test, channels, channel_pool_size=2)
+        read_client = client.BigQueryReadClient(transport=transport)
+        session = read_client.create_read_session(
+            parent="projects/fake",
+            read_session={"table": "projects/fake/datasets/d/tables/t"},
+        )
+        rows = [
+            list(read_client.read_rows(stream.name).rows(session))
+            for stream in session.streams
+        ]
+
+    assert [row["int_col"] for row in rows[0]] == list(range(40))
+    assert [row["int_col"] for row in rows[1]] == list(range(40, 80))
+    assert transport._channel_pool._open_streams == [0, 0]
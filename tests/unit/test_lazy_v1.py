@@ -0,0 +1,67 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.fixture()
+def mut():
+    from google.cloud.bigquery_storage_v1 import _lazy
+
+    return _lazy
+
+
+@pytest.fixture()
+def class_under_test(mut):
+    return mut.LazyModule
+
+
+def test_lazy_module_imports_on_attribute_access(class_under_test, monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    module = class_under_test("colorsys")
+
+    assert "colorsys" not in sys.modules
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+
+
+def test_lazy_module_is_true_if_installed(class_under_test):
+    assert class_under_test("json")
+    assert "json" in repr(class_under_test("json"))
+
+
+def test_lazy_module_is_false_if_not_installed(class_under_test):
+    module = class_under_test("not_an_installed_module")
+
+    assert not module
+    with pytest.raises(ImportError):
+        module.some_function
+
+
+def test_import_does_not_load_optional_dependencies():
+    # Use a new interpreter, since other tests have already imported them.
+    code = (
+        "import json, sys\n"
+        "import google.cloud.bigquery_storage\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code])
+    modules = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+    for name in ("fastavro", "pandas", "pkg_resources", "pyarrow"):
+        assert name not in modules
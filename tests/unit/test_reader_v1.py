@@ -167,6 +167,7 @@ def _bq_to_arrow_batches(bq_blocks, arrow_schema):
     arrow_batches = []
     for record_batch in _bq_to_arrow_batch_objects(bq_blocks, arrow_schema):
         response = types.ReadRowsResponse()
+        response.row_count = record_batch.num_rows
         response.arrow_record_batch.serialized_record_batch = (
             record_batch.serialize().to_pybytes()
         )
@@ -328,10 +329,7 @@ def test_rows_w_scalars_arrow(class_under_test, mock_gapic_client):
     arrow_batches = _bq_to_arrow_batches(SCALAR_BLOCKS, arrow_schema)
 
     reader = class_under_test(arrow_batches, mock_gapic_client, "", 0, {})
-    got = tuple(
-        dict((key, value.as_py()) for key, value in row_dict.items())
-        for row_dict in reader.rows(read_session)
-    )
+    got = tuple(reader.rows(read_session))
 
     expected = tuple(itertools.chain.from_iterable(SCALAR_BLOCKS))
     assert got == expected
@@ -868,3 +866,781 @@ def test_to_dataframe_by_page_arrow(class_under_test, mock_gapic_client):
             drop=True
         ),
     )
+
+
+def test_rows_w_reconnect_and_prefetch(class_under_test, mock_gapic_client):
+    bq_columns = [{"name": "int_col", "type": "int64"}]
+    avro_schema = _bq_to_avro_schema(bq_columns)
+    read_session = _generate_avro_read_session(avro_schema)
+    bq_blocks_1 = [
+        [{"int_col": 123}, {"int_col": 234}],
+        [{"int_col": 345}, {"int_col": 456}],
+    ]
+    avro_blocks_1 = _pages_w_unavailable(_bq_to_avro_blocks(bq_blocks_1, avro_schema))
+    bq_blocks_2 = [[{"int_col": 567}, {"int_col": 789}], [{"int_col": 890}]]
+    avro_blocks_2 = _bq_to_avro_blocks(bq_blocks_2, avro_schema)
+
+    mock_gapic_client.read_rows.return_value = avro_blocks_2
+
+    reader = class_under_test(
+        avro_blocks_1,
+        mock_gapic_client,
+        "teststream",
+        0,
+        {"metadata": {"test-key": "test-value"}},
+        prefetch_messages=1,
+        prefetch_bytes=1,
+    )
+    got = reader.rows(read_session)
+
+    expected = tuple(
+        itertools.chain(
+            itertools.chain.from_iterable(bq_blocks_1),
+            itertools.chain.from_iterable(bq_blocks_2),
+        )
+    )
+    assert tuple(got) == expected
+    mock_gapic_client.read_rows.assert_called_once_with(
+        read_stream="teststream", offset=4, metadata={"test-key": "test-value"}
+    )
+
+
+def test_rows_w_prefetch_and_nonresumable_error(class_under_test, mock_gapic_client):
+    bq_columns = [{"name": "int_col", "type": "int64"}]
+    avro_schema = _bq_to_avro_schema(bq_columns)
+    read_session = _generate_avro_read_session(avro_schema)
+    bq_blocks = [[{"int_col": 1024}, {"int_col": 512}], [{"int_col": 256}]]
+    avro_blocks = _pages_w_nonresumable_internal_error(
+        _bq_to_avro_blocks(bq_blocks, avro_schema)
+    )
+
+    reader = class_under_test(
+        avro_blocks, mock_gapic_client, "teststream", 0, {}, prefetch_messages=4
+    )
+    got = []
+
+    with pytest.raises(
+        google.api_core.exceptions.InternalServerError, match="nonresumable error"
+    ):
+        for row in reader.rows(read_session):
+            got.append(row)
+
+    assert got == list(itertools.chain.from_iterable(bq_blocks))
+    mock_gapic_client.read_rows.assert_not_called()
+
+
+def test_prefetch_close_cancels_call(class_under_test, mock_gapic_client):
+    wrapped = mock.MagicMock()
+    wrapped.__iter__.return_value = iter([types.ReadRowsResponse(row_count=1)] * 10)
+    reader = class_under_test(
+        wrapped, mock_gapic_client, "teststream", 0, {}, prefetch_messages=2
+    )
+
+    messages = iter(reader)
+    assert next(messages).row_count == 1
+    messages.close()
+
+    wrapped.cancel.assert_called_once_with()
+
+
+def test_reconnect_after_cancel_cancels_new_call(class_under_test, mock_gapic_client):
+    wrapped = mock.MagicMock()
+    reconnected = mock.MagicMock()
+    mock_gapic_client.read_rows.return_value = reconnected
+    reader = class_under_test(wrapped, mock_gapic_client, "teststream", 0, {})
+
+    reader._cancel()
+    reader._reconnect()
+
+    wrapped.cancel.assert_called_once_with()
+    reconnected.cancel.assert_called_once_with()
+
+
+def test_prefetch_buffer_limits(mut):
+    buffer = mut._PrefetchBuffer(max_messages=2, max_bytes=10)
+
+    # An oversized message is accepted when the buffer is empty.
+    assert buffer._is_full(100) is False
+    assert buffer.put("a", 100)
+    assert buffer._is_full(1) is True
+    assert buffer.get() == "a"
+
+    assert buffer.put("b", 4)
+    assert buffer._is_full(6) is False
+    assert buffer.put("c", 6)
+    assert buffer._is_full(0) is True
+
+    buffer.finish()
+    assert buffer.get() == "b"
+    assert buffer.get() == "c"
+    assert buffer.get() is None
+    assert buffer.close() is False
+    assert buffer.put("d", 1) is False
+
+
+def test_to_arrow_w_scalars_avro(class_under_test, mock_gapic_client):
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    avro_blocks = _bq_to_avro_blocks(SCALAR_BLOCKS, avro_schema)
+    reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+
+    actual_table = reader.to_arrow(read_session)
+
+    arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+    expected_table = pyarrow.Table.from_batches(
+        _bq_to_arrow_batch_objects(SCALAR_BLOCKS, arrow_schema)
+    )
+    assert actual_table == expected_table
+
+
+def test_to_arrow_empty_w_scalars_avro(class_under_test, mock_gapic_client):
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    reader = class_under_test([], mock_gapic_client, "", 0, {})
+
+    actual_table = reader.to_arrow(read_session)
+
+    assert actual_table.num_rows == 0
+    assert actual_table.schema == _bq_to_arrow_schema(SCALAR_COLUMNS)
+
+
+def test_to_arrow_w_nested_avro(class_under_test, mock_gapic_client):
+    avro_schema = {
+        "type": "record",
+        "name": "__root__",
+        "fields": [
+            {"name": "ints", "type": {"type": "array", "items": "long"}},
+            {
+                "name": "struct_col",
+                "type": [
+                    "null",
+                    {
+                        "type": "record",
+                        "name": "__struct_col",
+                        "fields": [
+                            {"name": "sub_str", "type": ["null", "string"]},
+                            {
+                                "name": "sub_num",
+                                "type": {
+                                    "type": "bytes",
+                                    "logicalType": "decimal",
+                                    "precision": 77,
+                                    "scale": 38,
+                                },
+                            },
+                        ],
+                    },
+                ],
+            },
+        ],
+    }
+    read_session = _generate_avro_read_session(avro_schema)
+    rows = [
+        {"ints": [1, 2], "struct_col": {"sub_str": "a", "sub_num": decimal.Decimal(1)}},
+        {"ints": [], "struct_col": None},
+    ]
+    avro_blocks = _bq_to_avro_blocks([rows], avro_schema)
+    reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+
+    actual_table = reader.to_arrow(read_session)
+
+    expected_struct = pyarrow.struct(
+        [
+            pyarrow.field("sub_str", pyarrow.string(), True),
+            pyarrow.field("sub_num", pyarrow.decimal256(76, 38), False),
+        ]
+    )
+    assert actual_table.schema == pyarrow.schema(
+        [
+            pyarrow.field("ints", pyarrow.list_(pyarrow.int64()), False),
+            pyarrow.field("struct_col", expected_struct, True),
+        ]
+    )
+    assert actual_table.to_pylist() == rows
+
+
+def test_to_arrow_w_nulls_avro(class_under_test, mock_gapic_client):
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    null_row = {name: None for name in SCALAR_COLUMN_NAMES}
+    blocks = [[null_row] + SCALAR_BLOCKS[0] + [null_row]]
+    avro_blocks = _bq_to_avro_blocks(blocks, avro_schema)
+    reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+
+    actual_table = reader.to_arrow(read_session)
+
+    arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+    expected_table = pyarrow.Table.from_batches(
+        _bq_to_arrow_batch_objects(blocks, arrow_schema)
+    )
+    assert actual_table == expected_table
+    assert actual_table.column("num_col").null_count == 2
+
+
+def test_to_arrow_w_bignumeric_avro_without_decimal256(
+    class_under_test, mock_gapic_client, monkeypatch
+):
+    monkeypatch.delattr(pyarrow, "decimal256")
+    avro_schema = {
+        "type": "record",
+        "name": "__root__",
+        "fields": [
+            {
+                "name": "bignum_col",
+                "type": [
+                    "null",
+                    {
+                        "type": "bytes",
+                        "logicalType": "decimal",
+                        "precision": 77,
+                        "scale": 38,
+                    },
+                ],
+            }
+        ],
+    }
+    read_session = _generate_avro_read_session(avro_schema)
+    rows = [{"bignum_col": decimal.Decimal("1.5")}, {"bignum_col": None}]
+    avro_blocks = _bq_to_avro_blocks([rows], avro_schema)
+    reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+
+    actual_table = reader.to_arrow(read_session)
+
+    assert actual_table.schema.field("bignum_col").type == pyarrow.string()
+    values = actual_table.column("bignum_col").to_pylist()
+    assert decimal.Decimal(values[0]) == decimal.Decimal("1.5")
+    assert values[1] is None
+
+
+def test_to_dataframe_w_unsupported_avro_schema_uses_fastavro(
+    mut, class_under_test, mock_gapic_client, monkeypatch
+):
+    monkeypatch.setattr(mut, "pyarrow", None)
+    avro_schema = {
+        "type": "record",
+        "name": "__root__",
+        "fields": [
+            {"name": "int_col", "type": "long"},
+            {
+                "name": "ts_col",
+                "type": {"type": "long", "logicalType": "timestamp-millis"},
+            },
+        ],
+    }
+    read_session = _generate_avro_read_session(avro_schema)
+    timestamp = datetime.datetime(2000, 1, 1, 5, 0, tzinfo=pytz.utc)
+    rows = [{"int_col": 1, "ts_col": timestamp}]
+    avro_blocks = _bq_to_avro_blocks([rows], avro_schema)
+    reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+
+    got = reader.to_dataframe(read_session)
+
+    assert got["int_col"].tolist() == [1]
+    assert got["ts_col"].tolist() == [timestamp]
+
+
+def test_to_dataframe_w_scalars_avro_without_pyarrow(
+    mut, class_under_test, mock_gapic_client, monkeypatch
+):
+    monkeypatch.setattr(mut, "pyarrow", None)
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    avro_blocks = _bq_to_avro_blocks(SCALAR_BLOCKS, avro_schema)
+    reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+
+    got = reader.to_dataframe(read_session, dtypes={"float_col": "float32"})
+
+    assert list(got.columns) == SCALAR_COLUMN_NAMES
+    assert got["int_col"].tolist() == [123, 456, 789]
+    assert got["float_col"].dtype.name == "float32"
+
+    with pytest.raises(ImportError):
+        reader.rows(read_session).to_arrow()
+
+
+def test_to_dataframe_empty_w_scalars_avro_without_pyarrow(
+    mut, class_under_test, mock_gapic_client, monkeypatch
+):
+    monkeypatch.setattr(mut, "pyarrow", None)
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    reader = class_under_test([], mock_gapic_client, "", 0, {})
+
+    got = reader.to_dataframe(read_session)
+
+    assert list(got.columns) == SCALAR_COLUMN_NAMES
+    assert got["int_col"].dtype.name == "int64"
+    assert got["ts_col"].dtype.name == "datetime64[ns, UTC]"
+
+
+@pytest.mark.parametrize("value", [0, 1, -1, 63, 64, 300, -300, 2 ** 40, 2 ** 63 - 1])
+def test_encode_avro_long_matches_fastavro(mut, value):
+    expected = six.BytesIO()
+    fastavro.schemaless_writer(expected, fastavro.parse_schema("long"), value)
+
+    assert mut._encode_avro_long(value) == expected.getvalue()
+
+
+def test_rows_w_many_rows_per_block(class_under_test, mock_gapic_client):
+    bq_columns = [
+        {"name": "int_col", "type": "int64"},
+        {"name": "str_col", "type": "string"},
+    ]
+    avro_schema = _bq_to_avro_schema(bq_columns)
+    read_session = _generate_avro_read_session(avro_schema)
+    bq_blocks = [
+        [{"int_col": i, "str_col": str(i) * (i % 5)} for i in range(1000)],
+        [{"int_col": None, "str_col": None}],
+    ]
+    avro_blocks = _bq_to_avro_blocks(bq_blocks, avro_schema)
+    reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+
+    got = tuple(reader.rows(read_session))
+
+    assert got == tuple(itertools.chain.from_iterable(bq_blocks))
+
+
+def test_schema_cache_shared_across_streams(mut, class_under_test, mock_gapic_client):
+    mut._SCHEMA_CACHE.clear()
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+    arrow_read_session = _generate_arrow_read_session(arrow_schema)
+
+    for _ in range(3):
+        avro_blocks = _bq_to_avro_blocks(SCALAR_BLOCKS, avro_schema)
+        reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+        reader.to_arrow(read_session)
+
+        arrow_batches = _bq_to_arrow_batches(SCALAR_BLOCKS, arrow_schema)
+        reader = class_under_test(arrow_batches, mock_gapic_client, "", 0, {})
+        reader.to_arrow(arrow_read_session)
+
+    info = mut.schema_cache_info()
+    # Avro JSON, fastavro and Arrow schemas, plus the Arrow IPC schema.
+    assert info.misses == 4
+    assert info.currsize == 4
+    assert info.hits == 2 * 4
+    mut._SCHEMA_CACHE.clear()
+    assert mut.schema_cache_info() == (0, 0, mut._SCHEMA_CACHE_SIZE, 0)
+
+
+def test_schema_cache_evicts_least_recently_used(mut):
+    cache = mut._SchemaCache(maxsize=2)
+    parse = mock.Mock(side_effect=lambda: object())
+
+    first = cache.get("a", parse)
+    cache.get("b", parse)
+    assert cache.get("a", parse) is first
+    cache.get("c", parse)  # Evicts "b".
+
+    assert cache.get("a", parse) is first
+    cache.get("b", parse)
+    assert parse.call_count == 4
+    assert cache.cache_info() == mut.SchemaCacheInfo(
+        hits=2, misses=4, maxsize=2, currsize=2
+    )
+
+
+@pytest.mark.parametrize("data_format", ["avro", "arrow"])
+def test_rows_w_row_type(mut, class_under_test, mock_gapic_client, data_format):
+    if data_format == "avro":
+        avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+        read_session = _generate_avro_read_session(avro_schema)
+        messages = _bq_to_avro_blocks(SCALAR_BLOCKS, avro_schema)
+    else:
+        arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+        read_session = _generate_arrow_read_session(arrow_schema)
+        messages = _bq_to_arrow_batches(SCALAR_BLOCKS, arrow_schema)
+
+    reader = class_under_test(messages, mock_gapic_client, "", 0, {})
+    got = tuple(reader.rows(read_session, row_type=mut.Row))
+
+    expected = tuple(itertools.chain.from_iterable(SCALAR_BLOCKS))
+    assert all(isinstance(row, mut.Row) for row in got)
+    assert tuple(dict(row.items()) for row in got) == expected
+    assert got[0][0] == 123
+    assert got[0]["str_col"] == "hello world"
+    assert got[2].ts_col == expected[2]["ts_col"]
+    # All rows from a session share a single field name to index map.
+    assert len(set(id(row._xxx_field_to_index) for row in got)) == 1
+
+
+def test_rows_w_unknown_row_type_raises_value_error(
+    class_under_test, mock_gapic_client
+):
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    reader = class_under_test([], mock_gapic_client, "", 0, {})
+
+    with pytest.raises(ValueError):
+        reader.rows(read_session, row_type=list)
+
+
+def test_row(mut):
+    field_to_index = {"x": 0, "y": 1}
+    row = mut.Row(("a", None), field_to_index)
+
+    assert len(row) == 2
+    assert row.values() == ("a", None)
+    assert list(row.keys()) == ["x", "y"]
+    assert list(row.items()) == [("x", "a"), ("y", None)]
+    assert row[0] == "a"
+    assert row[-1:] == (None,)
+    assert row["x"] == "a"
+    assert row.x == "a"
+    assert row.get("y", "default") is None
+    assert row.get("z", "default") == "default"
+    assert repr(row) == "Row(('a', None), {'x': 0, 'y': 1})"
+
+    with pytest.raises(KeyError):
+        row["z"]
+    with pytest.raises(AttributeError):
+        row.z
+    with pytest.raises(AttributeError):
+        row.__dict__
+
+
+def test_row_equality(mut):
+    field_to_index = {"x": 0}
+    row = mut.Row((1,), field_to_index)
+
+    assert row == mut.Row((1,), {"x": 0})
+    assert row != mut.Row((2,), field_to_index)
+    assert row != mut.Row((1,), {"y": 0})
+    assert row != (1,)
+
+
+@pytest.mark.parametrize("data_format", ["avro", "arrow"])
+def test_to_parquet(class_under_test, mock_gapic_client, tmpdir, data_format):
+    import pyarrow.parquet
+
+    if data_format == "avro":
+        avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+        read_session = _generate_avro_read_session(avro_schema)
+        messages = _bq_to_avro_blocks(SCALAR_BLOCKS, avro_schema)
+    else:
+        arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+        read_session = _generate_arrow_read_session(arrow_schema)
+        messages = _bq_to_arrow_batches(SCALAR_BLOCKS, arrow_schema)
+    path = str(tmpdir.join("rows.parquet"))
+
+    reader = class_under_test(messages, mock_gapic_client, "", 0, {})
+    num_rows = reader.to_parquet(read_session, path, compression="zstd")
+
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    assert num_rows == 3
+    assert parquet_file.metadata.num_row_groups == len(SCALAR_BLOCKS)
+    assert parquet_file.metadata.row_group(0).column(0).compression == "ZSTD"
+    assert parquet_file.read().to_pylist() == list(
+        itertools.chain.from_iterable(SCALAR_BLOCKS)
+    )
+
+
+def test_to_parquet_w_row_group_size(class_under_test, mock_gapic_client, tmpdir):
+    import pyarrow.parquet
+
+    bq_columns = [{"name": "int_col", "type": "int64"}]
+    arrow_schema = _bq_to_arrow_schema(bq_columns)
+    read_session = _generate_arrow_read_session(arrow_schema)
+    bq_blocks = [
+        [{"int_col": value} for value in range(start, start + 3)]
+        for start in range(0, 12, 3)
+    ]
+    arrow_batches = _bq_to_arrow_batches(bq_blocks, arrow_schema)
+    path = str(tmpdir.join("rows.parquet"))
+
+    reader = class_under_test(arrow_batches, mock_gapic_client, "", 0, {})
+    reader.to_parquet(read_session, path, row_group_size=5)
+
+    metadata = pyarrow.parquet.ParquetFile(path).metadata
+    row_group_sizes = [
+        metadata.row_group(index).num_rows for index in range(metadata.num_row_groups)
+    ]
+    assert row_group_sizes == [5, 5, 2]
+    table = pyarrow.parquet.read_table(path)
+    assert table.column("int_col").to_pylist() == list(range(12))
+
+
+def test_to_parquet_w_empty_stream(class_under_test, mock_gapic_client, tmpdir):
+    import pyarrow.parquet
+
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    path = str(tmpdir.join("rows.parquet"))
+
+    reader = class_under_test([], mock_gapic_client, "", 0, {})
+    assert reader.to_parquet(read_session, path) == 0
+
+    table = pyarrow.parquet.read_table(path)
+    assert table.num_rows == 0
+    assert table.schema.names == SCALAR_COLUMN_NAMES
+
+
+def test_to_parquet_no_pyarrow_raises_import_error(
+    mut, class_under_test, mock_gapic_client, monkeypatch, tmpdir
+):
+    arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+    read_session = _generate_arrow_read_session(arrow_schema)
+    reader = class_under_test([], mock_gapic_client, "", 0, {})
+    rows = reader.rows(read_session)
+    monkeypatch.setattr(mut, "pyarrow", None)
+
+    with pytest.raises(ImportError):
+        rows.to_parquet(str(tmpdir.join("rows.parquet")))
+
+
+@pytest.mark.parametrize(
+    "data_format,ipc_format",
+    [("avro", "file"), ("arrow", "file"), ("arrow", "stream")],
+)
+def test_to_arrow_ipc(
+    class_under_test, mock_gapic_client, tmpdir, data_format, ipc_format
+):
+    if data_format == "avro":
+        avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+        read_session = _generate_avro_read_session(avro_schema)
+        messages = _bq_to_avro_blocks(SCALAR_BLOCKS, avro_schema)
+    else:
+        arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+        read_session = _generate_arrow_read_session(arrow_schema)
+        messages = _bq_to_arrow_batches(SCALAR_BLOCKS, arrow_schema)
+    path = str(tmpdir.join("rows.arrow"))
+
+    reader = class_under_test(messages, mock_gapic_client, "", 0, {})
+    num_rows = reader.to_arrow_ipc(read_session, path, ipc_format=ipc_format)
+
+    source = pyarrow.memory_map(path)
+    if ipc_format == "file":
+        ipc_reader = pyarrow.ipc.open_file(source)
+        assert ipc_reader.num_record_batches == len(SCALAR_BLOCKS)
+    else:
+        ipc_reader = pyarrow.ipc.open_stream(source)
+    assert num_rows == 3
+    assert ipc_reader.read_all().to_pylist() == list(
+        itertools.chain.from_iterable(SCALAR_BLOCKS)
+    )
+
+
+def test_to_arrow_ipc_w_empty_stream(class_under_test, mock_gapic_client, tmpdir):
+    arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+    read_session = _generate_arrow_read_session(arrow_schema)
+    path = str(tmpdir.join("rows.arrow"))
+
+    reader = class_under_test([], mock_gapic_client, "", 0, {})
+    assert reader.to_arrow_ipc(read_session, path, ipc_format="stream") == 0
+
+    table = pyarrow.ipc.open_stream(pyarrow.memory_map(path)).read_all()
+    assert table.num_rows == 0
+    assert table.schema.names == SCALAR_COLUMN_NAMES
+
+
+def test_to_arrow_ipc_w_unknown_format_raises_value_error(
+    class_under_test, mock_gapic_client, tmpdir
+):
+    arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+    read_session = _generate_arrow_read_session(arrow_schema)
+    path = str(tmpdir.join("rows.arrow"))
+
+    reader = class_under_test([], mock_gapic_client, "", 0, {})
+    with pytest.raises(ValueError):
+        reader.to_arrow_ipc(read_session, path, ipc_format="feather")
+
+
+def test_to_dataframe_w_low_memory_arrow(class_under_test, mock_gapic_client):
+    bq_columns = [
+        {"name": "int_col", "type": "int64"},
+        {"name": "float_col", "type": "float64"},
+        {"name": "str_col", "type": "string"},
+    ]
+    arrow_schema = _bq_to_arrow_schema(bq_columns)
+    read_session = _generate_arrow_read_session(arrow_schema)
+    blocks = [
+        [
+            {"int_col": 1, "float_col": 1.25, "str_col": "a"},
+            {"int_col": 2, "float_col": 2.5, "str_col": "b"},
+        ],
+        [{"int_col": None, "float_col": 3.75, "str_col": "a"}],
+    ]
+    arrow_batches = _bq_to_arrow_batches(blocks, arrow_schema)
+
+    reader = class_under_test(arrow_batches, mock_gapic_client, "", 0, {})
+    got = reader.to_dataframe(
+        read_session,
+        dtypes={"int_col": "Int64", "float_col": "float16", "str_col": "category"},
+        low_memory=True,
+    )
+
+    expected = pandas.DataFrame(
+        {
+            "int_col": pandas.Series([1, 2, None], dtype="Int64"),
+            "float_col": pandas.Series([1.25, 2.5, 3.75], dtype="float16"),
+            "str_col": pandas.Series(["a", "b", "a"], dtype="category"),
+        },
+        columns=["int_col", "float_col", "str_col"],
+    )
+    pandas.testing.assert_frame_equal(got, expected)
+
+
+def test_to_dataframe_w_low_memory_casts_in_arrow(mut):
+    record_batch = pyarrow.RecordBatch.from_arrays(
+        [pyarrow.array([1, 2, 3], type=pyarrow.int64())], names=["int_col"]
+    )
+
+    table = mut._low_memory_table([record_batch], None, {"int_col": "int32"})
+    assert table.schema.field("int_col").type == pyarrow.int32()
+
+    got = mut._arrow_to_dataframe(table, {"int_col": "int32"}, low_memory=True)
+
+    assert got["int_col"].dtype.name == "int32"
+    assert got["int_col"].tolist() == [1, 2, 3]
+
+
+def test_low_memory_table_releases_ipc_messages_and_columns(mut):
+    record_batch = pyarrow.RecordBatch.from_arrays(
+        [
+            pyarrow.array(range(100000), type=pyarrow.int64()),
+            pyarrow.array([1.5] * 100000, type=pyarrow.float64()),
+        ],
+        names=["int_col", "float_col"],
+    )
+    schema, message = record_batch.schema, record_batch.serialize()
+    del record_batch
+    # Both columns are views of the message, as when reading an Arrow stream.
+    view = pyarrow.ipc.read_record_batch(message, schema)
+    before = pyarrow.total_allocated_bytes()
+
+    table = mut._low_memory_table([view], None, {})
+    del view, message
+    # The message is freed once its batch has been copied.
+    assert pyarrow.total_allocated_bytes() <= before
+
+    # Each column owns its memory, so dropping one frees it.
+    int_bytes = table.column(0).nbytes
+    before = pyarrow.total_allocated_bytes()
+    table = table.remove_column(0)
+    assert pyarrow.total_allocated_bytes() <= before - int_bytes
+    assert table.column("float_col").to_pylist() == [1.5] * 100000
+
+
+def test_to_arrow_w_decode_executor_avro(class_under_test, mock_gapic_client):
+    import concurrent.futures
+
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    avro_blocks = _bq_to_avro_blocks(SCALAR_BLOCKS, avro_schema)
+    reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        actual = reader.to_arrow(read_session, decode_executor=executor)
+
+    expected_reader = class_under_test(
+        _bq_to_avro_blocks(SCALAR_BLOCKS, avro_schema), mock_gapic_client, "", 0, {}
+    )
+    assert actual.equals(expected_reader.to_arrow(read_session))
+    assert actual.num_rows == 3
+
+
+def test_to_dataframe_w_decode_executor_keeps_stream_order(
+    mut, class_under_test, mock_gapic_client, monkeypatch
+):
+    import concurrent.futures
+
+    bq_columns = [{"name": "int_col", "type": "int64"}]
+    avro_schema = _bq_to_avro_schema(bq_columns)
+    read_session = _generate_avro_read_session(avro_schema)
+    bq_blocks = [[{"int_col": value}] for value in range(20)]
+    avro_blocks = _bq_to_avro_blocks(bq_blocks, avro_schema)
+    monkeypatch.setattr(mut.os, "cpu_count", lambda: 2)
+    reader = class_under_test(avro_blocks, mock_gapic_client, "", 0, {})
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        df = reader.to_dataframe(read_session, decode_executor=executor)
+
+    assert df["int_col"].tolist() == list(range(20))
+
+
+def test_to_arrow_w_decode_executor_ignored_for_arrow(
+    class_under_test, mock_gapic_client
+):
+    arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+    read_session = _generate_arrow_read_session(arrow_schema)
+    executor = mock.Mock(spec=["submit"])
+    arrow_batches = _bq_to_arrow_batches(SCALAR_BLOCKS, arrow_schema)
+    reader = class_under_test(arrow_batches, mock_gapic_client, "", 0, {})
+
+    table = reader.to_arrow(read_session, decode_executor=executor)
+
+    assert table.num_rows == 3
+    executor.submit.assert_not_called()
+
+
+def test_iter_w_page_callback(class_under_test, mock_gapic_client):
+    arrow_schema = _bq_to_arrow_schema(SCALAR_COLUMNS)
+    arrow_batches = _bq_to_arrow_batches(SCALAR_BLOCKS, arrow_schema)
+    arrow_batches[0].stats.progress.at_response_end = 0.5
+    arrow_batches[0].throttle_state.throttle_percent = 20
+    callback = mock.Mock()
+    reader = class_under_test(
+        arrow_batches, mock_gapic_client, "teststream", 0, {}, page_callback=callback
+    )
+
+    messages = list(reader)
+
+    assert messages == arrow_batches
+    assert callback.call_count == len(SCALAR_BLOCKS)
+    first, second = [call[0][0] for call in callback.call_args_list]
+    assert first.stream_name == "teststream"
+    assert first.row_count == len(SCALAR_BLOCKS[0])
+    assert first.byte_count == arrow_batches[0]._pb.ByteSize()
+    assert first.progress == 0.5
+    assert first.throttle_percent == 20
+    assert first.decode_time == 0.0
+    assert first.wait_time >= 0.0
+    assert second.total_rows == sum(len(block) for block in SCALAR_BLOCKS)
+    assert second.total_bytes == sum(m._pb.ByteSize() for m in arrow_batches)
+    assert second.elapsed_time >= first.elapsed_time
+
+
+@pytest.mark.parametrize("method", ["rows", "to_arrow", "to_dataframe"])
+def test_page_callback_reports_decoded_pages_once(
+    class_under_test, mock_gapic_client, method
+):
+    avro_schema = _bq_to_avro_schema(SCALAR_COLUMNS)
+    read_session = _generate_avro_read_session(avro_schema)
+    avro_blocks = _bq_to_avro_blocks(SCALAR_BLOCKS, avro_schema)
+    callback = mock.Mock()
+    reader = class_under_test(
+        avro_blocks, mock_gapic_client, "teststream", 0, {}, page_callback=callback
+    )
+
+    result = getattr(reader, method)(read_session)
+    if method == "rows":
+        result = list(result)
+
+    assert len(result) == 3
+    assert callback.call_count == len(SCALAR_BLOCKS)
+    stats = callback.call_args[0][0]
+    assert stats.total_rows == 3
+    assert stats.decode_time > 0.0
+
+
+def test_page_callback_w_decode_executor(class_under_test, mock_gapic_client):
+    import concurrent.futures
+
+    bq_columns = [{"name": "int_col", "type": "int64"}]
+    avro_schema = _bq_to_avro_schema(bq_columns)
+    read_session = _generate_avro_read_session(avro_schema)
+    bq_blocks = [[{"int_col": value}] for value in range(5)]
+    avro_blocks = _bq_to_avro_blocks(bq_blocks, avro_schema)
+    callback = mock.Mock()
+    reader = class_under_test(
+        avro_blocks, mock_gapic_client, "teststream", 0, {}, page_callback=callback
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        table = reader.to_arrow(read_session, decode_executor=executor)
+
+    assert table.column("int_col").to_pylist() == list(range(5))
+    totals = [call[0][0].total_rows for call in callback.call_args_list]
+    assert totals == [1, 2, 3, 4, 5]
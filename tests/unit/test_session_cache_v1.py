@@ -0,0 +1,287 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+
+import mock
+import pytest
+
+from google.cloud.bigquery_storage import types
+
+
+TABLE = "projects/p/datasets/d/tables/t"
+NOW = 1600000000.0
+
+
+@pytest.fixture()
+def mut():
+    from google.cloud.bigquery_storage_v1 import session_cache
+
+    return session_cache
+
+
+@pytest.fixture()
+def class_under_test(mut):
+    return mut.ReadSessionCache
+
+
+@pytest.fixture()
+def clock(mut, monkeypatch):
+    clock = mock.Mock(return_value=NOW)
+    monkeypatch.setattr(mut.time, "time", clock)
+    return clock
+
+
+def _make_request(snapshot_seconds=NOW - 60, **read_session):
+    read_session.setdefault("table", TABLE)
+    if snapshot_seconds is not None:
+        read_session["table_modifiers"] = {
+            "snapshot_time": {"seconds": int(snapshot_seconds)}
+        }
+    return types.CreateReadSessionRequest(
+        parent="projects/p", read_session=read_session
+    )
+
+
+def _make_creator(expire_seconds=None):
+    counter = itertools.count()
+
+    def create_read_session():
+        read_session = types.ReadSession(
+            name="projects/p/locations/l/sessions/{}".format(next(counter)),
+            streams=[{"name": "stream-0"}],
+        )
+        if expire_seconds is not None:
+            read_session.expire_time = {"seconds": int(expire_seconds)}
+        return read_session
+
+    return mock.Mock(side_effect=create_read_session)
+
+
+def test_get_or_create_reuses_session(class_under_test, clock):
+    cache = class_under_test()
+    create = _make_creator()
+
+    first = cache.get_or_create(_make_request(), create)
+    second = cache.get_or_create(_make_request(), create)
+
+    assert create.call_count == 1
+    assert second == first
+    assert second is not first
+    assert len(cache) == 1
+
+
+def test_get_or_create_returns_copies(class_under_test, clock):
+    cache = class_under_test()
+    create = _make_creator()
+
+    first = cache.get_or_create(_make_request(), create)
+    first.streams[0].name = "changed"
+    second = cache.get_or_create(_make_request(), create)
+
+    assert second.streams[0].name == "stream-0"
+
+
+def test_get_or_create_wo_snapshot_time_creates_session(class_under_test, clock):
+    cache = class_under_test()
+    create = _make_creator()
+
+    cache.get_or_create(_make_request(snapshot_seconds=None), create)
+    cache.get_or_create(_make_request(snapshot_seconds=None), create)
+
+    assert create.call_count == 2
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    "other_request",
+    [
+        _make_request(snapshot_seconds=NOW - 120),
+        _make_request(table="projects/p/datasets/d/tables/other"),
+        _make_request(data_format=types.DataFormat.ARROW),
+        _make_request(read_options={"selected_fields": ["a"]}),
+        _make_request(read_options={"row_restriction": "a > 1"}),
+        types.CreateReadSessionRequest(
+            _make_request(), parent="projects/other-project"
+        ),
+        types.CreateReadSessionRequest(_make_request(), max_stream_count=1),
+    ],
+)
+def test_get_or_create_w_different_request(class_under_test, clock, other_request):
+    cache = class_under_test()
+    create = _make_creator()
+
+    first = cache.get_or_create(_make_request(), create)
+    other = cache.get_or_create(other_request, create)
+
+    assert create.call_count == 2
+    assert other.name != first.name
+
+
+def test_get_or_create_evicts_after_ttl(class_under_test, clock):
+    cache = class_under_test(ttl=60.0)
+    create = _make_creator()
+
+    first = cache.get_or_create(_make_request(), create)
+    clock.return_value = NOW + 59
+    assert cache.get_or_create(_make_request(), create).name == first.name
+    clock.return_value = NOW + 61
+    assert cache.get_or_create(_make_request(), create).name != first.name
+
+
+def test_get_or_create_evicts_before_expire_time(class_under_test, clock):
+    cache = class_under_test(ttl=3600.0, expiry_margin=300.0)
+    create = _make_creator(expire_seconds=NOW + 600)
+
+    first = cache.get_or_create(_make_request(), create)
+    clock.return_value = NOW + 299
+    assert cache.get_or_create(_make_request(), create).name == first.name
+    clock.return_value = NOW + 301
+    assert cache.get_or_create(_make_request(), create).name != first.name
+
+
+def test_get_or_create_w_session_expiring_soon(class_under_test, clock):
+    cache = class_under_test(expiry_margin=300.0)
+    create = _make_creator(expire_seconds=NOW + 60)
+
+    cache.get_or_create(_make_request(), create)
+
+    assert len(cache) == 0
+
+
+def test_get_or_create_evicts_least_recently_used(class_under_test, clock):
+    cache = class_under_test(max_size=2)
+    create = _make_creator()
+    requests = [_make_request(snapshot_seconds=NOW - index) for index in range(3)]
+
+    first = cache.get_or_create(requests[0], create)
+    cache.get_or_create(requests[1], create)
+    cache.get_or_create(requests[0], create)
+    cache.get_or_create(requests[2], create)
+
+    assert len(cache) == 2
+    assert cache.get_or_create(requests[0], create).name == first.name
+    assert create.call_count == 3
+
+
+def test_invalidate_session(class_under_test, clock):
+    cache = class_under_test()
+    create = _make_creator()
+    first = cache.get_or_create(_make_request(), create)
+    cache.get_or_create(_make_request(snapshot_seconds=NOW - 1), create)
+
+    cache.invalidate(first)
+
+    assert len(cache) == 1
+    assert cache.get_or_create(_make_request(), create).name != first.name
+
+
+def test_invalidate_all(class_under_test, clock):
+    cache = class_under_test()
+    create = _make_creator()
+    cache.get_or_create(_make_request(), create)
+    cache.get_or_create(_make_request(snapshot_seconds=NOW - 1), create)
+
+    cache.invalidate()
+
+    assert len(cache) == 0
+
+
+def test_get_or_create_shares_streams(class_under_test, clock):
+    cache = class_under_test()
+    create = _make_creator()
+
+    first = cache.get_or_create(_make_request(), create)
+    second = cache.get_or_create(_make_request(), create)
+
+    assert [stream.name for stream in second.streams] == [
+        stream.name for stream in first.streams
+    ]
+
+
+def test_get_or_create_creates_session_once_when_concurrent(class_under_test, clock):
+    import threading
+
+    cache = class_under_test()
+    started = threading.Event()
+    release = threading.Event()
+    create = _make_creator()
+    create_read_session = create.side_effect
+
+    def slow_create():
+        started.set()
+        release.wait()
+        return create_read_session()
+
+    create.side_effect = slow_create
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_create(_make_request(), create))
+        )
+        for _ in range(4)
+    ]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    # The other callers wait for the session instead of creating their own.
+    threads[1].join(timeout=0.1)
+    assert threads[1].is_alive()
+    assert create.call_count == 1
+
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert create.call_count == 1
+    assert len(results) == 4
+    assert len({read_session.name for read_session in results}) == 1
+    assert len(cache) == 1
+
+
+def test_get_or_create_raises_creation_error_when_concurrent(class_under_test, clock):
+    import threading
+
+    cache = class_under_test()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_create():
+        started.set()
+        release.wait()
+        raise ValueError("can't create")
+
+    errors = []
+
+    def get_or_create():
+        try:
+            cache.get_or_create(_make_request(), failing_create)
+        except ValueError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=get_or_create) for _ in range(2)]
+    threads[0].start()
+    started.wait()
+    threads[1].start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 2
+    assert len(cache) == 0
+    # A later request tries again.
+    create = _make_creator()
+    cache.get_or_create(_make_request(), create)
+    assert create.call_count == 1
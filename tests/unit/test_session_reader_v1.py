@@ -0,0 +1,998 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import fastavro
+import mock
+import pandas
+import pandas.testing
+import pyarrow
+import pytest
+import six
+
+import google.api_core.exceptions
+from google.cloud.bigquery_storage import types
+
+
+STREAM_BLOCKS = {
+    "stream-0": [[{"int_col": 1}, {"int_col": 2}], [{"int_col": 3}]],
+    "stream-1": [[{"int_col": 4}], [{"int_col": 5}, {"int_col": 6}]],
+    "stream-2": [],
+    "stream-3": [[{"int_col": 7}]],
+}
+STREAM_NAMES = sorted(STREAM_BLOCKS)
+EXPECTED_INTS = [1, 2, 3, 4, 5, 6, 7]
+
+
+@pytest.fixture()
+def mut():
+    from google.cloud.bigquery_storage_v1 import session_reader
+
+    return session_reader
+
+
+@pytest.fixture()
+def class_under_test(mut):
+    return mut.ReadSessionReader
+
+
+@pytest.fixture()
+def mock_client():
+    from google.cloud.bigquery_storage_v1 import client
+
+    return mock.create_autospec(client.BigQueryReadClient, instance=True)
+
+
+def _avro_schema():
+    return {
+        "type": "record",
+        "name": "__root__",
+        "fields": [{"name": "int_col", "type": ["null", "long"]}],
+    }
+
+
+def _arrow_schema():
+    return pyarrow.schema([pyarrow.field("int_col", pyarrow.int64())])
+
+
+def _generate_read_session(data_format, stream_names=STREAM_NAMES):
+    streams = [{"name": name} for name in stream_names]
+    if data_format == "avro":
+        return types.ReadSession(
+            avro_schema={"schema": json.dumps(_avro_schema())}, streams=streams
+        )
+    return types.ReadSession(
+        arrow_schema={"serialized_schema": _arrow_schema().serialize().to_pybytes()},
+        streams=streams,
+    )
+
+
+def _bq_to_avro_blocks(bq_blocks):
+    avro_schema = fastavro.parse_schema(_avro_schema())
+    avro_blocks = []
+    for block in bq_blocks:
+        blockio = six.BytesIO()
+        for row in block:
+            fastavro.schemaless_writer(blockio, avro_schema, row)
+        response = types.ReadRowsResponse()
+        response.row_count = len(block)
+        response.avro_rows.serialized_binary_rows = blockio.getvalue()
+        avro_blocks.append(response)
+    return avro_blocks
+
+
+def _bq_to_arrow_batches(bq_blocks):
+    arrow_schema = _arrow_schema()
+    arrow_batches = []
+    for block in bq_blocks:
+        record_batch = pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array([row["int_col"] for row in block], type=pyarrow.int64())],
+            schema=arrow_schema,
+        )
+        response = types.ReadRowsResponse()
+        response.row_count = len(block)
+        response.arrow_record_batch.serialized_record_batch = (
+            record_batch.serialize().to_pybytes()
+        )
+        arrow_batches.append(response)
+    return arrow_batches
+
+
+def _pages_w_unavailable(pages):
+    for page in pages:
+        yield page
+    raise google.api_core.exceptions.ServiceUnavailable("test: please reconnect")
+
+
+def _pages_w_deadline(pages):
+    for page in pages:
+        yield page
+    raise google.api_core.exceptions.DeadlineExceeded("test: timeout")
+
+
+def _fake_read_rows(mock_client, messages_by_stream, reconnect_messages=None):
+    """Make ``read_rows`` return a real ReadRowsStream over fake messages."""
+    from google.cloud.bigquery_storage_v1 import reader
+    from google.cloud.bigquery_storage_v1.services import big_query_read
+
+    gapic_client = mock.create_autospec(big_query_read.BigQueryReadClient)
+    if reconnect_messages is not None:
+        gapic_client.read_rows.side_effect = lambda read_stream, offset, **kwargs: (
+            reconnect_messages[read_stream]
+        )
+
+    def read_rows(name, offset=0, **kwargs):
+        return reader.ReadRowsStream(
+            messages_by_stream[name], gapic_client, name, offset, kwargs
+        )
+
+    mock_client.read_rows.side_effect = read_rows
+    return gapic_client
+
+
+def test_to_arrow(class_under_test, mock_client):
+    read_session = _generate_read_session("arrow")
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_arrow_batches(STREAM_BLOCKS[name]) for name in STREAM_NAMES},
+    )
+
+    reader = class_under_test(mock_client, read_session, max_workers=2)
+    table = reader.to_arrow()
+
+    assert table.column("int_col").to_pylist() == EXPECTED_INTS
+    assert mock_client.read_rows.call_count == len(STREAM_NAMES)
+
+
+def test_to_arrow_w_empty_session(class_under_test, mock_client):
+    read_session = _generate_read_session("arrow", stream_names=[])
+
+    table = class_under_test(mock_client, read_session).to_arrow()
+
+    assert table.num_rows == 0
+    assert table.schema.names == ["int_col"]
+    mock_client.read_rows.assert_not_called()
+
+
+def test_record_batches_unordered(class_under_test, mock_client):
+    read_session = _generate_read_session("arrow")
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_arrow_batches(STREAM_BLOCKS[name]) for name in STREAM_NAMES},
+    )
+
+    reader = class_under_test(mock_client, read_session)
+    got = [
+        value
+        for record_batch in reader.record_batches(ordered=False)
+        for value in record_batch.column(0).to_pylist()
+    ]
+
+    assert sorted(got) == EXPECTED_INTS
+
+
+def test_record_batches_no_pyarrow_raises_import_error(
+    mut, class_under_test, mock_client, monkeypatch
+):
+    monkeypatch.setattr(mut, "pyarrow", None)
+    read_session = _generate_read_session("arrow")
+    reader = class_under_test(mock_client, read_session)
+
+    with pytest.raises(ImportError):
+        reader.record_batches()
+
+    with pytest.raises(ImportError):
+        reader.to_arrow()
+
+
+def test_to_dataframe_w_avro_reconnects(class_under_test, mock_client):
+    read_session = _generate_read_session("avro")
+    messages = {name: _bq_to_avro_blocks(STREAM_BLOCKS[name]) for name in STREAM_NAMES}
+    gapic_client = _fake_read_rows(
+        mock_client,
+        {name: _pages_w_unavailable(messages[name][:1]) for name in STREAM_NAMES},
+        reconnect_messages={name: messages[name][1:] for name in STREAM_NAMES},
+    )
+
+    reader = class_under_test(mock_client, read_session, max_workers=3)
+    df = reader.to_dataframe(dtypes={"int_col": "int32"})
+
+    assert df["int_col"].tolist() == EXPECTED_INTS
+    assert df["int_col"].dtype.name == "int32"
+    gapic_client.read_rows.assert_any_call(read_stream="stream-0", offset=2)
+    gapic_client.read_rows.assert_any_call(read_stream="stream-1", offset=1)
+
+
+def test_to_dataframe_w_arrow_dtypes(class_under_test, mock_client):
+    read_session = _generate_read_session("arrow")
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_arrow_batches(STREAM_BLOCKS[name]) for name in STREAM_NAMES},
+    )
+
+    df = class_under_test(mock_client, read_session).to_dataframe(
+        dtypes={"int_col": "float32"}
+    )
+
+    expected = pandas.DataFrame(
+        {"int_col": pandas.Series(EXPECTED_INTS, dtype="float32")}
+    )
+    pandas.testing.assert_frame_equal(df.reset_index(drop=True), expected)
+
+
+def test_to_dataframe_w_empty_avro_session(class_under_test, mock_client):
+    read_session = _generate_read_session("avro", stream_names=["stream-2"])
+    _fake_read_rows(mock_client, {"stream-2": []})
+
+    df = class_under_test(mock_client, read_session).to_dataframe()
+
+    assert list(df.columns) == ["int_col"]
+    assert df["int_col"].dtype.name == "int64"
+    assert len(df) == 0
+
+
+def test_to_dataframe_no_pandas_raises_import_error(
+    mut, class_under_test, mock_client, monkeypatch
+):
+    monkeypatch.setattr(mut, "pandas", None)
+    read_session = _generate_read_session("avro")
+
+    with pytest.raises(ImportError):
+        class_under_test(mock_client, read_session).to_dataframe()
+
+
+def test_to_arrow_w_error_stops_reading(class_under_test, mock_client):
+    read_session = _generate_read_session("arrow", stream_names=["ok", "bad"])
+    _fake_read_rows(
+        mock_client,
+        {
+            "ok": _bq_to_arrow_batches(STREAM_BLOCKS["stream-0"]),
+            "bad": _pages_w_deadline(_bq_to_arrow_batches(STREAM_BLOCKS["stream-1"])),
+        },
+    )
+
+    with pytest.raises(google.api_core.exceptions.DeadlineExceeded):
+        class_under_test(mock_client, read_session).to_arrow()
+
+
+def test_read_rows_kwargs_passed_to_each_stream(class_under_test, mock_client):
+    read_session = _generate_read_session("arrow")
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_arrow_batches(STREAM_BLOCKS[name]) for name in STREAM_NAMES},
+    )
+
+    reader = class_under_test(
+        mock_client, read_session, read_rows_kwargs={"metadata": [("k", "v")]}
+    )
+    reader.to_arrow()
+
+    for name in STREAM_NAMES:
+        mock_client.read_rows.assert_any_call(name, offset=0, metadata=[("k", "v")])
+
+
+class _BlockingCall(object):
+    """A ReadRows call which returns one message, then waits to be cancelled."""
+
+    def __init__(self, message):
+        import threading
+
+        self._message = message
+        self.cancelled = threading.Event()
+
+    def __iter__(self):
+        yield self._message
+        self.cancelled.wait(5)
+        raise google.api_core.exceptions.Cancelled("test: cancelled")
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+def test_record_batches_close_cancels_open_streams(class_under_test, mock_client):
+    from google.cloud.bigquery_storage_v1 import reader as reader_module
+
+    read_session = _generate_read_session("arrow", stream_names=["a", "b"])
+    calls = {
+        name: _BlockingCall(_bq_to_arrow_batches([[{"int_col": 1}]])[0])
+        for name in ("a", "b")
+    }
+
+    def read_rows(name, offset=0, **kwargs):
+        return reader_module.ReadRowsStream(
+            calls[name], mock_client, name, offset, kwargs
+        )
+
+    mock_client.read_rows.side_effect = read_rows
+
+    reader = class_under_test(mock_client, read_session, max_workers=2)
+    batches = reader.record_batches(ordered=False)
+    next(batches)
+    batches.close()
+
+    for call in calls.values():
+        assert call.cancelled.wait(5)
+
+
+def test_scheduler_cancels_streams_opened_after_close(mut):
+    scheduler = mut._Scheduler([])
+    open_stream = mock.Mock()
+    finished_stream = mock.Mock()
+    scheduler.track(open_stream)
+    scheduler.track(finished_stream)
+    scheduler.untrack(finished_stream)
+
+    scheduler.close()
+    late_stream = mock.Mock()
+    scheduler.track(late_stream)
+
+    open_stream._cancel.assert_called_once_with()
+    finished_stream._cancel.assert_not_called()
+    late_stream._cancel.assert_called_once_with()
+
+
+def test_stream_order_buffers_until_head_finishes(mut):
+    order = mut._StreamOrder([0, 1, 2])
+
+    assert order.is_head(0)
+    order.buffer(1, "b")
+    order.buffer(2, "c")
+    assert list(order.finish(2)) == []
+    assert list(order.finish(0)) == ["b"]
+    assert order.is_head(1)
+    assert list(order.finish(1)) == ["c"]
+    assert not order.is_head(2)
+
+
+def _arrow_message(values, progress=0.0):
+    (message,) = _bq_to_arrow_batches([[{"int_col": value} for value in values]])
+    message.stats.progress.at_response_end = progress
+    return message
+
+
+def test_to_arrow_w_split_streams(class_under_test, mock_client):
+    import threading
+
+    read_session = _generate_read_session("arrow", stream_names=["slow", "fast"])
+    split_called = threading.Event()
+    first_page_read = threading.Event()
+    slow_rows = [1, 2, 3, 4, 5, 6]
+    split_point = 4
+
+    def slow_stream():
+        yield _arrow_message(slow_rows[0:2], progress=1.0 / 3)
+        first_page_read.set()
+        split_called.wait(5)
+        yield _arrow_message(slow_rows[2:4], progress=2.0 / 3)
+        yield _arrow_message(slow_rows[4:6], progress=1.0)
+
+    def primary_stream(offset):
+        if offset > split_point:
+            raise google.api_core.exceptions.FailedPrecondition("past split")
+        if offset < split_point:
+            yield _arrow_message(slow_rows[offset:split_point], progress=1.0)
+
+    def fast_stream():
+        # Don't go idle until the progress of the slow stream is known.
+        first_page_read.wait(5)
+        yield _arrow_message([7, 8], progress=1.0)
+
+    messages = {
+        "slow": slow_stream(),
+        "fast": fast_stream(),
+        "slow/remainder": [_arrow_message(slow_rows[split_point:], progress=1.0)],
+    }
+
+    from google.cloud.bigquery_storage_v1 import reader as reader_module
+
+    def read_rows(name, offset=0, **kwargs):
+        wrapped = primary_stream(offset) if name == "slow/primary" else messages[name]
+        return reader_module.ReadRowsStream(wrapped, mock_client, name, offset, kwargs)
+
+    def split_read_stream(request, **kwargs):
+        split_called.set()
+        return types.SplitReadStreamResponse(
+            primary_stream={"name": "slow/primary"},
+            remainder_stream={"name": "slow/remainder"},
+        )
+
+    mock_client.read_rows.side_effect = read_rows
+    mock_client.split_read_stream.side_effect = split_read_stream
+
+    reader = class_under_test(
+        mock_client, read_session, max_workers=2, split_streams=True
+    )
+    table = reader.to_arrow()
+
+    assert table.column("int_col").to_pylist() == [1, 2, 3, 4, 5, 6, 7, 8]
+    mock_client.split_read_stream.assert_called_once_with(
+        request={"name": "slow", "fraction": pytest.approx(2.0 / 3)}, metadata=()
+    )
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        google.api_core.exceptions.FailedPrecondition("past split"),
+        google.api_core.exceptions.InvalidArgument("bad split"),
+        google.api_core.exceptions.NotFound("no primary stream"),
+        google.api_core.exceptions.ServiceUnavailable("try again"),
+    ],
+)
+def test_split_declined_on_error(mut, class_under_test, mock_client, error):
+    read_session = _generate_read_session("arrow", stream_names=["slow"])
+    mock_client.read_rows.side_effect = error
+    reader = class_under_test(mock_client, read_session)
+    task = mut._StreamTask((0,), "slow", offset=10)
+    remainder = mut._StreamTask((0, -1), "slow/remainder")
+    offer = mut._SplitOffer("slow/primary", remainder)
+    original = iter([])
+
+    got = reader._accept_split(
+        mut._Scheduler([task]), task, offer, original, None, None
+    )
+
+    assert got is original
+    assert task.name == "slow"
+    assert offer.wait(None) is False
+
+
+def test_accept_split_cancels_original_stream(mut, class_under_test, mock_client):
+    import queue
+    import threading
+
+    read_session = _generate_read_session("arrow", stream_names=["slow"])
+    primary = mock.MagicMock()
+    primary.__iter__.return_value = iter([_arrow_message([3, 4])])
+    mock_client.read_rows.return_value = primary
+    reader = class_under_test(mock_client, read_session)
+    task = mut._StreamTask((0,), "slow", offset=2)
+    original = mock.Mock()
+    task.stream = original
+    scheduler = mut._Scheduler([task])
+    scheduler.track(original)
+    remainder = mut._StreamTask((0, -1), "slow/remainder")
+    offer = mut._SplitOffer("slow/primary", remainder)
+
+    got = reader._accept_split(
+        scheduler, task, offer, iter([]), queue.Queue(), threading.Event()
+    )
+
+    assert [message.row_count for message in got] == [2]
+    assert task.name == "slow/primary"
+    assert task.stream is primary
+    assert offer.wait(None) is True
+    original._cancel.assert_called_once_with()
+    scheduler.close()
+    original._cancel.assert_called_once_with()
+
+
+def test_steal_gives_up_when_server_cannot_split(mut, class_under_test, mock_client):
+    import threading
+
+    read_session = _generate_read_session("arrow", stream_names=["a"])
+    mock_client.split_read_stream.return_value = types.SplitReadStreamResponse()
+    reader = class_under_test(mock_client, read_session, split_streams=True)
+    scheduler = mut._Scheduler([mut._StreamTask((0,), "a")])
+    task = scheduler.next_task()
+
+    assert reader._steal(scheduler, threading.Event()) is None
+    assert not task.splittable
+    assert not task.splitting
+
+
+def test_scheduler_chooses_least_progress(mut):
+    tasks = [mut._StreamTask((index,), str(index)) for index in range(4)]
+    scheduler = mut._Scheduler(tasks)
+    for _ in tasks:
+        scheduler.next_task()
+    tasks[0].progress = 0.5
+    tasks[1].progress = 0.9  # Too far along to split.
+    tasks[2].progress = 0.25
+    tasks[3].progress = 0.1
+    scheduler.finish(tasks[3])
+
+    victim = scheduler.choose_victim()
+    assert victim is tasks[2]
+    assert scheduler.choose_victim() is tasks[0]
+    assert scheduler.choose_victim() is None
+
+    offer = scheduler.offer_split(victim, "2/primary", "2/remainder")
+    assert offer.remainder.key == (2, -1)
+    assert scheduler.take_split_offer(victim) is offer
+    assert scheduler.take_split_offer(victim) is None
+
+    scheduler.end_split(victim, offer.remainder)
+    assert victim.splittable
+    assert scheduler.choose_victim() is offer.remainder
+
+
+def test_scheduler_rejects_offer_when_stream_finishes(mut):
+    task = mut._StreamTask((0,), "a")
+    scheduler = mut._Scheduler([task])
+    scheduler.next_task()
+
+    offer = scheduler.offer_split(task, "a/primary", "a/remainder")
+    scheduler.finish(task)
+
+    assert offer.wait(None) is False
+    assert scheduler.offer_split(task, "a/primary", "a/remainder") is None
+
+
+def test_stream_order_w_split_keys(mut):
+    order = mut._StreamOrder([(0,), (1,)])
+    order.insert((0, -1))
+    order.insert((0, -2))
+    order.buffer((1,), "d")
+    order.buffer((0, -1), "c")
+    order.buffer((0, -2), "b")
+
+    assert list(order.finish((0,))) == ["b"]
+    assert list(order.finish((0, -2))) == ["c"]
+    assert list(order.finish((0, -1))) == ["d"]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_to_parquet(class_under_test, mock_client, tmpdir, ordered):
+    import pyarrow.parquet
+
+    read_session = _generate_read_session("avro")
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_avro_blocks(STREAM_BLOCKS[name]) for name in STREAM_NAMES},
+    )
+    path = str(tmpdir.join("session.parquet"))
+
+    reader = class_under_test(mock_client, read_session, max_workers=2)
+    num_rows = reader.to_parquet(path, row_group_size=4, ordered=ordered)
+
+    table = pyarrow.parquet.read_table(path)
+    got = table.column("int_col").to_pylist()
+    assert num_rows == len(EXPECTED_INTS)
+    assert pyarrow.parquet.ParquetFile(path).metadata.num_row_groups == 2
+    if ordered:
+        assert got == EXPECTED_INTS
+    else:
+        assert sorted(got) == EXPECTED_INTS
+
+
+def test_to_parquet_w_empty_session(class_under_test, mock_client, tmpdir):
+    import pyarrow.parquet
+
+    read_session = _generate_read_session("arrow", stream_names=[])
+    path = str(tmpdir.join("session.parquet"))
+
+    assert class_under_test(mock_client, read_session).to_parquet(path) == 0
+
+    table = pyarrow.parquet.read_table(path)
+    assert table.num_rows == 0
+    assert table.schema.names == ["int_col"]
+
+
+def test_to_arrow_ipc(class_under_test, mock_client, tmpdir):
+    read_session = _generate_read_session("arrow")
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_arrow_batches(STREAM_BLOCKS[name]) for name in STREAM_NAMES},
+    )
+    path = str(tmpdir.join("session.arrow"))
+
+    reader = class_under_test(mock_client, read_session, max_workers=2)
+    num_rows = reader.to_arrow_ipc(path, ordered=True)
+
+    table = pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
+    assert num_rows == len(EXPECTED_INTS)
+    assert table.column("int_col").to_pylist() == EXPECTED_INTS
+
+
+def test_to_dataframe_w_low_memory(class_under_test, mock_client):
+    read_session = _generate_read_session("arrow")
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_arrow_batches(STREAM_BLOCKS[name]) for name in STREAM_NAMES},
+    )
+
+    df = class_under_test(mock_client, read_session).to_dataframe(
+        dtypes={"int_col": "float32"}, low_memory=True
+    )
+
+    expected = pandas.DataFrame(
+        {"int_col": pandas.Series(EXPECTED_INTS, dtype="float32")}
+    )
+    pandas.testing.assert_frame_equal(df, expected)
+
+
+def _checkpoint_store():
+    from google.cloud.bigquery_storage_v1 import checkpoint
+
+    return checkpoint.SQLiteCheckpointStore(":memory:")
+
+
+def test_record_batches_saves_checkpoints(class_under_test, mock_client):
+    read_session = _generate_read_session("arrow")
+    read_session.name = "projects/p/locations/l/sessions/s"
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_arrow_batches(STREAM_BLOCKS[name]) for name in STREAM_NAMES},
+    )
+    store = _checkpoint_store()
+
+    reader = class_under_test(
+        mock_client, read_session, checkpoint_store=store, checkpoint_interval=0
+    )
+    batches = list(reader.record_batches())
+
+    assert sum(batch.num_rows for batch in batches) == len(EXPECTED_INTS)
+    assert store.load_session(read_session.name) == read_session
+    assert store.load_offsets(read_session.name) == {
+        "stream-0": 3,
+        "stream-1": 3,
+        "stream-3": 1,
+    }
+
+
+def test_record_batches_resumes_from_checkpoint(class_under_test, mock_client):
+    read_session = _generate_read_session("arrow")
+    read_session.name = "projects/p/locations/l/sessions/s"
+    store = _checkpoint_store()
+    store.save_offsets(read_session.name, {"stream-0": 2, "stream-3": 1})
+    remaining = {
+        "stream-0": [[{"int_col": 3}]],
+        "stream-1": STREAM_BLOCKS["stream-1"],
+        "stream-2": [],
+        "stream-3": [],
+    }
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_arrow_batches(remaining[name]) for name in STREAM_NAMES},
+    )
+
+    reader = class_under_test(mock_client, read_session, checkpoint_store=store)
+    batches = list(reader.record_batches())
+
+    values = [value for batch in batches for value in batch.column(0).to_pylist()]
+    assert values == [3, 4, 5, 6]
+    offsets = {
+        call[0][0]: call[1]["offset"] for call in mock_client.read_rows.call_args_list
+    }
+    assert offsets == {"stream-0": 2, "stream-1": 0, "stream-2": 0, "stream-3": 1}
+    assert store.load_offsets(read_session.name)["stream-0"] == 3
+
+
+def test_checkpoint_store_w_split_streams_raises_value_error(
+    class_under_test, mock_client
+):
+    read_session = _generate_read_session("arrow")
+
+    with pytest.raises(ValueError):
+        class_under_test(
+            mock_client,
+            read_session,
+            split_streams=True,
+            checkpoint_store=_checkpoint_store(),
+        )
+
+
+def test_to_arrow_w_adaptive_concurrency(mut, class_under_test, mock_client):
+    read_session = _generate_read_session("arrow")
+    _fake_read_rows(
+        mock_client,
+        {name: _bq_to_arrow_batches(STREAM_BLOCKS[name]) for name in STREAM_NAMES},
+    )
+
+    reader = class_under_test(
+        mock_client, read_session, max_workers=4, adaptive_concurrency=True
+    )
+    table = reader.to_arrow()
+
+    assert table.column("int_col").to_pylist() == EXPECTED_INTS
+
+
+@pytest.mark.parametrize(
+    "kwargs,invalidated",
+    [({}, False), ({"split_streams": True}, True), ({"hedge_streams": True}, True)],
+)
+def test_splitting_reader_removes_session_from_cache(
+    class_under_test, mock_client, kwargs, invalidated
+):
+    mock_client._session_cache = mock.Mock()
+    read_session = _generate_read_session("arrow")
+
+    class_under_test(mock_client, read_session, **kwargs)
+
+    if invalidated:
+        mock_client._session_cache.invalidate.assert_called_once_with(read_session)
+    else:
+        mock_client._session_cache.invalidate.assert_not_called()
+
+
+def test_concurrency_controller_grows_while_throughput_rises(mut):
+    controller = mut._ConcurrencyController(4, initial=1)
+    controller._active = 1
+
+    controller._adjust(100.0, 0)
+    assert controller.limit == 2
+
+    controller._active = 2
+    controller._adjust(200.0, 0)
+    assert controller.limit == 3
+
+    # More streams didn't help, so stay at this limit.
+    controller._active = 3
+    controller._adjust(201.0, 0)
+    assert controller.limit == 3
+
+
+def test_concurrency_controller_doesnt_grow_past_maximum_or_when_idle(mut):
+    controller = mut._ConcurrencyController(2, initial=2)
+
+    # Not all permits are in use.
+    controller._active = 1
+    controller._adjust(100.0, 0)
+    assert controller.limit == 2
+
+    controller._active = 2
+    controller._adjust(200.0, 0)
+    assert controller.limit == 2
+
+
+def test_concurrency_controller_backs_off_when_throttled(mut):
+    controller = mut._ConcurrencyController(16, initial=8)
+    controller._active = 8
+
+    controller._adjust(100.0, 10)
+    assert controller.limit == 6
+
+    controller._adjust(100.0, 30)
+    assert controller.limit == 4
+
+    # Throttling is easing off, so hold.
+    controller._adjust(100.0, 5)
+    assert controller.limit == 4
+
+    controller.limit = 1
+    controller._adjust(100.0, 50)
+    assert controller.limit == 1
+
+
+def test_concurrency_controller_holds_under_constant_throttle(mut):
+    controller = mut._ConcurrencyController(16, initial=8)
+    controller._active = 8
+
+    for _ in range(10):
+        controller._adjust(100.0, 40)
+
+    # Backed off once when throttling started, then held.
+    assert controller.limit == 6
+
+    # Throttling rose again.
+    controller._adjust(100.0, 55)
+    assert controller.limit == 4
+
+    # Still throttled, so hold even though throughput keeps rising.
+    for throughput in (110.0, 121.0, 133.0):
+        controller._active = controller.limit
+        controller._adjust(throughput, 55)
+    assert controller.limit == 4
+
+
+def test_concurrency_controller_over_limit_pauses_streams(mut):
+    import threading
+
+    controller = mut._ConcurrencyController(4, initial=2)
+    stop = threading.Event()
+    assert controller.acquire(stop)
+    assert controller.acquire(stop)
+    assert not controller.over_limit()
+
+    controller.limit = 1
+    assert controller.over_limit()
+    controller.release()
+    assert not controller.over_limit()
+
+    stop.set()
+    assert not controller.acquire(stop)
+
+
+def test_concurrency_controller_record_adjusts_after_interval(mut, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(mut.time, "monotonic", lambda: now[0])
+    controller = mut._ConcurrencyController(4, initial=1, interval=1.0)
+    controller._active = 1
+    (message,) = _bq_to_arrow_batches([[{"int_col": 1}]])
+
+    controller.record(message)
+    assert controller.limit == 1
+
+    now[0] = 1.0
+    controller.record(message)
+    assert controller.limit == 2
+    assert controller._window_bytes == 0
+
+
+def _hedged_read_rows(mock_client, messages, primary_stream):
+    from google.cloud.bigquery_storage_v1 import reader as reader_module
+
+    def read_rows(name, offset=0, **kwargs):
+        wrapped = primary_stream(offset) if name == "slow/primary" else messages[name]
+        return reader_module.ReadRowsStream(wrapped, mock_client, name, offset, kwargs)
+
+    mock_client.read_rows.side_effect = read_rows
+
+
+def test_to_arrow_w_hedge_streams(mut, class_under_test, mock_client, monkeypatch):
+    import threading
+
+    monkeypatch.setattr(mut, "_HEDGE_MIN_SECONDS", 0.0)
+    read_session = _generate_read_session("arrow", stream_names=["slow", "fast"])
+    first_page_read = threading.Event()
+    release_slow = threading.Event()
+
+    def slow_stream():
+        yield _arrow_message([1, 2], progress=1.0 / 3)
+        first_page_read.set()
+        # Stall until the hedge has won, then return the same rows again.
+        release_slow.wait(5)
+        yield _arrow_message([3, 4], progress=2.0 / 3)
+        yield _arrow_message([5, 6], progress=1.0)
+
+    def primary_stream(offset):
+        assert offset == 2
+        yield _arrow_message([3, 4], progress=1.0)
+
+    def fast_stream():
+        first_page_read.wait(5)
+        yield _arrow_message([7, 8, 9, 10], progress=1.0)
+
+    messages = {
+        "slow": slow_stream(),
+        "fast": fast_stream(),
+        "slow/remainder": [_arrow_message([5, 6], progress=1.0)],
+    }
+    _hedged_read_rows(mock_client, messages, primary_stream)
+    mock_client.split_read_stream.return_value = types.SplitReadStreamResponse(
+        primary_stream={"name": "slow/primary"},
+        remainder_stream={"name": "slow/remainder"},
+    )
+
+    reader = class_under_test(
+        mock_client, read_session, max_workers=2, hedge_streams=True
+    )
+    try:
+        table = reader.to_arrow()
+    finally:
+        release_slow.set()
+
+    assert table.column("int_col").to_pylist() == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    mock_client.split_read_stream.assert_called_once_with(
+        request={"name": "slow", "fraction": pytest.approx(2.0 / 3)}, metadata=()
+    )
+
+
+def test_to_arrow_w_hedge_streams_falls_back_to_original(
+    mut, class_under_test, mock_client, monkeypatch
+):
+    import threading
+
+    monkeypatch.setattr(mut, "_HEDGE_MIN_SECONDS", 0.0)
+    read_session = _generate_read_session("arrow", stream_names=["slow", "fast"])
+    first_page_read = threading.Event()
+    split_called = threading.Event()
+
+    def slow_stream():
+        yield _arrow_message([1, 2], progress=1.0 / 3)
+        first_page_read.set()
+        split_called.wait(5)
+        yield _arrow_message([3, 4], progress=2.0 / 3)
+        yield _arrow_message([5, 6], progress=1.0)
+
+    def primary_stream(offset):
+        raise google.api_core.exceptions.InternalServerError("test: hedge failed")
+        yield  # pragma: NO COVER
+
+    def fast_stream():
+        first_page_read.wait(5)
+        yield _arrow_message([7, 8, 9, 10], progress=1.0)
+
+    def split_read_stream(request, **kwargs):
+        split_called.set()
+        return types.SplitReadStreamResponse(
+            primary_stream={"name": "slow/primary"},
+            remainder_stream={"name": "slow/remainder"},
+        )
+
+    messages = {"slow": slow_stream(), "fast": fast_stream()}
+    _hedged_read_rows(mock_client, messages, primary_stream)
+    mock_client.split_read_stream.side_effect = split_read_stream
+
+    reader = class_under_test(
+        mock_client, read_session, max_workers=2, hedge_streams=True
+    )
+    table = reader.to_arrow()
+
+    assert table.column("int_col").to_pylist() == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert mock_client.split_read_stream.call_count == 1
+
+
+def test_scheduler_chooses_straggler(mut, monkeypatch):
+    clock = mock.Mock(return_value=100.0)
+    monkeypatch.setattr(mut.time, "monotonic", clock)
+    tasks = [mut._StreamTask((index,), str(index)) for index in range(4)]
+    scheduler = mut._Scheduler(tasks)
+    for _ in tasks:
+        scheduler.next_task()
+
+    clock.return_value = 100.5
+    assert scheduler.choose_straggler() == (None, True)  # Too soon to tell.
+
+    clock.return_value = 110.0
+    for task, row_count in zip(tasks, [1000, 900, 100, 200]):
+        scheduler.advance(task, row_count)
+    scheduler.finish(tasks[0])
+    # Rates are 100, 90, 10 and 20 rows per second, with a median of 55.
+    assert scheduler.choose_straggler() == (tasks[2], True)
+    assert scheduler.choose_straggler() == (tasks[3], True)
+    assert scheduler.choose_straggler() == (None, True)
+
+    assert scheduler.start_hedge(tasks[3], None) is None
+    assert not tasks[3].hedgeable
+    hedge = scheduler.start_hedge(tasks[2], mut._Hedge("2/primary", "2/remainder"))
+    assert hedge.offset == 100
+    assert scheduler.advance(tasks[2], 10) is hedge
+
+    scheduler.finish(tasks[1])
+    scheduler.finish(tasks[2])
+    assert scheduler.choose_straggler() == (None, False)
+
+
+def test_hedge_returns_pages_of_first_read_to_finish(mut):
+    stream = mock.Mock()
+    hedge = mut._Hedge("a/primary", "a/remainder")
+    hedge.streams[mut._ORIGINAL] = stream
+
+    assert hedge.add_page(mut._ORIGINAL, "o1") == ()
+    assert hedge.add_page(mut._HEDGED, "h1") == ()
+    assert hedge.finish(mut._HEDGED, True) == (["h1"], True)
+
+    assert hedge.is_lost(mut._ORIGINAL)
+    assert not hedge.is_lost(mut._HEDGED)
+    stream._cancel.assert_called_once_with()
+    assert hedge.add_page(mut._ORIGINAL, "o2") == ()
+    assert hedge.finish(mut._ORIGINAL, True) == ((), False)
+
+
+def test_hedge_failure_returns_pages_of_original(mut):
+    hedge = mut._Hedge("a/primary", "a/remainder")
+
+    assert hedge.add_page(mut._ORIGINAL, "o1") == ()
+    assert hedge.finish(mut._HEDGED, False) == (["o1"], False)
+
+    assert hedge.is_lost(mut._HEDGED)
+    assert hedge.add_page(mut._ORIGINAL, "o2") == ("o2",)
+    assert hedge.finish(mut._ORIGINAL, True) == ((), True)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"split_streams": True}, {"checkpoint_store": _checkpoint_store()}],
+)
+def test_hedge_streams_w_split_streams_or_checkpoints_raises_value_error(
+    class_under_test, mock_client, kwargs
+):
+    read_session = _generate_read_session("arrow")
+
+    with pytest.raises(ValueError):
+        class_under_test(mock_client, read_session, hedge_streams=True, **kwargs)